@@ -0,0 +1,177 @@
+import statistics
+import numpy as np
+from copula import checked_groups, draw_correlated
+from rng import step_generators
+from streaming import RunningStats
+
+
+class AdaptiveResult:
+    """
+    Outcome of a run-until-precision simulation of "Total".
+
+    Attributes:
+        n_simulations (int): Samples used.
+        converged (bool): True if every target was met within the budget.
+        mean (float): Mean of the total.
+        std (float): Standard deviation of the total.
+        std_error (float): Standard error of the mean.
+        relative_error (float): Standard error relative to the mean.
+        quantile (float or None): Quantile level of the quantile target.
+        quantile_value (float or None): Estimated quantile of the total.
+        quantile_interval (tuple or None): Confidence interval of the quantile.
+        quantile_halfwidth (float or None): Half-width of that interval.
+        history (list[dict]): Sample count and precision after every batch.
+
+    """
+
+    def __init__(self):
+        self.n_simulations = 0
+        self.converged = False
+        self.mean = np.nan
+        self.std = np.nan
+        self.std_error = np.nan
+        self.relative_error = np.nan
+        self.quantile = None
+        self.quantile_value = None
+        self.quantile_interval = None
+        self.quantile_halfwidth = None
+        self.history = []
+
+
+def simulate_adaptive(
+    steps,
+    target_relative_error: float = None,
+    target_absolute_error: float = None,
+    quantile: float = None,
+    target_halfwidth: float = None,
+    confidence: float = 0.95,
+    initial_batch: int = 10_000,
+    growth: float = 2.0,
+    max_samples: int = 10**7,
+    seed=None,
+    bit_generator: str = "PCG64",
+    correlations: dict = None,
+) -> AdaptiveResult:
+    """
+    Simulates "Total" in growing batches until a precision target is met.
+
+    Targets are a relative or absolute standard error of the mean and/or the
+    confidence interval half-width of a quantile. The relative error of a mean
+    at or near 0 cannot shrink, so such processes need an absolute target.
+    With both, the mean target is met by either. After every batch the sample count
+    needed for the target is extrapolated from the 1/sqrt(n) error decay, and
+    the next batch aims for it, growing at most by ``growth`` per batch.
+
+    Only the running mean is kept for a mean target. A quantile target keeps
+    the totals as float32 for a distribution-free order statistic interval.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        target_relative_error (float or None): Target standard error of the mean divided
+            by the mean.
+        target_absolute_error (float or None): Target standard error of the mean, in units
+            of time.
+        quantile (float or None): Quantile level of the quantile target, e.g. 0.95.
+        target_halfwidth (float or None): Target half-width of the quantile's confidence
+            interval, in units of time.
+        confidence (float): Confidence level of the quantile interval. By default 0.95
+        initial_batch (int): Size of the first batch. By default 10 000
+        growth (float): Largest factor the sample count grows by per batch. By default 2.0
+        max_samples (int): Budget of samples. By default 10**7
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+        correlations (dict or None): (name, name) to correlation. By default independent steps
+
+    Returns:
+        AdaptiveResult: Estimates, reached precision and samples used.
+
+    """
+    if target_relative_error is None and target_absolute_error is None and target_halfwidth is None:
+        raise ValueError(
+            "Give a target_relative_error or target_absolute_error and/or a target_halfwidth"
+        )
+    if (quantile is None) != (target_halfwidth is None):
+        raise ValueError("A quantile target needs both quantile and target_halfwidth")
+    assert growth > 1, f"Growth must be larger than 1, but got {growth}"
+
+    steps = steps or []
+    z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+    generators = step_generators([step.name for step in steps], seed, bit_generator)
+    groups = checked_groups(steps, correlations)
+
+    stats = RunningStats()
+    totals = np.empty(0, dtype=np.float32)
+    result = AdaptiveResult()
+    result.quantile = quantile
+
+    batch = min(initial_batch, max_samples)
+    while batch > 0:
+        total_time = np.zeros(batch)
+        for step_time in draw_correlated(steps, groups, generators, batch):
+            total_time += step_time
+
+        stats.update(total_time)
+        if quantile is not None:
+            totals = np.concatenate((totals, total_time.astype(np.float32)))
+
+        n = stats.count
+        result.n_simulations = n
+        result.mean = stats.mean
+        result.std = stats.std
+        result.std_error = result.std / np.sqrt(n)
+        result.relative_error = result.std_error / abs(result.mean) if result.mean else np.inf
+
+        # Samples needed for each target, assuming errors shrink as 1/sqrt(n)
+        needed = [n]
+        if target_relative_error is not None or target_absolute_error is not None:
+            needed.append(
+                min(
+                    _needed(n, result.relative_error, target_relative_error),
+                    _needed(n, result.std_error, target_absolute_error),
+                )
+            )
+        if quantile is not None:
+            _quantile_interval(result, totals, quantile, z)
+            needed.append(_needed(n, result.quantile_halfwidth, target_halfwidth))
+
+        result.history.append(
+            {
+                "n_simulations": n,
+                "relative_error": result.relative_error,
+                "quantile_halfwidth": result.quantile_halfwidth,
+            }
+        )
+
+        result.converged = max(needed) <= n
+        if result.converged:
+            break
+
+        batch = int(min(max(needed) * 1.1 - n, n * (growth - 1), max_samples - n))
+        batch = max(batch, min(initial_batch, max_samples - n))
+
+    return result
+
+
+def _needed(n, error, target):
+    if target is None:
+        return np.inf
+    if error <= target:
+        return n
+    if not np.isfinite(error):
+        return np.inf
+    return int(np.ceil(n * (error / target) ** 2))
+
+
+def _quantile_interval(result, totals, quantile, z):
+    n = totals.size
+    spread = z * np.sqrt(n * quantile * (1 - quantile))
+    ranks = [
+        int(np.clip(np.floor(n * quantile - spread), 0, n - 1)),
+        int(np.clip(np.floor(n * quantile), 0, n - 1)),
+        int(np.clip(np.ceil(n * quantile + spread), 0, n - 1)),
+    ]
+
+    low, value, high = np.partition(totals, ranks)[ranks].astype(np.float64)
+    result.quantile_value = float(value)
+    result.quantile_interval = (float(low), float(high))
+    result.quantile_halfwidth = float(high - low) / 2
@@ -0,0 +1,287 @@
+import numpy as np
+from copula import simulate_correlated
+from rng import step_generators
+from special import norm_cdf, norm_ppf
+
+# Tail mass left out when a distribution with unbounded support is put on a grid
+_TAIL = 1e-14
+
+
+def _normal_moments(step):
+    return step.mean, step.stdev**2
+
+
+def _exponential_moments(step):
+    return 1 / step.rate, 1 / step.rate**2
+
+
+def _uniform_moments(step):
+    return (step.low + step.high) / 2, (step.high - step.low) ** 2 / 12
+
+
+# Exact mean and variance per distribution family
+MOMENTS = {
+    "normal": _normal_moments,
+    "exponential": _exponential_moments,
+    "uniform": _uniform_moments,
+}
+
+
+def _exponential_support(step):
+    return 0.0, -np.log(_TAIL) / step.rate
+
+
+def _exponential_cdf(step, x):
+    return -np.expm1(-step.rate * np.maximum(x, 0))
+
+
+def _uniform_support(step):
+    return step.low, step.high
+
+
+def _uniform_cdf(step, x):
+    return np.clip((x - step.low) / (step.high - step.low), 0, 1)
+
+
+# Support and CDF per family, for putting non-normal steps on the convolution grid
+GRID_FAMILIES = {
+    "exponential": (_exponential_support, _exponential_cdf),
+    "uniform": (_uniform_support, _uniform_cdf),
+}
+
+
+class TotalDistribution:
+    """
+    Distribution of the total time, computed without sampling where possible.
+
+    Attributes:
+        method (str): "normal", "gamma", "convolution" or "monte_carlo".
+        mean (float): Mean of the total.
+        variance (float): Variance of the total.
+        x (np.ndarray): Grid of total times.
+        pdf (np.ndarray): Density on the grid.
+        cdf (np.ndarray): Cumulative probability on the grid.
+
+    """
+
+    def __init__(self, method, mean, variance, x, pdf, cdf, ppf=None):
+        self.method = method
+        self.mean = float(mean)
+        self.variance = float(variance)
+        self.x = x
+        self.pdf = pdf
+        self.cdf = cdf
+        self._ppf = ppf
+
+    @property
+    def std(self) -> float:
+        """Standard deviation of the total."""
+        return float(np.sqrt(self.variance))
+
+    def quantile(self, q):
+        """
+        Quantiles of the total.
+
+        Args:
+            q (float or array-like): Quantile(s) between 0 and 1.
+
+        Returns:
+            float or np.ndarray: Quantile value(s).
+
+        """
+        if self._ppf is not None:
+            result = self._ppf(np.asarray(q, dtype=np.float64))
+        else:
+            result = np.interp(q, self.cdf, self.x)
+        return float(result) if np.ndim(q) == 0 else result
+
+    def probability_above(self, threshold: float) -> float:
+        """
+        Probability that the total exceeds a threshold.
+
+        Args:
+            threshold (float): Total time.
+
+        Returns:
+            float: P(Total > threshold).
+
+        """
+        return float(1 - np.interp(threshold, self.x, self.cdf, left=0.0, right=1.0))
+
+
+def analyze_total(
+    steps, grid_size: int = 2**14, n_fallback: int = 200_000, seed=None, correlations=None
+) -> TotalDistribution:
+    """
+    Computes the distribution of the total of steps without sampling.
+
+    Normal steps are summed exactly, also when they are correlated with each
+    other. Degenerate steps (zero spread) only shift the total. If the rest are
+    exponentials with a common rate the total is a shifted gamma (Erlang).
+    Other mixes of normal, exponential and uniform steps are convolved
+    numerically on a grid with the FFT. Steps without a known distribution,
+    and correlations that involve other steps than normals, fall back to Monte Carlo.
+
+    Args:
+        steps (list[ProcessStep]): Steps to add up.
+        grid_size (int): Points of the density grid. By default 2**14
+        n_fallback (int): Samples drawn when falling back to Monte Carlo. By default 200 000
+        seed (None, int, SeedSequence or Generator): Seed of the Monte Carlo fallback.
+        correlations (dict or None): (name, name) to correlation. By default independent steps
+
+    Returns:
+        TotalDistribution: Mean, variance, density and quantiles of the total.
+
+    """
+    steps = steps or []
+    correlations = {pair: rho for pair, rho in (correlations or {}).items() if rho != 0}
+    by_name = {step.name: step for step in steps}
+    if any(step.family not in MOMENTS for step in steps) or any(
+        by_name[name].family != "normal" for pair in correlations for name in pair
+    ):
+        return _monte_carlo(steps, n_fallback, grid_size, seed, correlations)
+
+    moments = np.array([MOMENTS[step.family](step) for step in steps]).reshape(-1, 2)
+    mean, variance = moments.sum(axis=0)
+
+    # Correlated normals sum to a normal with their covariances added
+    covariance = sum(
+        2 * rho * by_name[a].stdev * by_name[b].stdev for (a, b), rho in correlations.items()
+    )
+    variance = max(variance + covariance, 0.0)
+
+    shift = 0.0
+    normal_variance = 0.0
+    others = []
+    for step in steps:
+        step_mean, step_variance = MOMENTS[step.family](step)
+        if step_variance == 0:
+            shift += step_mean
+        elif step.family == "normal":
+            shift += step_mean
+            normal_variance += step_variance
+        else:
+            others.append(step)
+    normal_variance = max(normal_variance + covariance, 0.0)
+
+    if not others:
+        return _normal(mean, variance, grid_size)
+
+    exponential = all(step.family == "exponential" for step in others)
+    rates = {step.rate for step in others} if exponential else set()
+    if normal_variance == 0 and len(rates) == 1:
+        return _gamma(len(others), rates.pop(), shift, mean, variance, grid_size)
+
+    return _convolution(others, shift, normal_variance, mean, variance, grid_size)
+
+
+def _normal(mean, variance, grid_size):
+    std = np.sqrt(variance)
+    if std == 0:
+        x = np.array([mean, mean])
+        pdf = np.array([np.inf, np.inf])
+        cdf = np.array([0.0, 1.0])
+        return TotalDistribution(
+            "normal", mean, 0.0, x, pdf, cdf, ppf=lambda q: np.full(np.shape(q), mean)
+        )
+
+    x = np.linspace(mean - 10 * std, mean + 10 * std, grid_size)
+    z = (x - mean) / std
+    pdf = np.exp(-0.5 * z * z) / (std * np.sqrt(2 * np.pi))
+
+    def ppf(q):
+        return mean + std * norm_ppf(q)
+
+    return TotalDistribution("normal", mean, variance, x, pdf, norm_cdf(z), ppf=ppf)
+
+
+def _gamma(shape, rate, shift, mean, variance, grid_size):
+    # Erlang distribution, CDF 1 - exp(-rate x) * sum_{i < shape} (rate x)^i / i!
+    upper = (shape + 40 * np.sqrt(shape) + 40) / rate
+    x = np.linspace(0, upper, grid_size)
+    y = rate * x
+
+    log_terms = np.zeros_like(y)
+    term_sum = np.ones_like(y)
+    with np.errstate(divide="ignore"):
+        log_y = np.log(y)
+    for i in range(1, shape):
+        log_terms += log_y - np.log(i)
+        term_sum += np.exp(log_terms)
+
+    cdf = np.clip(1 - np.exp(-y) * term_sum, 0, 1)
+    log_factorial = np.sum(np.log(np.arange(1, shape)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_pdf = np.log(rate) + (shape - 1) * log_y - y - log_factorial
+    pdf = np.nan_to_num(np.exp(log_pdf)) if shape > 1 else rate * np.exp(-y)
+
+    return TotalDistribution("gamma", mean, variance, x + shift, pdf, cdf)
+
+
+def _convolution(others, shift, normal_variance, mean, variance, grid_size):
+    std = np.sqrt(normal_variance)
+    supports = [GRID_FAMILIES[step.family][0](step) for step in others]
+    if std > 0:
+        supports.append((-10 * std, 10 * std))
+
+    widths = [high - low for low, high in supports]
+    step_size = sum(widths) / (grid_size - 1)
+
+    # Probability mass of every component per grid cell, centered on the cell
+    masses = []
+    for (low, high), step in zip(supports, others):
+        cdf = GRID_FAMILIES[step.family][1]
+        masses.append(
+            _cell_masses(lambda x, step=step, cdf=cdf: cdf(step, x), low, high, step_size)
+        )
+    if std > 0:
+        masses.append(
+            _cell_masses(lambda x: norm_cdf(x / std), -10 * std, 10 * std, step_size)
+        )
+
+    length = sum(mass.size for mass in masses) - len(masses) + 1
+    n_fft = 1 << (length - 1).bit_length()
+    spectrum = np.ones(n_fft // 2 + 1, dtype=np.complex128)
+    for mass in masses:
+        spectrum *= np.fft.rfft(mass, n_fft)
+
+    total_mass = np.clip(np.fft.irfft(spectrum, n_fft)[:length], 0, None)
+    total_mass /= total_mass.sum()
+
+    origin = sum(low for low, _ in supports) + shift
+    x = origin + step_size * np.arange(length)
+    cdf = np.cumsum(total_mass) - total_mass / 2
+    return TotalDistribution("convolution", mean, variance, x, total_mass / step_size, cdf)
+
+
+def _cell_masses(cdf, low, high, step_size):
+    cells = max(int(np.ceil((high - low) / step_size)), 1)
+    centers = low + step_size * np.arange(cells + 1)
+    edges = np.concatenate(([centers[0] - step_size / 2], centers + step_size / 2))
+    return np.diff(cdf(edges))
+
+
+def _monte_carlo(steps, n_simulations, grid_size, seed, correlations):
+    if correlations:
+        total = simulate_correlated(steps, correlations, n_simulations, seed)["Total"]
+    else:
+        generators = step_generators([step.name for step in steps], seed)
+        total = np.zeros(n_simulations)
+        for step in steps:
+            total += step.simulate(n_simulations=n_simulations, rng=generators[step.name])
+
+    total.sort()
+    bins = min(grid_size, max(n_simulations // 100, 10))
+    counts, edges = np.histogram(total, bins=bins, density=True)
+    x = (edges[:-1] + edges[1:]) / 2
+    cdf = (np.arange(n_simulations) + 0.5) / n_simulations
+
+    return TotalDistribution(
+        "monte_carlo",
+        total.mean(),
+        total.var(ddof=1),
+        x,
+        counts,
+        np.interp(x, total, cdf),
+        ppf=lambda q: np.quantile(total, q),
+    )
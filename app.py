@@ -1,24 +1,35 @@
 import streamlit as st
+import instrumentation
 from process import Process
+from process_steps import STEP_TYPES
 import app_fragments
 
 # This is the main page of the app.
 # Content to this page has been mainly been implemetned using fragments properly manage execution flow and to avoid unecessary reruns of the whole page/app.
 
+# Stage timings in the sidebar, only with MC_SIMULATOR_DEBUG=1
+app_fragments.debug_panel()
+
 # Title
 st.markdown("""# Montecarlo Simulation""")
 
 st.markdown("""
 ## Instructions:
-1. **Choose Distribution Type**: Select from Exponential, Normal, or Uniform.
+1. **Choose Distribution Type**: Select from Exponential, Normal, Uniform, Lognormal, Gamma, Weibull, Triangular, PERT, Empirical or Discrete.
 2. **Add Process Steps**: Define the parameters for the selected distribution.
    - **Exponential**: Enter a rate (λ).
    - **Normal**: Enter mean and standard deviation.
    - **Uniform**: Enter lower and upper bounds.
+   - **Lognormal**, **Gamma**, **Weibull**: Enter the parameters of the distribution.
+   - **Triangular**, **PERT**: Enter optimistic, most likely and pessimistic durations.
+   - **Empirical**: Paste observed durations, separated by commas.
+   - **Discrete**: Enter the possible durations and their probabilities.
+   - **Duration Log**: Upload a CSV or Parquet file of measured durations to resample.
 3. **Adjust Process Steps**: After adding steps, you can update the parameters or delete steps as needed.
-4. **Simulate Process**: Specify the number of simulations and click "Simulate" to generate results.
+4. **Simulate Process**: Specify the number of simulations and a seed, then click "Simulate" to generate results. The same seed gives the same results. Large runs show their progress and can be cancelled, keeping the samples drawn so far.
 5. **Visualize Results**: Adjust the bin count for the histogram and view the simulation outcomes.
-6. **Download Data**: Download the simulation results as a CSV file.
+6. **Download Data**: Choose CSV, Parquet or compressed NumPy (NPZ), prepare the file and download the simulation results.
+7. **Save and Open Models**: Download the process, with its seed and optionally its results, as a .mcsim file and open it again later.
             """)
 
 st.divider()
@@ -29,7 +40,7 @@ if "process" not in st.session_state:
 
 # Selectbox for distribution types
 st.markdown("## Add steps")
-process_type = st.selectbox("Select Distribution", ("Exponential", "Normal", "Uniform"))
+process_type = st.selectbox("Select Distribution", [*STEP_TYPES, app_fragments.DURATION_LOG])
 
 # Adds form
 app_fragments.process_step_form(process_type)
@@ -58,17 +69,24 @@ else:
     n_simulations = st.number_input(
         "Number of simulations", min_value=100, value=1000, step=1
     )
+    seed = st.number_input("Seed", min_value=0, value=st.session_state.process.seed or 0, step=1)
     simulate_button = st.button("Simulate")
 
     if simulate_button:
-        results = st.session_state.process.simulate_process(n_simulations=n_simulations)
-        st.session_state.simulation_results = results
+        # Identical scenarios (steps, seed and count) are served from the shared cache,
+        # large runs are simulated in the background
+        app_fragments.start_simulation(n_simulations, seed)
+
+    if "simulation_job" in st.session_state:
+        app_fragments.simulation_progress()
 
     if "simulation_results" in st.session_state:
         st.write("## Simulation results")
 
         st.write("### Statistics")
-        stats = st.session_state.simulation_results.describe()
+        # Computed once per result and cached on it, not on every rerun
+        with instrumentation.stage("summary"):
+            stats = st.session_state.simulation_results.summary()
         st.dataframe(stats, use_container_width=True)
 
         st.write("### Visualization")
@@ -77,3 +95,8 @@ else:
 
         st.write("### Download results")
         app_fragments.download_results()
+
+st.divider()
+
+st.markdown("## Save or open a model")
+app_fragments.save_and_open()
@@ -1,35 +1,88 @@
+import io
+import os
+import uuid
+import numpy as np
 import streamlit as st
-import altair as alt
-from process_steps import ExponentialStep, NormalStep, UniformStep
+import instrumentation
+from binning import BinCache
+from empirical import DurationLogStep, save_upload
+from export import EXPORT_FORMATS, available_formats, export_result
+from jobs import JobRunner
+from process import Process
+from process_steps import STEP_TYPES
+from result_cache import ResultCache, cache_key, process_fingerprint
+from serialization import EXTENSION
 
-alt.theme.enable("quartz")
+# Runs with at least this many samples are simulated in the background
+BACKGROUND_THRESHOLD = 100_000
+
+# Selectbox option for steps resampling an uploaded log, offered after STEP_TYPES
+DURATION_LOG = "Duration Log"
+
+# Size of the quantile table of large duration logs
+LOG_TABLE_POINTS = 4096
+
+
+def _parse_list(text: str) -> tuple:
+    # Numbers separated by commas, semicolons or whitespace
+    return tuple(float(item) for item in text.replace(";", ",").replace(",", " ").split())
+
+
+def _param_input(param, value=None, key=None):
+    """
+    Adds the input of one parameter, built from its schema.
+
+    Args:
+        param (Param): Parameter schema.
+        value (float, tuple or None): Current value, by default the schema default.
+        key (str or None): Widget key.
+
+    Returns:
+        float or tuple: Entered value. Lists that are not numbers are returned as text,
+            so that step validation rejects them.
+
+    """
+    value = param.default if value is None else value
+
+    if param.kind == "list":
+        text = st.text_input(
+            param.label,
+            value=", ".join(f"{item:g}" for item in value),
+            help="Numbers separated by commas",
+            key=key,
+        )
+        try:
+            return _parse_list(text)
+        except ValueError:
+            return text
+
+    return st.number_input(
+        param.label, min_value=param.min_value, value=float(value), step=0.1, key=key
+    )
 
 
 def process_step_form(process_type: str):
     """
     Adds form components based on users selection.
 
+    The inputs are generated from the parameter schema of the selected step type.
+
     Args:
-        process_type (str): value of selebox in app.py -file.  
+        process_type (str): value of selebox in app.py -file, a key of STEP_TYPES or DURATION_LOG.
 
     """
 
-    with st.form("add_process_step", clear_on_submit=True):
-        st.write("Add process step:")
+    if process_type == DURATION_LOG:
+        duration_log_form()
+        return
 
-        if process_type == "Exponential":
-            name = st.text_input("add name")
-            rate = st.number_input("Rate (lambda)", min_value=0.01, step=0.1)
+    step_type = STEP_TYPES[process_type]
 
-        elif process_type == "Normal":
-            name = st.text_input("add name")
-            mean = st.number_input("Mean", min_value=0.0, step=0.1)
-            std_dev = st.number_input("Standard Deviation", min_value=0.0, step=0.1)
+    with st.form("add_process_step", clear_on_submit=True):
+        st.write("Add process step:")
 
-        elif process_type == "Uniform":
-            name = st.text_input("add name")
-            lower_bound = st.number_input("Lower Bound", min_value=0.0, step=0.1)
-            upper_bound = st.number_input("Upper Bound", min_value=0.0, step=0.1)
+        name = st.text_input("add name")
+        params = {param.name: _param_input(param) for param in step_type.schema}
 
         # A button to add step
         add_step = st.form_submit_button("Add Step")
@@ -44,30 +97,58 @@ def process_step_form(process_type: str):
                     st.error("Name already exists")
 
                 else:
-                    if process_type == "Exponential":
-                            st.session_state.process.insertAtEnd(
-                                ExponentialStep(name, rate)
-                            )
-
-                    elif process_type == "Normal":
-                            st.session_state.process.insertAtEnd(
-                                NormalStep(name, mean, std_dev)
-                            )
-
-                    elif process_type == "Uniform":
-                            try:
-                                st.session_state.process.insertAtEnd(
-                                    UniformStep(name, lower_bound, upper_bound)
-                                )
-                            except AssertionError as e:
-                                st.error(f"Validation error: {e}")
-                            except Exception as e:
-                                 st.error(f"Unexpected error: {e}")
+                    try:
+                        st.session_state.process.insertAtEnd(step_type(name, **params))
+                    except AssertionError as e:
+                        st.error(f"Validation error: {e}")
+                    except Exception as e:
+                        st.error(f"Unexpected error: {e}")
 
             except Exception as e:
                 st.exception(e)
 
 
+def duration_log_form():
+    """
+    Adds a form that creates a step from an uploaded CSV or Parquet log of measured durations.
+    """
+
+    with st.form("add_duration_log", clear_on_submit=True):
+        st.write("Add step from a duration log:")
+
+        name = st.text_input("add name")
+        upload = st.file_uploader("Duration log", type=["csv", "parquet"])
+        column = st.text_input("Column", help="Leave empty to use the first column")
+        compact = st.checkbox(
+            f"Keep {LOG_TABLE_POINTS} quantiles instead of every observation",
+            help="Recommended for logs with millions of rows",
+        )
+
+        add_step = st.form_submit_button("Add Step")
+
+        if add_step:
+            if not name:
+                st.error("Name cannot be empty.")
+
+            elif name in st.session_state.process.get_names():
+                st.error("Name already exists")
+
+            elif upload is None:
+                st.error("Upload a CSV or Parquet file.")
+
+            else:
+                # Uploads are stored under their content hash, so steps hash the same across sessions
+                path = save_upload(upload.getvalue(), os.path.splitext(upload.name)[1].lower())
+                try:
+                    st.session_state.process.insertAtEnd(
+                        DurationLogStep(
+                            name, path, column or None, LOG_TABLE_POINTS if compact else None
+                        )
+                    )
+                except (AssertionError, KeyError, ValueError, ImportError) as e:
+                    st.error(f"Could not read the log: {e}")
+
+
 @st.fragment
 def show_process_steps():
     """
@@ -81,80 +162,28 @@ def show_process_steps():
     else:
         for i, step in enumerate(st.session_state.process.get_steps()):
             with st.popover(f"{step.name}", use_container_width=True):
-                if isinstance(step, ExponentialStep):
-                    st.write(step.name)
-
-                    new_rate = st.number_input(
-                        "rate (lambda)",
-                        min_value=0.01,
-                        value=step.rate,
-                        step=0.1,
-                        key=f"rate_{i}",
-                    )
-                    update_step = st.button("Update", key=f"update_{i}")
-
-                    if update_step:
-                        st.session_state.process.update_step(step.name, rate=new_rate)
-                        st.success("Step updated.")
-                        st.success(f"{step.name} successfully updated.")
-                        st.rerun(scope="fragment")
-
-                elif isinstance(step, NormalStep):
-                    st.write(step.name)
-
-                    new_mean = st.number_input(
-                        "Mean",
-                        min_value=0.0,
-                        value=step.mean,
-                        step=0.1,
-                        key=f"mean_{i}",
-                    )
-                    new_std_dev = st.number_input(
-                        "Standard Deviation",
-                        min_value=0.0,
-                        value=step.stdev,
-                        step=0.1,
-                        key=f"std_dev{i}",
-                    )
-                    update_step = st.button("Update", key=f"update_{i}")
-
-                    if update_step:
-                        st.session_state.process.update_step(
-                            step.name, mean=new_mean, stdev=new_std_dev
-                        )
-                        st.success("Step updated.")
+                st.write(step.name)
+
+                if isinstance(step, DurationLogStep):
+                    st.write(f"Resamples {step.table.count:,} logged durations.")
+
+                params = {
+                    param.name: _param_input(param, getattr(step, param.name), key=f"{param.name}_{i}")
+                    for param in step.schema
+                }
+                update_step = step.schema and st.button("Update", key=f"update_{i}")
+
+                if update_step:
+                    try:
+                        # Building a new step runs the validation of the step type
+                        updated = type(step)(step.name, **params)
+                    except AssertionError as e:
+                        st.error(f"Validation error: {e}")
+                    else:
+                        st.session_state.process.update_step(step.name, **updated.get_params())
                         st.success(f"{step.name} successfully updated.")
                         st.rerun(scope="fragment")
 
-                elif isinstance(step, UniformStep):
-                    st.write(step.name)
-                    new_lower_bound = st.number_input(
-                        "Lower Bound",
-                        min_value=0.0,
-                        value=step.low,
-                        step=0.1,
-                        key=f"low_{i}",
-                    )
-                    new_upper_bound = st.number_input(
-                        "Upper Bound",
-                        min_value=0.0,
-                        value=step.high,
-                        step=0.1,
-                        key=f"high_{i}",
-                    )
-                    update_step = st.button("Update", key=f"update_{i}")
-
-                    if update_step:
-                            if new_lower_bound <= new_upper_bound:                            
-                                st.session_state.process.update_step(
-                                    step.name, low=new_lower_bound, high=new_upper_bound
-                                )
-                                st.success("Step updated.")
-                                st.success(f"{step.name} successfully updated.")
-                                st.rerun(scope="fragment")
-                            else:
-                                 st.error("Lower bound must be  less than or equal to upper bound")
-
                 if st.button("Delete step", key=f"delete_{i}"):
                     st.session_state.process.deleteStep(step.name)
                     st.success(f"Step '{step.name}' deleted.")
@@ -169,25 +198,294 @@ def histogram():
 
     bins = st.slider("Number of bins", min_value=2, max_value=200, value=20)
 
-    histogram = (
-        alt.Chart(st.session_state.simulation_results)
-        .mark_bar()
-        .encode(alt.X("Total:Q", bin=alt.Bin(maxbins=bins)), y="count()")
-        .interactive()
-    )
-    st.altair_chart(histogram, use_container_width=True)
+    # Bins are counted on the server, so the chart payload depends on bins, not samples
+    bars = get_bin_cache().get(st.session_state.simulation_results, bins)
+
+    alt = get_altair()
+    with instrumentation.stage("altair_chart", samples=bins):
+        histogram = (
+            alt.Chart(bars)
+            .mark_bar()
+            .encode(
+                alt.X("bin_start:Q", bin="binned", title="Total"),
+                x2="bin_end:Q",
+                y=alt.Y("count:Q", title="Count of Records"),
+            )
+            .interactive()
+        )
+        st.altair_chart(histogram, use_container_width=True)
 
 
 @st.fragment
 def download_results():
     """
-    Checks if simulation results exist in session state and provides a button to download the results as a CSV file.
+    Checks if simulation results exist in session state and provides a button to download the results.
+
+    The file is only generated when the user asks for it, and the bytes are cached per result and format.
     """
 
     if "simulation_results" in st.session_state:
+        results = st.session_state.simulation_results
+        fmt = st.selectbox("File format", available_formats())
+        file_name, mime = EXPORT_FORMATS[fmt]
+
+        cache = get_export_cache()
+        key = f"{results.id}:{fmt}"
+        data = cache.get(key)
+
+        if data is None:
+            if st.button("Prepare download"):
+                data = cache.get_or_compute(key, lambda: export_result(results, fmt))
+
+        if data is not None:
+            st.download_button(
+                label="Download Simulation Data",
+                data=data,
+                file_name=file_name,
+                mime=mime,
+            )
+
+
+@st.fragment
+def save_and_open():
+    """
+    Provides a download of the process, optionally with its simulation results, and an upload to open a saved one.
+
+    Saved files hold the step definitions as JSON and the samples as raw arrays, so opening them does not parse the samples.
+    """
+    process = st.session_state.process
+    results = st.session_state.get("simulation_results")
+    include_results = results is not None and st.checkbox("Include simulation results")
+    results = results if include_results else None
+
+    # Built on request and cached like the exports, keyed on the definition and the results
+    cache = get_export_cache()
+    fingerprint = process_fingerprint(process.get_steps(), process.get_correlations())
+    key = f"model:{fingerprint}:{process.seed}:{results.id if results is not None else None}"
+    data = cache.get(key)
+
+    if data is None and st.button("Prepare model download"):
+        try:
+            data = cache.get_or_compute(key, lambda: model_bytes(process, results))
+        except ValueError as e:
+            st.error(f"The process cannot be saved: {e}")
+
+    if data is not None:
+        st.download_button(
+            label="Download model",
+            data=data,
+            file_name=f"process{EXTENSION}",
+            mime="application/octet-stream",
+        )
+
+    upload = st.file_uploader("Saved model", type=[EXTENSION.lstrip(".")])
+    if upload is not None and st.button("Open model"):
+        try:
+            with instrumentation.stage("load_model"):
+                # Uploads are untrusted, so they may not point steps at server files
+                process, results = Process.load(upload, trusted=False)
+        except (ValueError, KeyError, TypeError) as e:
+            st.error(f"Could not open {upload.name}: {e}")
+            return
+
+        st.session_state.process = process
+        if results is not None:
+            st.session_state.simulation_results = results
+        else:
+            st.session_state.pop("simulation_results", None)
+        st.rerun()
+
+
+def model_bytes(process, results=None) -> bytes:
+    """
+    Returns a process, and optionally its results, as the contents of a saved model file.
+    """
+    buffer = io.BytesIO()
+    process.save(buffer, results)
+    return buffer.getvalue()
+
+
+@st.cache_resource
+def get_altair():
+    """
+    Imports Altair on the first chart instead of at startup, and enables the app theme once per server.
+    """
+    import altair as alt
+
+    alt.theme.enable("quartz")
+    return alt
+
+
+@st.cache_resource
+def get_bin_cache() -> BinCache:
+    """
+    Returns the histogram bin cache shared by all sessions of the server.
+    """
+    return BinCache()
+
+
+@st.cache_resource
+def get_export_cache() -> ResultCache:
+    """
+    Returns the cache of generated download files shared by all sessions of the server.
+    """
+    return ResultCache(max_bytes=256 * 2**20)
+
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """
+    Returns the result cache shared by all sessions of the server.
+
+    Set the MC_SIMULATOR_CACHE_DIR environment variable to also keep results on disk, in a directory
+    that only the server can write to.
+    """
+    return ResultCache(directory=os.environ.get("MC_SIMULATOR_CACHE_DIR"))
+
+
+def simulate_cached(n_simulations: int, seed: int):
+    """
+    Simulates the process in session state, or returns the cached result of an identical run.
+
+    On a cache miss only the steps changed since the session's last run are redrawn.
+    Results are kept as float32 to halve the memory held per session.
+
+    Args:
+        n_simulations (int): number of samples to draw.
+        seed (int): seed of the run.
+
+    Returns:
+        results (SimulationResult): simulation results, shared with other sessions and must not be modified.
+    """
+    process = st.session_state.process
+    process.seed = seed
+    key = cache_key(
+        process.get_steps(), n_simulations, seed, process.get_correlations(), dtype="float32"
+    )
+
+    return get_result_cache().get_or_compute(
+        key,
+        lambda: process.simulate_result(
+            n_simulations=n_simulations, seed=seed, dtype=np.float32, incremental=True
+        ),
+    )
+
+
+@st.cache_resource
+def get_job_runner() -> JobRunner:
+    """
+    Returns the background simulation runner shared by all sessions of the server.
+
+    Set the MC_SIMULATOR_JOB_WORKERS environment variable to change how many simulations run at once.
+    """
+    return JobRunner(max_workers=int(os.environ.get("MC_SIMULATOR_JOB_WORKERS", 2)))
+
+
+def start_simulation(n_simulations: int, seed: int):
+    """
+    Simulates the process in session state, in the background for large runs.
+
+    Small runs and cached scenarios are stored in session state right away. Large runs are
+    submitted to the job runner, and ``simulation_progress`` reports on them.
+
+    Args:
+        n_simulations (int): number of samples to draw.
+        seed (int): seed of the run.
+    """
+    process = st.session_state.process
+    process.seed = seed
+    key = cache_key(
+        process.get_steps(), n_simulations, seed, process.get_correlations(), dtype="float32"
+    )
+    results = get_result_cache().get(key)
+
+    if results is None and n_simulations < BACKGROUND_THRESHOLD:
+        results = simulate_cached(n_simulations, seed)
+
+    if results is not None:
+        st.session_state.simulation_results = results
+        return
+
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
+    try:
+        st.session_state.simulation_job = get_job_runner().submit(
+            process.get_steps(),
+            n_simulations,
+            seed=seed,
+            owner=st.session_state.session_id,
+            dtype=np.float32,
+            correlations=process.get_correlations(),
+        )
+    except RuntimeError:
+        st.error("A simulation is already running, wait for it or cancel it first.")
+
+
+@st.fragment(run_every=0.5)
+def simulation_progress():
+    """
+    Shows the progress of the session's background simulation with a button to cancel it.
+
+    When the job stops its result is stored in session state. Results of cancelled jobs hold the
+    samples finished so far and are not cached.
+    """
+    job = st.session_state.get("simulation_job")
+    if job is None:
+        return
+
+    if not job.done:
+        st.progress(
+            job.progress,
+            text=f"Simulating {job.completed:,} / {job.n_simulations:,} samples ({job.elapsed:.1f} s)",
+        )
+        if st.button("Cancel simulation"):
+            job.cancel()
+        return
+
+    del st.session_state.simulation_job
+
+    if job.status == "failed":
+        st.error(f"Simulation failed: {job.error}")
+        return
+
+    if job.status == "done":
+        key = cache_key(job.steps, job.n_simulations, job.seed, job.correlations, dtype="float32")
+        get_result_cache().put(key, job.result)
+
+    if job.result is not None and job.result.n_simulations > 0:
+        st.session_state.simulation_results = job.result
+    st.rerun()
+
+
+@st.cache_resource
+def get_recorder() -> instrumentation.Recorder:
+    """
+    Turns on instrumentation for the server and returns its recorder.
+
+    Set MC_SIMULATOR_TRACE_ALLOCATIONS=1 to also measure allocations per stage.
+    """
+    return instrumentation.enable(
+        trace_allocations=os.environ.get("MC_SIMULATOR_TRACE_ALLOCATIONS") == "1"
+    )
+
+
+def debug_panel():
+    """
+    Shows stage timings in the sidebar when the MC_SIMULATOR_DEBUG environment variable is set to 1.
+
+    Metrics cover all sessions of the server. Without the variable instrumentation stays off.
+    """
+    if os.environ.get("MC_SIMULATOR_DEBUG") != "1":
+        return
+
+    recorder = get_recorder()
+    with st.sidebar:
+        st.markdown("## Debug metrics")
+        st.dataframe(list(recorder.to_dict().values()), use_container_width=True)
         st.download_button(
-            label="Download Simulation Data",
-            data=st.session_state.simulation_results.to_csv(index=False),
-            file_name="simulation_results.csv",
-            mime="text/csv",
+            "Download metrics (JSON)", recorder.to_json(), "metrics.json", "application/json"
         )
+        if st.button("Reset metrics"):
+            recorder.reset()
+            st.rerun()
@@ -0,0 +1,63 @@
+"""
+Scaling benchmark for Process.simulate_parallel.
+
+Run from the repository root:
+
+    python benchmarks/bench_parallel.py --n 20000000 --steps 10
+
+Prints wall time, samples/sec and speedup for 1..N workers.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from process import Process  # noqa: E402
+from process_steps import ExponentialStep, NormalStep, UniformStep  # noqa: E402
+
+
+def build_process(n_steps):
+    process = Process()
+    for i in range(n_steps):
+        if i % 3 == 0:
+            process.insertAtEnd(NormalStep(f"normal_{i}", mean=10, stdev=2))
+        elif i % 3 == 1:
+            process.insertAtEnd(ExponentialStep(f"expo_{i}", rate=0.5))
+        else:
+            process.insertAtEnd(UniformStep(f"uni_{i}", low=1, high=4))
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=10_000_000, help="number of simulations")
+    parser.add_argument("--steps", type=int, default=10, help="number of process steps")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", choices=("thread", "process"), default="thread")
+    parser.add_argument("--summary", action="store_true", help="merge aggregates instead of samples")
+    args = parser.parse_args()
+
+    process = build_process(args.steps)
+    samples = args.n * args.steps
+
+    print(f"{'workers':>7} {'seconds':>9} {'samples/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        process.simulate_parallel(
+            n_simulations=args.n,
+            seed=0,
+            n_workers=workers,
+            backend=args.backend,
+            summary=args.summary,
+        )
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>7} {elapsed:>9.3f} {samples / elapsed:>12.3e} {baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
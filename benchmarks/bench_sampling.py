@@ -0,0 +1,66 @@
+"""
+Variance-reduction benchmark for the sampling methods of Process.simulate_process.
+
+Run from the repository root:
+
+    python benchmarks/bench_sampling.py --n 4096 --replications 200
+
+For the mean and the 95th percentile of Total, prints the estimator variance
+over independent replications and the plain Monte Carlo sample count that
+would give the same variance.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parallel import build_process  # noqa: E402
+from sampling import SAMPLING_METHODS  # noqa: E402
+
+
+def estimates(process, n, replications, method):
+    means, p95s = [], []
+    for seed in range(replications):
+        total = process.simulate_process(n, seed=seed, sampling=method)["Total"].to_numpy()
+        means.append(total.mean())
+        p95s.append(np.quantile(total, 0.95))
+    return np.var(means, ddof=1), np.var(p95s, ddof=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=4096, help="samples per replication")
+    parser.add_argument("--steps", type=int, default=6, help="number of process steps")
+    parser.add_argument("--replications", type=int, default=200)
+    args = parser.parse_args()
+
+    process = build_process(args.steps)
+    baseline = None
+
+    print(f"{'method':<11} {'seconds':>8} {'var(mean)':>11} {'plain n':>11} {'var(p95)':>11} {'plain n':>11}")
+    for method in SAMPLING_METHODS:
+        start = time.perf_counter()
+        try:
+            var_mean, var_p95 = estimates(process, args.n, args.replications, method)
+        except ImportError as e:
+            print(f"{method:<11} skipped: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or (var_mean, var_p95)
+        # Plain Monte Carlo variance falls as 1/n, so equal variance needs n * ratio samples
+        plain_mean = args.n * baseline[0] / var_mean
+        plain_p95 = args.n * baseline[1] / var_p95
+        print(
+            f"{method:<11} {elapsed:>8.2f} {var_mean:>11.3e} {plain_mean:>11.0f}"
+            f" {var_p95:>11.3e} {plain_p95:>11.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
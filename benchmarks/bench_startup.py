@@ -0,0 +1,68 @@
+"""
+Cold start benchmark: import latency of the simulation core and of the app.
+
+Run from the repository root:
+
+    python benchmarks/bench_startup.py --repeats 10
+
+Every import runs in a fresh interpreter, so nothing is cached in sys.modules.
+Prints median and worst seconds per target and which heavy packages it loaded.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports timed per target, after the interpreter itself has started
+TARGETS = {
+    "numpy": "import numpy",
+    "core": "import process",
+    "scenarios": "import scenarios",
+    "app": "import streamlit, app_fragments",
+}
+
+# Packages the core should only load on first use
+HEAVY = ("pandas", "altair", "scipy", "pyarrow")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement: str) -> dict:
+    """Imports in a fresh interpreter and returns the seconds and heavy packages loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY)],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5, help="fresh interpreters per target")
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    args = parser.parse_args()
+
+    print(f"{'target':<10} {'median s':>9} {'max s':>7}  loaded")
+    for target in args.targets:
+        runs = [measure(TARGETS[target]) for _ in range(args.repeats)]
+        seconds = [run["seconds"] for run in runs]
+        loaded = ", ".join(runs[-1]["loaded"]) or "-"
+        print(f"{target:<10} {statistics.median(seconds):>9.3f} {max(seconds):>7.3f}  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
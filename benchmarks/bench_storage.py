@@ -0,0 +1,53 @@
+"""
+Memory benchmark for simulation result storage modes.
+
+Run from the repository root:
+
+    python benchmarks/bench_storage.py --n 1000000 --steps 10
+
+Prints heap bytes per sample (one sample = one step draw) for each mode.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parallel import build_process  # noqa: E402
+from result_cache import sizeof  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=1_000_000, help="number of simulations")
+    parser.add_argument("--steps", type=int, default=10, help="number of process steps")
+    args = parser.parse_args()
+
+    process = build_process(args.steps)
+    samples = args.n * args.steps
+
+    modes = {
+        "DataFrame float64": lambda: process.simulate_process(args.n, seed=0),
+        "result float64": lambda: process.simulate_result(args.n, seed=0),
+        "result float32": lambda: process.simulate_result(args.n, seed=0, dtype=np.float32),
+        "result float32 mmap": lambda: process.simulate_result(
+            args.n, seed=0, dtype=np.float32, storage="mmap"
+        ),
+    }
+
+    print(f"{'mode':<22} {'seconds':>8} {'heap MiB':>9} {'bytes/sample':>13}")
+    for mode, simulate in modes.items():
+        start = time.perf_counter()
+        result = simulate()
+        elapsed = time.perf_counter() - start
+        size = sizeof(result)
+        print(f"{mode:<22} {elapsed:>8.3f} {size / 2**20:>9.1f} {size / samples:>13.2f}")
+        del result
+
+
+if __name__ == "__main__":
+    main()
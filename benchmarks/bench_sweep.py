@@ -0,0 +1,60 @@
+"""
+Parameter sweep benchmark: Process.sweep against a loop of update_step and simulate_process.
+
+Run from the repository root:
+
+    python benchmarks/bench_sweep.py --n 10000 --scenarios 200
+
+Prints the time of both approaches and the standard deviation of the estimated
+difference of mean Total between neighbouring scenarios.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parallel import build_process  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--n", type=int, default=10_000, help="samples per scenario")
+    parser.add_argument("--steps", type=int, default=6, help="number of process steps")
+    parser.add_argument("--scenarios", type=int, default=200)
+    args = parser.parse_args()
+
+    process = build_process(args.steps)
+    means = list(np.linspace(8, 12, args.scenarios))
+
+    start = time.perf_counter()
+    process.simulate_process(args.n, seed=0)
+    plain = time.perf_counter() - start
+
+    start = time.perf_counter()
+    loop_means = []
+    for i, mean in enumerate(means):
+        process.update_step("normal_0", mean=float(mean))
+        loop_means.append(process.simulate_process(args.n, seed=i)["Total"].mean())
+    process.update_step("normal_0", mean=10)
+    loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = process.sweep({"normal_0": {"mean": means}}, n_simulations=args.n, seed=0)
+    swept = time.perf_counter() - start
+    sweep_means = result.summary["mean"].to_numpy()[1:]
+
+    step = means[1] - means[0]
+    print(f"single run          {plain:8.3f} s")
+    print(f"loop of {args.scenarios:<5} runs  {loop:8.3f} s")
+    print(f"sweep               {swept:8.3f} s  ({swept / plain:.1f} single runs)")
+    print(f"std of neighbour differences: loop {np.std(np.diff(loop_means) - step):.2e},"
+          f" sweep {np.std(np.diff(sweep_means) - step):.2e}")
+
+
+if __name__ == "__main__":
+    main()
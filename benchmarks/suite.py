@@ -0,0 +1,330 @@
+"""
+Benchmark suite and performance regression check for the simulation engine.
+
+Run from the repository root:
+
+    python benchmarks/suite.py run --output current.json
+    python benchmarks/suite.py run --max-n 100000000 --filter simulate_process
+    python benchmarks/suite.py compare baseline.json current.json --threshold 0.1
+
+Every case runs in a fresh subprocess, so its peak RSS is its own. Per case the
+results hold latency percentiles over the repeats, samples/sec at the median
+and peak RSS. Above 10^7 samples the simulation is timed with streaming
+aggregates, result cases keep a single step, and DataFrame cases are skipped,
+so 10^8 runs fit in a few GiB. ``compare`` (or ``run --baseline``) exits with status 1 when a
+case is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from export import export_result  # noqa: E402
+from binning import histogram_bins  # noqa: E402
+from process import Process  # noqa: E402
+from process_steps import ExponentialStep, NormalStep, UniformStep  # noqa: E402
+
+MIXES = ("normal", "exponential", "uniform", "mixed")
+STEP_COUNTS = (1, 10, 50)
+SIZES = tuple(10**power for power in range(3, 9))
+
+# CSV export is slow and its output large, so it stops at this size
+_CSV_MAX_N = 10**6
+
+# Cases that hold every sample of every step stop at this size, e.g. 50 steps
+# at 10^8 samples would need 40 GB
+_MATERIALIZED_MAX_N = 10**7
+
+
+def build_process(n_steps, mix="mixed"):
+    factories = {
+        "normal": lambda i: NormalStep(f"normal_{i}", mean=10, stdev=2),
+        "exponential": lambda i: ExponentialStep(f"expo_{i}", rate=0.5),
+        "uniform": lambda i: UniformStep(f"uni_{i}", low=1, high=4),
+    }
+    kinds = ("normal", "exponential", "uniform") if mix == "mixed" else (mix,)
+
+    process = Process()
+    for i in range(n_steps):
+        process.insertAtEnd(factories[kinds[i % len(kinds)]](i))
+    return process
+
+
+# Every case returns the function to time and the number of samples it handles
+
+
+def simulate_case(n, steps=10, mix="mixed"):
+    process = build_process(steps, mix)
+    return lambda: process.simulate_process(n, seed=0), n * steps
+
+
+def streaming_case(n, steps=10, mix="mixed"):
+    process = build_process(steps, mix)
+    return lambda: process.simulate_streaming(n, seed=0), n * steps
+
+
+def dataframe_case(n, steps=10):
+    import pandas as pd
+
+    columns = dict(build_process(steps).simulate_process(n, seed=0))
+    return lambda: pd.DataFrame(columns), n * steps
+
+
+def describe_case(n, steps=10):
+    frame = build_process(steps).simulate_process(n, seed=0)
+    return frame.describe, n * (steps + 1)
+
+
+def summary_case(n, steps=10):
+    from summary_stats import summarize
+
+    result = build_process(steps).simulate_result(n, seed=0)
+    return lambda: summarize(result), n * (steps + 1)
+
+
+def histogram_case(n, steps=10):
+    total = build_process(steps).simulate_result(n, seed=0).total
+    return lambda: histogram_bins(total, 20), n
+
+
+def csv_case(n, steps=10):
+    result = build_process(steps).simulate_result(n, seed=0)
+    return lambda: export_result(result, "csv"), n * (steps + 1)
+
+
+CASE_FUNCTIONS = {
+    "simulate_process": simulate_case,
+    "simulate_streaming": streaming_case,
+    "dataframe": dataframe_case,
+    "describe": describe_case,
+    "summary": summary_case,
+    "histogram": histogram_case,
+    "csv_export": csv_case,
+}
+
+
+def case_name(kind, **params):
+    return kind + "[" + ",".join(f"{key}={value}" for key, value in params.items()) + "]"
+
+
+def cases(max_n):
+    """Returns case name to (kind, params) for every case up to ``max_n`` samples."""
+    sizes = [n for n in SIZES if n <= max_n]
+    result = {}
+
+    def add(kind, **params):
+        result[case_name(kind, **params)] = (kind, params)
+
+    for steps in STEP_COUNTS:
+        for n in sizes:
+            kind = "simulate_process" if n <= _MATERIALIZED_MAX_N else "simulate_streaming"
+            add(kind, mix="mixed", steps=steps, n=n)
+    for mix in MIXES:
+        add("simulate_process", mix=mix, steps=10, n=min(10**6, max_n))
+    for n in sizes:
+        steps = 10 if n <= _MATERIALIZED_MAX_N else 1
+        if n <= _MATERIALIZED_MAX_N:
+            add("dataframe", steps=steps, n=n)
+            add("describe", steps=steps, n=n)
+        add("summary", steps=steps, n=n)
+        add("histogram", steps=steps, n=n)
+        if n <= _CSV_MAX_N:
+            add("csv_export", steps=steps, n=n)
+    return result
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(kind, params, repeats):
+    """Times one case in this process."""
+    function, samples = CASE_FUNCTIONS[kind](**params)
+    function()  # warm-up
+
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return {
+        "kind": kind,
+        "params": params,
+        "repeats": repeats,
+        "min": min(times),
+        "mean": float(np.mean(times)),
+        "p50": float(p50),
+        "p90": float(p90),
+        "p99": float(p99),
+        "samples": samples,
+        "samples_per_sec": samples / p50 if p50 > 0 else None,
+        "peak_rss": peak_rss(),
+    }
+
+
+def measure_in_subprocess(kind, params, repeats):
+    case = json.dumps({"kind": kind, "params": params})
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "case", case, "--repeats", str(repeats)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def metadata():
+    import pandas as pd
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(baseline, current, threshold=0.1, metric="p50"):
+    """
+    Compares two result files.
+
+    Args:
+        baseline (dict): Results of the baseline run.
+        current (dict): Results of the current run.
+        threshold (float): Allowed relative slowdown, e.g. 0.1 for 10%.
+        metric (str): Latency metric to compare. By default "p50"
+
+    Returns:
+        list[dict]: One row per case in both runs with the ratio current / baseline
+            and whether it is a regression.
+
+    """
+    rows = []
+    for name, result in current["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or not reference[metric]:
+            continue
+        ratio = result[metric] / reference[metric]
+        rows.append(
+            {
+                "case": name,
+                "baseline": reference[metric],
+                "current": result[metric],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def print_result(name, result):
+    rss = f"{result['peak_rss'] / 2**20:.0f} MiB" if result["peak_rss"] else "-"
+    rate = result["samples_per_sec"] or 0
+    print(f"{name:<58} {result['p50']:>10.4f} {result['p99']:>10.4f} {rate:>12.3e} {rss:>10}")
+
+
+def print_comparison(rows, threshold):
+    print(f"{'case':<58} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['case']:<58} {row['baseline']:>10.4f} {row['current']:>10.4f}"
+            f" {row['ratio']:>7.2f}{flag}"
+        )
+    regressions = sum(row["regression"] for row in rows)
+    print(f"{regressions} of {len(rows)} cases slower than the baseline by more than {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite")
+    run.add_argument("--output", help="JSON file for the results")
+    run.add_argument("--max-n", type=float, default=10**6, help="largest n_simulations, up to 1e8")
+    run.add_argument("--filter", default="", help="only cases whose name contains this text")
+    run.add_argument("--repeats", type=int, default=5)
+    run.add_argument("--in-process", action="store_true", help="no subprocess per case, peak RSS is cumulative")
+    run.add_argument("--baseline", help="JSON file of a baseline run to compare with")
+    run.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown")
+
+    check = commands.add_parser("compare", help="compare two result files")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--threshold", type=float, default=0.1, help="allowed relative slowdown")
+    check.add_argument("--metric", default="p50", choices=("min", "mean", "p50", "p90", "p99"))
+
+    single = commands.add_parser("case", help="run a single case and print its JSON")
+    single.add_argument("case", help='JSON like {"kind": "describe", "params": {"n": 1000}}')
+    single.add_argument("--repeats", type=int, default=5)
+
+    args = parser.parse_args()
+
+    if args.command == "case":
+        case = json.loads(args.case)
+        print(json.dumps(measure(case["kind"], case["params"], args.repeats)))
+        return 0
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        rows = compare(baseline, current, args.threshold, args.metric)
+        return 1 if print_comparison(rows, args.threshold) else 0
+
+    results = {}
+    print(f"{'case':<58} {'p50 s':>10} {'p99 s':>10} {'samples/s':>12} {'peak RSS':>10}")
+    for name, (kind, params) in cases(int(args.max_n)).items():
+        if args.filter not in name:
+            continue
+        if args.in_process:
+            results[name] = measure(kind, params, args.repeats)
+        else:
+            results[name] = measure_in_subprocess(kind, params, args.repeats)
+        print_result(name, results[name])
+
+    report = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(baseline, report, args.threshold)
+        return 1 if print_comparison(rows, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+import numpy as np
+import instrumentation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def histogram_bins(values: np.ndarray, bins: int) -> "pd.DataFrame":
+    """
+    Bins samples into equal-width bars on the server.
+
+    Args:
+        values (np.ndarray): Samples.
+        bins (int): Number of bins.
+
+    Returns:
+        pd.DataFrame: One row per bin with "bin_start", "bin_end" and "count".
+
+    """
+    import pandas as pd
+
+    assert bins > 0, f"Number of bins must be positive, but got {bins}"
+
+    values = np.asarray(values)
+    if values.size == 0:
+        return pd.DataFrame({"bin_start": [], "bin_end": [], "count": []})
+
+    with instrumentation.stage("histogram_bins", samples=values.size):
+        counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({"bin_start": edges[:-1], "bin_end": edges[1:], "count": counts})
+
+
+class BinCache:
+    """
+    Small thread-safe LRU cache of binned histograms.
+
+    Entries are keyed on (result id, column, bin count) and only hold the bars,
+    so the cache never keeps samples alive.
+
+    Args:
+        max_entries (int): Number of histograms to keep. By default 256
+
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, result, bins: int, column: str = "Total") -> "pd.DataFrame":
+        """
+        Returns the binned histogram of a result column, computing it on a miss.
+
+        Args:
+            result (SimulationResult): Simulation result.
+            bins (int): Number of bins.
+            column (str): Column to bin. By default "Total"
+
+        Returns:
+            pd.DataFrame: Bars with "bin_start", "bin_end" and "count".
+
+        """
+        key = (result.id, column, bins)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        bars = histogram_bins(result[column], bins)
+
+        with self._lock:
+            self._entries[key] = bars
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return bars
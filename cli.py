@@ -0,0 +1,195 @@
+"""
+Runs scenario files without Streamlit, e.g. in nightly batch jobs.
+
+Usage:
+    python cli.py scenarios.json [more.yaml ...] --output summaries.jsonl --workers 8
+
+Summaries are written as JSON lines (or CSV rows for a .csv output) as soon
+as each scenario finishes, so a long batch can be followed and a crash loses
+nothing that finished. Failed scenarios are reported and the exit code is 1.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from summary_stats import DEFAULT_QUANTILES, quantile_label
+
+# Scenarios queued per worker, so thousands of scenarios do not sit in the pool at once
+_QUEUED_PER_WORKER = 4
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parses command line arguments."""
+    parser = argparse.ArgumentParser(description="Run Monte Carlo process scenarios from JSON or YAML files.")
+    parser.add_argument("scenarios", nargs="+", help="scenario files, .json, .yaml or .yml")
+    parser.add_argument(
+        "-o", "--output", default="-", help="summary file, .jsonl or .csv. By default JSON lines on stdout"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count(),
+        help="worker processes, 0 runs in this process. By default the number of CPUs",
+    )
+    parser.add_argument("-n", "--n-simulations", type=int, help="samples of scenarios that do not set them")
+    parser.add_argument("--seed", type=int, help="seed of scenarios that do not set one")
+    parser.add_argument(
+        "--quantiles", type=float, nargs="+", default=list(DEFAULT_QUANTILES), help="quantiles in the summaries"
+    )
+    parser.add_argument("--samples-dir", help="also write the samples of every scenario to this directory")
+    parser.add_argument("--samples-format", default="npz", help="csv, parquet or npz. By default npz")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no progress on stderr")
+    return parser.parse_args(argv)
+
+
+def run_one(index: int, spec: dict, options: dict) -> dict:
+    """
+    Runs one scenario in a worker and turns failures into an error record.
+
+    Args:
+        index (int): Position of the scenario in the batch.
+        spec (dict): Scenario.
+        options (dict): Keyword arguments of ``run_scenario``.
+
+    Returns:
+        dict: Summary record, or scenario, index and error.
+
+    """
+    from scenarios import run_scenario
+
+    try:
+        return run_scenario(spec, index=index, **options)
+    except Exception as e:
+        return {"scenario": spec.get("name"), "index": index, "error": f"{type(e).__name__}: {e}"}
+
+
+class SummaryWriter:
+    """
+    Writes summary records to a JSON lines or CSV file, flushing after every record.
+
+    CSV files get one row per scenario and column, with the statistics as columns.
+
+    Args:
+        file (file-like): Text file to write to.
+        fmt (str): "jsonl" or "csv".
+        quantiles (list[float]): Quantiles of the summaries, for the CSV header.
+
+    """
+
+    def __init__(self, file, fmt: str, quantiles):
+        self.file = file
+        self.fmt = fmt
+        self.statistics = ["count", "mean", "std", "min", *map(quantile_label, quantiles), "max"]
+        if fmt == "csv":
+            self.writer = csv.writer(file)
+            self.writer.writerow(["index", "scenario", "column", *self.statistics, "seconds", "error"])
+
+    def write(self, record: dict) -> None:
+        """Writes one record."""
+        if self.fmt == "csv":
+            if "error" in record:
+                empty = [""] * (len(self.statistics) + 2)
+                self.writer.writerow([record["index"], record["scenario"], *empty, record["error"]])
+            for column, stats in record.get("summary", {}).items():
+                values = [stats[statistic] for statistic in self.statistics]
+                self.writer.writerow(
+                    [record["index"], record["scenario"], column, *values, f"{record['seconds']:.4f}", ""]
+                )
+        else:
+            self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
+
+
+def run_batch(specs, writer: SummaryWriter, workers: int, options: dict, progress=None) -> int:
+    """
+    Runs scenarios on a process pool and writes each summary as soon as it is ready.
+
+    Records are written in the order scenarios finish; their "index" gives the
+    position in the batch.
+
+    Args:
+        specs (list[dict]): Scenarios.
+        writer (SummaryWriter): Destination of the records.
+        workers (int): Worker processes, 0 runs the scenarios in this process.
+        options (dict): Keyword arguments of ``run_scenario``.
+        progress (callable or None): Called with (done, total, record) after every scenario.
+
+    Returns:
+        int: Number of failed scenarios.
+
+    """
+    failed = 0
+    done = 0
+
+    def finish(record):
+        nonlocal failed, done
+        done += 1
+        failed += "error" in record
+        writer.write(record)
+        if progress is not None:
+            progress(done, len(specs), record)
+
+    if workers == 0:
+        for index, spec in enumerate(specs):
+            finish(run_one(index, spec, options))
+        return failed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        queued = set()
+        for index, spec in enumerate(specs):
+            queued.add(pool.submit(run_one, index, spec, options))
+            if len(queued) >= workers * _QUEUED_PER_WORKER:
+                finished, queued = wait(queued, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    finish(future.result())
+        for future in wait(queued).done:
+            finish(future.result())
+    return failed
+
+
+def main(argv=None) -> int:
+    """Runs the command line interface and returns the exit code."""
+    args = parse_args(argv)
+
+    from scenarios import load_scenarios
+
+    overrides = {"n_simulations": args.n_simulations, "seed": args.seed}
+    specs = []
+    for path in args.scenarios:
+        for spec in load_scenarios(path):
+            specs.append({**{k: v for k, v in overrides.items() if v is not None}, **spec})
+
+    if args.samples_dir:
+        os.makedirs(args.samples_dir, exist_ok=True)
+    options = {
+        "quantiles": tuple(args.quantiles),
+        "samples_dir": args.samples_dir,
+        "samples_format": args.samples_format,
+    }
+
+    def progress(done, total, record):
+        status = record.get("error") or f"{record['seconds']:.2f}s"
+        print(f"[{done}/{total}] {record['scenario']}: {status}", file=sys.stderr, flush=True)
+
+    fmt = "csv" if args.output.lower().endswith(".csv") else "jsonl"
+    start = time.perf_counter()
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = SummaryWriter(output, fmt, args.quantiles)
+        failed = run_batch(specs, writer, args.workers, options, None if args.quiet else progress)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    if not args.quiet:
+        print(
+            f"{len(specs) - failed} of {len(specs)} scenarios done in {time.perf_counter() - start:.1f}s",
+            file=sys.stderr,
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from copula import checked_groups, correlated_samples
+from rng import child_sequence, make_generator, name_key, seed_sequence
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Standard draws scaled in place are faster than broadcasting parameters in numpy
+
+
+def _draw_normal(rng, params, n):
+    samples = rng.standard_normal((params["mean"].size, n))
+    samples *= params["stdev"][:, None]
+    samples += params["mean"][:, None]
+    return samples
+
+
+def _draw_exponential(rng, params, n):
+    samples = rng.standard_exponential((params["rate"].size, n))
+    samples /= params["rate"][:, None]
+    return samples
+
+
+def _draw_uniform(rng, params, n):
+    samples = rng.random((params["low"].size, n))
+    samples *= (params["high"] - params["low"])[:, None]
+    samples += params["low"][:, None]
+    return samples
+
+
+# Spawn key prefixes keep family streams apart from single step streams
+_FAMILY_STREAM = 0
+_STEP_STREAM = 1
+
+# Batched samplers per distribution family, drawing a (n_steps, n) block at once
+FAMILY_SAMPLERS = {
+    "normal": _draw_normal,
+    "exponential": _draw_exponential,
+    "uniform": _draw_uniform,
+}
+
+
+def family_sampler(step):
+    """
+    Batched sampler of a step's family.
+
+    Families without an entry in FAMILY_SAMPLERS use the ``sample_batch`` of
+    their step type, so new families are batched without changes here.
+
+    Args:
+        step (ProcessStep): Step of the family.
+
+    Returns:
+        callable or None: Sampler, None if the step is drawn on its own.
+
+    """
+    return FAMILY_SAMPLERS.get(step.family) or step.sample_batch
+
+
+class FamilyBlock:
+    """
+    Parameters of all steps of one distribution family as arrays.
+
+    Attributes:
+        family (str): Distribution family.
+        positions (np.ndarray): Indices of the steps in the process order.
+        params (dict): Parameter name to array with one value, or one padded row, per step.
+        sampler (callable): Draws a (n_steps, n) block of the family.
+
+    """
+
+    __slots__ = ("family", "positions", "params", "sampler")
+
+    def __init__(self, family: str, positions: list[int], steps: list):
+        self.family = family
+        self.sampler = family_sampler(steps[0])
+        self.positions = np.asarray(positions, dtype=np.intp)
+        self.params = {key: _stack([getattr(step, key) for step in steps]) for key in steps[0].param_names}
+
+
+def _stack(values: list) -> np.ndarray:
+    """
+    Parameter values of a family's steps as one array.
+
+    Scalars become a vector. Tuples, such as empirical tables, become a matrix
+    with one row per step, padded with NaN to the longest tuple.
+
+    Args:
+        values (list): Parameter value of each step.
+
+    Returns:
+        np.ndarray: Stacked values.
+
+    """
+    if not isinstance(values[0], tuple):
+        return np.array(values, dtype=np.float64)
+    stacked = np.full((len(values), max(map(len, values))), np.nan)
+    for row, value in zip(stacked, values):
+        row[: len(value)] = value
+    return stacked
+
+
+class CompiledProcess:
+    """
+    Frozen, array-backed snapshot of a Process.
+
+    Steps are grouped by distribution family into struct-of-arrays parameter
+    vectors, so a simulation makes one vectorized draw per family instead of
+    one Python call per step. Steps without a batched sampler are drawn one
+    by one, correlated steps with a Gaussian copula per group.
+
+    Later changes to the Process are not reflected, compile it again instead.
+
+    Attributes:
+        names (tuple): Step names in process order.
+        index (dict): Step name to position.
+        steps (tuple): Step objects in process order.
+        blocks (list[FamilyBlock]): Batched families.
+        singles (list[int]): Positions of steps drawn one by one.
+        groups (list[tuple]): Positions and mixing matrix per group of correlated steps.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        correlations (dict or None): (name, name) to correlation. By default independent steps
+
+    Raises:
+        TypeError: If a correlated step has no inverse CDF.
+
+    """
+
+    def __init__(self, steps: list, correlations: dict = None):
+        self.steps = tuple(steps)
+        self.names = tuple(step.name for step in self.steps)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.groups = checked_groups(self.steps, correlations)
+        correlated = {i for group, _ in self.groups for i in group}
+
+        grouped = {}
+        self.singles = []
+        for i, step in enumerate(self.steps):
+            if i in correlated:
+                continue
+            if family_sampler(step) is not None:
+                grouped.setdefault(step.family, []).append(i)
+            else:
+                self.singles.append(i)
+
+        self.blocks = [
+            FamilyBlock(family, positions, [self.steps[i] for i in positions])
+            for family, positions in grouped.items()
+        ]
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def get_step(self, name: str):
+        """
+        Returns a step by name in O(1).
+
+        Args:
+            name (str): Step name.
+
+        Returns:
+            ProcessStep: The step.
+
+        """
+        return self.steps[self.index[name]]
+
+    def draw(
+        self, n_simulations: int, seed=None, bit_generator: str = "PCG64"
+    ) -> np.ndarray:
+        """
+        Draws samples of every step.
+
+        Each family, and each step drawn one by one or in a correlated group,
+        uses its own stream derived from the seed and the family or step name.
+
+        Args:
+            n_simulations (int): Number of samples per step.
+            seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+            bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            np.ndarray: Samples with shape (n_steps, n_simulations), rows in process order.
+
+        """
+        return self._draw_into(
+            np.empty((len(self.steps), n_simulations)), seed, bit_generator
+        )
+
+    def _draw_into(self, samples, seed, bit_generator):
+        n_simulations = samples.shape[1]
+        root = seed_sequence(seed)
+
+        for block in self.blocks:
+            seq = child_sequence(root, _FAMILY_STREAM, name_key(block.family))
+            rng = make_generator(seq, bit_generator)
+            samples[block.positions] = block.sampler(rng, block.params, n_simulations)
+
+        for i in self.singles:
+            step = self.steps[i]
+            seq = child_sequence(root, _STEP_STREAM, name_key(step.name))
+            rng = make_generator(seq, bit_generator)
+            samples[i] = step.simulate(n_simulations=n_simulations, rng=rng)
+
+        for group, factor in self.groups:
+            normals = np.empty((len(group), n_simulations))
+            for row, i in zip(normals, group):
+                seq = child_sequence(root, _STEP_STREAM, name_key(self.steps[i].name))
+                row[:] = make_generator(seq, bit_generator).standard_normal(n_simulations)
+            samples[group] = correlated_samples([self.steps[i] for i in group], factor, normals)
+
+        return samples
+
+    def simulate(
+        self, n_simulations: int = 1000, seed=None, bit_generator: str = "PCG64"
+    ) -> "pd.DataFrame":
+        """
+        Simulates every step and the total time.
+
+        Args:
+            n_simulations (int): Number of samples to draw. By default 1000
+            seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+            bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            pd.DataFrame: Samples per step and "Total".
+
+        """
+        import pandas as pd
+
+        # One block for steps and total, handed to pandas without copying
+        results = np.empty((len(self.steps) + 1, n_simulations))
+        self._draw_into(results[:-1], seed, bit_generator)
+        results[:-1].sum(axis=0, out=results[-1])
+        return pd.DataFrame(results.T, columns=[*self.names, "Total"], copy=False)
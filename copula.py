@@ -0,0 +1,328 @@
+import numpy as np
+import instrumentation
+from process_steps import require_inverse_cdf
+from rng import child_sequence, make_generator, name_key, seed_sequence, step_generators
+from sampling import uniforms
+from special import norm_cdf, norm_ppf
+
+# Keeps uniforms strictly inside (0, 1), so inverse CDFs stay finite
+_EPS = 2.0**-53
+
+# Samples of a correlated group transformed at a time
+_CHUNK_ELEMENTS = 2**20
+
+# Smallest eigenvalue accepted for a correlation matrix that is only semi-definite
+_PSD_TOLERANCE = 1e-10
+
+
+def correlation_key(a: str, b: str) -> tuple:
+    """Order-independent key of a pair of step names."""
+    return (a, b) if a <= b else (b, a)
+
+
+def correlation_matrix(names: list[str], correlations: dict) -> np.ndarray:
+    """
+    Builds the full correlation matrix of steps from pairwise correlations.
+
+    Args:
+        names (list[str]): Step names, the order of rows and columns.
+        correlations (dict): (name, name) to correlation. Missing pairs are uncorrelated.
+
+    Returns:
+        np.ndarray: Symmetric matrix with ones on the diagonal.
+
+    """
+    index = {name: i for i, name in enumerate(names)}
+    matrix = np.eye(len(names))
+    for (a, b), rho in correlations.items():
+        matrix[index[a], index[b]] = matrix[index[b], index[a]] = rho
+    return matrix
+
+
+def mixing_matrix(matrix: np.ndarray) -> np.ndarray:
+    """
+    Lower-triangular factor L with L @ L.T equal to a correlation matrix.
+
+    Falls back to an eigendecomposition for matrices that are positive
+    semi-definite but singular, e.g. with correlations of exactly 1.
+
+    Args:
+        matrix (np.ndarray): Correlation matrix.
+
+    Returns:
+        np.ndarray: Factor that turns independent standard normals into correlated ones.
+
+    Raises:
+        ValueError: If the matrix is not a valid correlation matrix.
+
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(f"Correlation matrix must be square, but got shape {matrix.shape}")
+    if not np.allclose(matrix, matrix.T):
+        raise ValueError("Correlation matrix must be symmetric")
+    if not np.allclose(np.diag(matrix), 1):
+        raise ValueError("Correlation matrix must have ones on the diagonal")
+    if np.any(np.abs(matrix) > 1):
+        raise ValueError("Correlations must be between -1 and 1")
+
+    try:
+        return np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+        if eigenvalues.min() < -_PSD_TOLERANCE:
+            raise ValueError("Correlation matrix must be positive semi-definite") from None
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))
+
+
+def correlated_groups(names: list[str], correlations: dict) -> list[list[int]]:
+    """
+    Splits steps into groups that are correlated with each other.
+
+    Steps without correlations are left out, so the mixing cost only depends on
+    the size of the correlated groups, not on the number of steps.
+
+    Args:
+        names (list[str]): Step names.
+        correlations (dict): (name, name) to correlation.
+
+    Returns:
+        list[list[int]]: Indices into ``names`` per group of two or more steps.
+
+    """
+    index = {name: i for i, name in enumerate(names)}
+    parent = list(range(len(names)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for (a, b), rho in correlations.items():
+        if rho != 0:
+            parent[find(index[a])] = find(index[b])
+
+    groups = {}
+    for i in range(len(names)):
+        groups.setdefault(find(i), []).append(i)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def group_factors(names: list[str], correlations: dict) -> list[tuple]:
+    """
+    Correlated groups of steps with the mixing matrix of each.
+
+    Args:
+        names (list[str]): Step names.
+        correlations (dict): (name, name) to correlation.
+
+    Returns:
+        list[tuple]: (indices into ``names``, mixing matrix) per group.
+
+    """
+    factors = []
+    for group in correlated_groups(names, correlations):
+        group_names = [names[i] for i in group]
+        group_correlations = {
+            pair: rho for pair, rho in correlations.items() if pair[0] in group_names
+        }
+        factors.append((group, mixing_matrix(correlation_matrix(group_names, group_correlations))))
+    return factors
+
+
+def correlated_samples(steps, factor: np.ndarray, normals: np.ndarray) -> np.ndarray:
+    """
+    Turns independent standard normals of a group into correlated samples of its steps.
+
+    Args:
+        steps (list[ProcessStep]): Steps of the group.
+        factor (np.ndarray): Mixing matrix of the group, see ``mixing_matrix``.
+        normals (np.ndarray): Independent standard normals, one row per step.
+
+    Returns:
+        np.ndarray: Samples, one row per step.
+
+    """
+    samples = factor @ normals
+    for step, row in zip(steps, samples):
+        if step.family == "normal":
+            row *= step.stdev
+            row += step.mean
+        else:
+            row[:] = step.ppf(np.clip(norm_cdf(row), _EPS, 1 - _EPS))
+    return samples
+
+
+def checked_groups(steps, correlations: dict) -> list[tuple]:
+    """
+    Correlated groups of steps with their mixing matrices, see ``group_factors``.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        correlations (dict or None): (name, name) to correlation.
+
+    Returns:
+        list[tuple]: (indices into ``steps``, mixing matrix) per group, empty without correlations.
+
+    Raises:
+        TypeError: If a correlated step has no inverse CDF.
+
+    """
+    groups = group_factors([step.name for step in steps], correlations or {})
+    require_inverse_cdf([steps[i] for group, _ in groups for i in sorted(group)], "Correlation")
+    return groups
+
+
+def draw_correlated(steps, groups: list, generators: dict, n_simulations: int) -> list:
+    """
+    Draws the next samples of every step from its own stream.
+
+    Steps outside the groups are drawn with ``simulate``, every group from the
+    standard normals of its steps' streams. Streams carry over between calls, so
+    drawing in chunks gives the samples of ``simulate_correlated`` for any chunk size.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        groups (list[tuple]): Correlated groups, see ``checked_groups``.
+        generators (dict): Step name to numpy Generator, see ``step_generators``.
+        n_simulations (int): Number of samples.
+
+    Returns:
+        list[np.ndarray]: Samples per step, in process order.
+
+    """
+    grouped = {i for group, _ in groups for i in group}
+    columns = [None] * len(steps)
+    for i, step in enumerate(steps):
+        if i not in grouped:
+            with instrumentation.stage(f"draw:{step.name}", samples=n_simulations):
+                columns[i] = step.simulate(n_simulations=n_simulations, rng=generators[step.name])
+
+    for group, factor in groups:
+        with instrumentation.stage(_group_stage(steps, group), samples=n_simulations):
+            normals = np.empty((len(group), n_simulations))
+            for row, i in zip(normals, group):
+                row[:] = generators[steps[i].name].standard_normal(n_simulations)
+            samples = correlated_samples([steps[i] for i in group], factor, normals)
+        for i, row in zip(group, samples):
+            columns[i] = row
+    return columns
+
+
+def _group_stage(steps, group):
+    # Correlated steps are drawn together, so they share one instrumentation stage
+    return "draw:" + "+".join(steps[i].name for i in group)
+
+
+def correlated_uniforms(factor: np.ndarray, u: np.ndarray) -> np.ndarray:
+    """
+    Turns independent uniforms of a group into correlated uniforms.
+
+    Args:
+        factor (np.ndarray): Mixing matrix of the group, see ``mixing_matrix``.
+        u (np.ndarray): Independent uniforms in (0, 1), one row per step.
+
+    Returns:
+        np.ndarray: Uniforms with the group's correlation under a Gaussian copula.
+
+    """
+    return np.clip(norm_cdf(factor @ norm_ppf(u)), _EPS, 1 - _EPS)
+
+
+def simulate_correlated(
+    steps,
+    correlations: dict,
+    n_simulations: int,
+    seed=None,
+    sampling: str = "random",
+    bit_generator: str = "PCG64",
+) -> dict:
+    """
+    Simulates steps with a Gaussian copula over correlated steps.
+
+    Each group of correlated steps draws standard normals with shape
+    (group size, n), mixes them in one matrix product with the factor of its
+    correlation matrix, and maps them through the standard normal CDF and each
+    step's inverse CDF. Normal steps use the mixed normals directly. Steps
+    without correlations are drawn as in an independent run.
+
+    With ``sampling="random"`` every step draws from its own stream keyed on the
+    step name, so uncorrelated steps equal ``simulate_process`` with the same
+    seed. Other sampling methods turn their uniform design into normals first,
+    so stratification carries over to the correlated steps.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        correlations (dict): (name, name) to correlation.
+        n_simulations (int): Number of samples.
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        sampling (str): One of SAMPLING_METHODS. By default "random"
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+
+    Returns:
+        dict: Step name to samples, plus "Total".
+
+    Raises:
+        TypeError: If a step that needs an inverse CDF has none.
+
+    """
+    steps = steps or []
+    names = [step.name for step in steps]
+    groups = group_factors(names, correlations)
+    grouped = {i for group, _ in groups for i in group}
+    if sampling == "random":
+        require_inverse_cdf([steps[i] for i in sorted(grouped)], "Correlation")
+    else:
+        require_inverse_cdf(steps, f"Sampling method {sampling}")
+
+    if sampling == "random":
+        generators = step_generators(names, seed, bit_generator)
+        design = None
+    else:
+        rng = make_generator(child_sequence(seed_sequence(seed), name_key(sampling)), bit_generator)
+        with instrumentation.stage(f"design:{sampling}", samples=n_simulations):
+            design = uniforms(sampling, len(steps), n_simulations, rng)
+
+    columns = [None] * len(steps)
+    for i, step in enumerate(steps):
+        if i in grouped:
+            continue
+        with instrumentation.stage(f"draw:{step.name}", samples=n_simulations):
+            if design is None:
+                columns[i] = step.simulate(n_simulations=n_simulations, rng=generators[step.name])
+            else:
+                columns[i] = step.ppf(design[i])
+
+    for group, factor in groups:
+        group_names = [names[i] for i in group]
+        group_steps = [steps[i] for i in group]
+        for i in group:
+            columns[i] = np.empty(n_simulations)
+
+        # Chunks of samples keep the temporaries of the CDF transforms small. Every
+        # step draws its normals in order from its own stream, so chunking does not
+        # change the samples.
+        chunk_size = max(_CHUNK_ELEMENTS // len(group), 1)
+        with instrumentation.stage(_group_stage(steps, group), samples=n_simulations):
+            for start in range(0, n_simulations, chunk_size):
+                stop = min(start + chunk_size, n_simulations)
+                if design is None:
+                    normals = np.empty((len(group), stop - start))
+                    for row, name in zip(normals, group_names):
+                        row[:] = generators[name].standard_normal(stop - start)
+                else:
+                    normals = norm_ppf(design[group, start:stop])
+
+                for i, row in zip(group, correlated_samples(group_steps, factor, normals)):
+                    columns[i][start:stop] = row
+
+    results = {}
+    total_time = np.zeros(n_simulations)
+    for name, column in zip(names, columns):
+        results[name] = column
+        with instrumentation.stage("accumulate", samples=n_simulations):
+            total_time += column
+
+    results["Total"] = total_time
+    return results
@@ -0,0 +1,388 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+import instrumentation
+from process_steps import ProcessStep
+from streaming import QuantileSketch
+
+# Tables larger than this are memory-mapped from the cache instead of read into memory
+MMAP_BYTES = 64 * 2**20
+
+# Rows read per chunk of a duration log
+CHUNK_ROWS = 1_000_000
+
+# Loaded tables kept per interpreter, keyed on the file and its modification time
+_MAX_LOADED = 32
+_loaded = OrderedDict()
+_lock = threading.Lock()
+
+
+def cache_dir() -> str:
+    """
+    Directory of the duration table cache.
+
+    Set MC_SIMULATOR_DURATION_CACHE to share it between servers or keep it across reboots.
+
+    Returns:
+        str: Directory path, created if missing.
+
+    """
+    path = os.environ.get("MC_SIMULATOR_DURATION_CACHE") or os.path.join(
+        tempfile.gettempdir(), "mc_simulator_durations"
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_digest(path: str, block_size: int = 2**20) -> str:
+    """
+    Hash of a file's contents, read in blocks.
+
+    Args:
+        path (str): File path.
+        block_size (int): Bytes read at a time. By default 1 MiB
+
+    Returns:
+        str: Hex digest.
+
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        while block := file.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_upload(data: bytes, suffix: str) -> str:
+    """
+    Stores an uploaded duration log in the cache under its content hash.
+
+    The same upload always gets the same path, so steps built from it hash the
+    same across sessions.
+
+    Args:
+        data (bytes): File contents.
+        suffix (str): File extension, ".csv" or ".parquet".
+
+    Returns:
+        str: Path of the stored file.
+
+    """
+    name = hashlib.blake2b(data, digest_size=16).hexdigest() + suffix
+    path = os.path.join(cache_dir(), name)
+    if not os.path.exists(path):
+        _atomic_write(path, data)
+    return path
+
+
+class DurationTable:
+    """
+    Sorted float32 durations of a log, or a table of its quantiles.
+
+    The table is read as an inverse CDF on an even probability grid: entry
+    ``i`` of ``m`` is the quantile at ``i / (m - 1)``. Lookups are index
+    arithmetic plus linear interpolation between neighbouring entries, so
+    sampling is vectorized and does not search the table.
+
+    Attributes:
+        values (np.ndarray): Sorted float32 table, a read-only memmap when large.
+        count (int): Number of observations in the log.
+        digest (str): Content hash of the log.
+
+    """
+
+    def __init__(self, values: np.ndarray, count: int, digest: str):
+        self.values = values
+        self.count = count
+        self.digest = digest
+
+    def __len__(self) -> int:
+        return self.values.size
+
+    @property
+    def is_mapped(self) -> bool:
+        """Whether the table is memory-mapped instead of held in memory."""
+        return isinstance(self.values, np.memmap)
+
+    def ppf(self, u) -> np.ndarray:
+        """
+        Maps uniforms to durations (inverse CDF).
+
+        Args:
+            u (np.ndarray): Uniforms in [0, 1].
+
+        Returns:
+            np.ndarray: Interpolated durations as float64.
+
+        """
+        values = self.values
+        if values.size == 1:
+            return np.full(np.shape(u), float(values[0]))
+
+        position = np.asarray(u, dtype=np.float64) * (values.size - 1)
+        lower = position.astype(np.intp)
+        np.clip(lower, 0, values.size - 2, out=lower)
+        position -= lower
+
+        samples = values[lower].astype(np.float64)
+        upper = values[lower + 1].astype(np.float64)
+        upper -= samples
+        upper *= position
+        samples += upper
+        return samples
+
+    def sample(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws durations.
+
+        Args:
+            n_simulations (int): Number of samples.
+            rng (None, int or np.random.Generator): Random number generator or seed.
+
+        Returns:
+            np.ndarray: Samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        return self.ppf(rng.random(n_simulations))
+
+
+def load_durations(
+    path: str, column: str = None, max_points: int = None, directory: str = None
+) -> DurationTable:
+    """
+    Loads the durations of a CSV or Parquet log as a sorted table.
+
+    The log is read once in chunks of CHUNK_ROWS rows. Values that are not
+    finite numbers are skipped. Without ``max_points`` every observation is
+    kept, written to disk as float32 and sorted there; with it, a quantile
+    sketch of the stream gives a table of ``max_points`` quantiles, so memory
+    stays bounded for any log size.
+
+    Tables are cached on disk under the content hash of the log, and per
+    interpreter under the path and modification time, so loading the same
+    log again neither parses nor hashes it.
+
+    Args:
+        path (str): CSV or Parquet file.
+        column (str or None): Column of durations. By default the first column
+        max_points (int or None): Size of a quantile table. By default all observations
+        directory (str or None): Cache directory. By default ``cache_dir()``
+
+    Returns:
+        DurationTable: Sorted durations.
+
+    Raises:
+        ValueError: If the format is unknown, or the column holds no durations.
+        KeyError: If the column does not exist.
+
+    """
+    assert max_points is None or (
+        isinstance(max_points, int) and max_points >= 2
+    ), f"Table size must be an integer of at least 2, but got {max_points}"
+
+    stat = os.stat(path)
+    memo_key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size, column, max_points)
+    with _lock:
+        if memo_key in _loaded:
+            _loaded.move_to_end(memo_key)
+            return _loaded[memo_key]
+
+    directory = directory or cache_dir()
+    digest = file_digest(path)
+    key = hashlib.blake2b(
+        json.dumps([digest, column, max_points]).encode(), digest_size=16
+    ).hexdigest()
+    table_path = os.path.join(directory, f"{key}.f32")
+    meta_path = os.path.join(directory, f"{key}.json")
+
+    if not (os.path.exists(table_path) and os.path.exists(meta_path)):
+        with instrumentation.stage("load_durations"):
+            count = _build_table(path, column, max_points, table_path)
+        _atomic_write(meta_path, json.dumps({"count": count, "digest": digest}).encode())
+
+    with open(meta_path) as file:
+        count = json.load(file)["count"]
+
+    if os.path.getsize(table_path) > MMAP_BYTES:
+        values = np.memmap(table_path, dtype=np.float32, mode="r")
+    else:
+        values = np.fromfile(table_path, dtype=np.float32)
+
+    table = DurationTable(values, count, digest)
+    with _lock:
+        _loaded[memo_key] = table
+        while len(_loaded) > _MAX_LOADED:
+            _loaded.popitem(last=False)
+    return table
+
+
+def read_chunks(path: str, column: str = None, chunk_rows: int = None):
+    """
+    Reads one column of a CSV or Parquet log in chunks.
+
+    Args:
+        path (str): CSV or Parquet file.
+        column (str or None): Column to read. By default the first column
+        chunk_rows (int or None): Rows per chunk. By default CHUNK_ROWS
+
+    Yields:
+        np.ndarray: Finite float64 values of a chunk.
+
+    """
+    import pandas as pd
+
+    chunk_rows = chunk_rows or CHUNK_ROWS
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        usecols = [column] if column is not None else [0]
+        try:
+            reader = pd.read_csv(path, usecols=usecols, chunksize=chunk_rows)
+        except ValueError as e:
+            raise KeyError(f"No column {column} in {path}") from e
+        with reader:
+            for chunk in reader:
+                yield _finite(pd.to_numeric(chunk.iloc[:, 0], errors="coerce").to_numpy(np.float64))
+
+    elif extension in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Reading Parquet logs requires the pyarrow package") from e
+
+        parquet = pq.ParquetFile(path)
+        names = parquet.schema_arrow.names
+        if column is None:
+            column = names[0]
+        if column not in names:
+            raise KeyError(f"No column {column} in {path}")
+        for batch in parquet.iter_batches(batch_size=chunk_rows, columns=[column]):
+            values = batch.column(0).to_numpy(zero_copy_only=False)
+            yield _finite(pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(np.float64))
+
+    else:
+        raise ValueError(f"Unknown duration log format {extension}, expected .csv or .parquet")
+
+
+def _finite(values):
+    return values[np.isfinite(values)]
+
+
+def _build_table(path, column, max_points, table_path):
+    # Writes the sorted table of a log to table_path and returns its number of observations
+    count = 0
+    partial = f"{table_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    try:
+        if max_points is None:
+            with open(partial, "wb") as file:
+                for values in read_chunks(path, column):
+                    file.write(values.astype(np.float32).tobytes())
+                    count += values.size
+            if count:
+                # Sorted in place on the mapped file, so the log is never held twice
+                values = np.memmap(partial, dtype=np.float32, mode="r+")
+                values.sort()
+                values.flush()
+                del values
+        else:
+            sketch = QuantileSketch()
+            for values in read_chunks(path, column):
+                sketch.update(values)
+                count += values.size
+            if count:
+                table = sketch.quantile(np.linspace(0, 1, max_points)).astype(np.float32)
+                table.tofile(partial)
+
+        if not count:
+            raise ValueError(f"No durations found in {path}")
+        os.replace(partial, table_path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return count
+
+
+def _atomic_write(path, data):
+    partial = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(partial, "wb") as file:
+        file.write(data)
+    os.replace(partial, path)
+
+
+class DurationLogStep(ProcessStep):
+    """
+    Represents a process step that resamples measured durations from a log file.
+
+    Use it for logs with up to hundreds of millions of rows; ``EmpiricalStep``
+    is simpler for a handful of values typed in by hand. Samples interpolate
+    linearly between sorted observations (or quantiles), so they stay within
+    the observed range.
+
+    Attributes:
+        path (str): CSV or Parquet log.
+        column (str or None): Column of durations, None for the first column.
+        max_points (int or None): Size of a quantile table, None to keep every observation.
+        digest (str): Content hash of the log, so results are cached by content.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        path (str): CSV or Parquet log.
+        column (str or None): Column of durations. By default the first column
+        max_points (int or None): Size of a quantile table. By default all observations
+        digest (str or None): Expected content hash, e.g. of a saved process. By default
+            the hash of the current file
+
+    """
+
+    __slots__ = ("path", "column", "max_points", "digest")
+    param_names = __slots__
+    family = "duration_log"
+
+    def __init__(self, name: str, path: str, column: str = None, max_points: int = None, digest: str = None):
+        super().__init__(name)
+        assert isinstance(path, str), f"Path must be a string, but got {type(path)}"
+        assert os.path.exists(path), f"No duration log at {path}"
+        assert column is None or isinstance(
+            column, str
+        ), f"Column must be a string, but got {type(column)}"
+
+        table = load_durations(path, column, max_points)
+        assert digest is None or digest == table.digest, f"{path} has changed since the step was defined"
+
+        self.path = path
+        self.column = column
+        self.max_points = max_points
+        self.digest = table.digest
+
+    @property
+    def table(self) -> DurationTable:
+        """Sorted durations of the log, loaded from the cache."""
+        return load_durations(self.path, self.column, self.max_points)
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from the logged durations.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        return self.table.sample(n_simulations, rng)
+
+    @staticmethod
+    def inverse_cdf(u, path, column=None, max_points=None, digest=None):
+        return load_durations(path, column, max_points).ppf(u)
@@ -0,0 +1,111 @@
+import io
+import numpy as np
+import instrumentation
+
+# Format name to (file name, MIME type)
+EXPORT_FORMATS = {
+    "csv": ("simulation_results.csv", "text/csv"),
+    "parquet": ("simulation_results.parquet", "application/vnd.apache.parquet"),
+    "npz": ("simulation_results.npz", "application/octet-stream"),
+}
+
+
+def available_formats() -> list[str]:
+    """
+    Returns export formats usable in this environment.
+
+    Parquet needs the optional pyarrow package.
+
+    Returns:
+        list[str]: Format names.
+
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet"]
+    return list(EXPORT_FORMATS)
+
+
+def write_csv(result, file, chunk_size: int = 100_000) -> None:
+    """
+    Writes a result as CSV, converting at most ``chunk_size`` rows at a time.
+
+    Args:
+        result (SimulationResult): Simulation result.
+        file (file-like): Binary or text file to write to.
+        chunk_size (int): Rows per chunk. By default 100 000
+
+    """
+    import pandas as pd
+
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="") if _is_binary(file) else file
+    columns = result.columns
+
+    pd.DataFrame(columns=columns).to_csv(text, index=False)
+    for start in range(0, result.n_simulations, chunk_size):
+        chunk = {name: result[name][start : start + chunk_size] for name in columns}
+        pd.DataFrame(chunk).to_csv(text, index=False, header=False)
+
+    if text is not file:
+        text.flush()
+        text.detach()
+
+
+def write_parquet(result, file) -> None:
+    """
+    Writes a result as a zstd-compressed Parquet file.
+
+    Args:
+        result (SimulationResult): Simulation result.
+        file (str or file-like): Path or binary file to write to.
+
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires the pyarrow package") from e
+
+    table = pa.table({name: result[name] for name in result.columns})
+    pq.write_table(table, file, compression="zstd")
+
+
+def write_npz(result, file) -> None:
+    """
+    Writes a result as a compressed NumPy ``.npz`` archive, one array per column.
+
+    Args:
+        result (SimulationResult): Simulation result.
+        file (str or file-like): Path or binary file to write to.
+
+    """
+    np.savez_compressed(file, **{name: result[name] for name in result.columns})
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "npz": write_npz}
+
+
+def export_result(result, fmt: str = "csv") -> bytes:
+    """
+    Serializes a result in the given format.
+
+    Args:
+        result (SimulationResult): Simulation result.
+        fmt (str): One of EXPORT_FORMATS. By default "csv"
+
+    Returns:
+        bytes: File contents.
+
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt}, expected one of {list(WRITERS)}")
+
+    buffer = io.BytesIO()
+    with instrumentation.stage(f"export:{fmt}", samples=result.n_simulations):
+        WRITERS[fmt](result, buffer)
+    return buffer.getvalue()
+
+
+def _is_binary(file):
+    return not isinstance(file, io.TextIOBase)
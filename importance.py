@@ -0,0 +1,229 @@
+import numpy as np
+from rng import step_generators
+from special import norm_ppf
+
+def _normal_tilt(step, theta):
+    cgf = step.mean * theta + 0.5 * (step.stdev * theta) ** 2
+    mean = step.mean + step.stdev**2 * theta
+    return cgf, mean
+
+
+def _normal_draw(step, theta, n, rng):
+    return rng.normal(step.mean + step.stdev**2 * theta, step.stdev, size=n)
+
+
+def _exponential_tilt(step, theta):
+    if theta >= step.rate:
+        return np.inf, np.inf
+    return -np.log1p(-theta / step.rate), 1 / (step.rate - theta)
+
+
+def _exponential_draw(step, theta, n, rng):
+    return rng.exponential(1 / (step.rate - theta), size=n)
+
+
+def _uniform_tilt(step, theta):
+    width = step.high - step.low
+    if theta * width < 1e-8:
+        return theta * (step.low + step.high) / 2, (step.low + step.high) / 2
+    # Written with exp(-theta * width) so large tilts do not overflow
+    cgf = theta * step.high + np.log(-np.expm1(-theta * width) / (theta * width))
+    mean = step.low + width / -np.expm1(-theta * width) - 1 / theta
+    return cgf, mean
+
+
+def _uniform_draw(step, theta, n, rng):
+    width = step.high - step.low
+    u = rng.random(n)
+    if theta * width < 1e-8:
+        return step.low + width * u
+    # Inverse CDF of the density proportional to exp(theta * x) on [low, high]
+    return step.high + np.log(u + (1 - u) * np.exp(-theta * width)) / theta
+
+
+# Per family: (cumulant generating function and tilted mean at theta, tilted sampler)
+TILTS = {
+    "normal": (_normal_tilt, _normal_draw),
+    "exponential": (_exponential_tilt, _exponential_draw),
+    "uniform": (_uniform_tilt, _uniform_draw),
+}
+
+# Per family: largest value a step can take
+LARGEST = {
+    "normal": lambda step: step.mean if step.stdev == 0 else np.inf,
+    "exponential": lambda step: np.inf,
+    "uniform": lambda step: step.high,
+}
+
+# Doublings of the tilt before the search gives up on reaching the threshold
+_MAX_DOUBLINGS = 64
+_MAX_BISECTIONS = 200
+
+
+class TailEstimate:
+    """
+    Importance sampling estimate of P(Total > threshold).
+
+    Attributes:
+        threshold (float): Threshold of the total time, e.g. an SLA.
+        probability (float): Estimated exceedance probability.
+        std_error (float): Standard error of the estimate.
+        interval (tuple): Confidence interval of the probability.
+        confidence (float): Confidence level of the interval.
+        theta (float): Exponential tilt of the proposal, 0 for plain Monte Carlo.
+        n_simulations (int): Samples drawn.
+        effective_sample_size (float): Kish effective sample size of the weights.
+
+    """
+
+    def __init__(
+        self, threshold, probability, std_error, confidence, theta, n_simulations, effective_sample_size
+    ):
+        z = float(norm_ppf((1 + confidence) / 2))
+        self.threshold = float(threshold)
+        self.probability = float(probability)
+        self.std_error = float(std_error)
+        self.interval = (max(self.probability - z * self.std_error, 0.0), self.probability + z * self.std_error)
+        self.confidence = confidence
+        self.theta = float(theta)
+        self.n_simulations = n_simulations
+        self.effective_sample_size = float(effective_sample_size)
+
+    @property
+    def relative_error(self) -> float:
+        """Standard error divided by the probability."""
+        return self.std_error / self.probability if self.probability > 0 else np.inf
+
+    @property
+    def plain_equivalent(self) -> float:
+        """Samples plain Monte Carlo would need for the same standard error."""
+        if self.std_error == 0:
+            return np.inf
+        return self.probability * (1 - self.probability) / self.std_error**2
+
+
+def solve_tilt(steps, threshold: float, untilted_mean: float = 0.0) -> float:
+    """
+    Finds the tilt theta >= 0 that moves the mean of the total to the threshold.
+
+    Args:
+        steps (list[ProcessStep]): Steps with a family in TILTS.
+        threshold (float): Target mean of the total under the proposal.
+        untilted_mean (float): Mean of steps that are not tilted. By default 0.0
+
+    Returns:
+        float: Tilt, 0 if the threshold is not above the mean. If the tilted steps
+            cannot reach the threshold, the largest tilt of a bounded search.
+
+    """
+    def tilted_mean(theta):
+        return untilted_mean + sum(TILTS[step.family][0](step, theta)[1] for step in steps)
+
+    if not steps or tilted_mean(0.0) >= threshold:
+        return 0.0
+
+    # The tilted mean grows with theta; exponential steps bound theta by their rate
+    rates = [step.rate for step in steps if step.family == "exponential"]
+    upper = min(rates) if rates else 1.0
+    if not rates:
+        for _ in range(_MAX_DOUBLINGS):
+            if tilted_mean(upper) >= threshold:
+                break
+            upper *= 2
+        else:
+            return upper
+
+    lower = 0.0
+    for _ in range(_MAX_BISECTIONS):
+        middle = (lower + upper) / 2
+        if tilted_mean(middle) < threshold:
+            lower = middle
+        else:
+            upper = middle
+    return lower
+
+
+def estimate_tail(
+    steps,
+    threshold: float,
+    n_simulations: int = 100_000,
+    confidence: float = 0.95,
+    theta: float = None,
+    seed=None,
+    bit_generator: str = "PCG64",
+) -> TailEstimate:
+    """
+    Estimates P(Total > threshold) by importance sampling with exponential tilting.
+
+    Normal, exponential and uniform steps are drawn from their exponentially
+    tilted distributions, which shifts the total towards the threshold, and every
+    sample is weighted by its likelihood ratio exp(sum K_i(theta) - theta * sum x_i).
+    The tilt is chosen so that the mean of the total under the proposal equals the
+    threshold. Other steps can only be drawn from their own distribution with
+    weight 1. Their tail is then never explored, so an estimate with a tilt would
+    miss it, and their processes need an explicit ``theta``, e.g. 0 for plain Monte Carlo.
+
+    For probabilities around 1e-5 this needs a few thousand samples where plain
+    Monte Carlo needs tens of millions for the same relative error.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        threshold (float): Threshold of the total time.
+        n_simulations (int): Samples to draw. By default 100 000
+        confidence (float): Confidence level of the interval. By default 0.95
+        theta (float or None): Tilt to use instead of the solved one, 0 gives plain Monte Carlo.
+            Required if a step has no family in TILTS.
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+
+    Returns:
+        TailEstimate: Probability with standard error and confidence interval. The
+            probability is exactly 0 if the threshold is at or above the largest
+            possible total.
+
+    Raises:
+        ValueError: If no ``theta`` is given and a step cannot be tilted.
+
+    """
+    assert theta is None or theta >= 0, f"Tilt must be non-negative, but got {theta}"
+
+    steps = steps or []
+    tilted = [step for step in steps if step.family in TILTS]
+    others = [step for step in steps if step.family not in TILTS]
+
+    if theta is None and others:
+        raise ValueError(
+            f"Steps {[step.name for step in others]} cannot be tilted, "
+            f"pass theta=0 for a plain Monte Carlo estimate"
+        )
+    if not others and threshold >= sum(LARGEST[step.family](step) for step in tilted):
+        return TailEstimate(threshold, 0.0, 0.0, confidence, 0.0, n_simulations, 0.0)
+    generators = step_generators([step.name for step in steps], seed, bit_generator)
+
+    if theta is None:
+        theta = solve_tilt(tilted, threshold)
+
+    cgf = 0.0
+    tilted_sum = np.zeros(n_simulations)
+    for step in tilted:
+        tilt, draw = TILTS[step.family]
+        cgf += tilt(step, theta)[0]
+        tilted_sum += draw(step, theta, n_simulations, generators[step.name])
+
+    total = tilted_sum.copy()
+    for step in others:
+        total += step.simulate(n_simulations=n_simulations, rng=generators[step.name])
+
+    weights = np.exp(cgf - theta * tilted_sum)
+    contributions = np.where(total > threshold, weights, 0.0)
+
+    probability = contributions.mean()
+    std_error = contributions.std(ddof=1) / np.sqrt(n_simulations)
+    exceeding = weights[total > threshold]
+    effective_sample_size = (
+        exceeding.sum() ** 2 / np.sum(exceeding**2) if exceeding.size else 0.0
+    )
+
+    return TailEstimate(
+        threshold, probability, std_error, confidence, theta, n_simulations, effective_sample_size
+    )
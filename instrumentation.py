@@ -0,0 +1,269 @@
+import contextlib
+import json
+import threading
+import time
+import tracemalloc
+
+# Shared no-op stage returned while instrumentation is off
+_NULL_STAGE = contextlib.nullcontext()
+
+_recorder = None
+_started_tracing = threading.Event()
+
+
+class StageMetrics:
+    """
+    Aggregated measurements of one named stage.
+
+    Attributes:
+        name (str): Stage name, e.g. "dataframe" or "draw:review".
+        calls (int): Number of times the stage ran.
+        seconds (float): Total wall time.
+        min_seconds (float): Fastest call.
+        max_seconds (float): Slowest call.
+        samples (int): Samples handled over all calls.
+        allocated_bytes (int): Net growth of traced memory over all calls.
+        peak_bytes (int): Largest traced memory above the start of a call.
+
+    """
+
+    __slots__ = (
+        "name", "calls", "seconds", "min_seconds", "max_seconds",
+        "samples", "allocated_bytes", "peak_bytes",
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.min_seconds = float("inf")
+        self.max_seconds = 0.0
+        self.samples = 0
+        self.allocated_bytes = 0
+        self.peak_bytes = 0
+
+    @property
+    def samples_per_sec(self) -> float:
+        """Samples handled per second of stage time, None without samples."""
+        if not self.samples or not self.seconds:
+            return None
+        return self.samples / self.seconds
+
+    def to_dict(self) -> dict:
+        """Returns the metrics as plain values."""
+        result = {key: getattr(self, key) for key in self.__slots__}
+        result["samples_per_sec"] = self.samples_per_sec
+        return result
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "samples", "tags", "start", "memory")
+
+    def __init__(self, recorder, name, samples, tags):
+        self.recorder = recorder
+        self.name = name
+        self.samples = samples
+        self.tags = tags
+
+    def __enter__(self):
+        if self.recorder.trace_allocations:
+            self.memory = self.recorder._enter_memory()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        allocated = peak = None
+        if self.recorder.trace_allocations:
+            allocated, peak = self.recorder._exit_memory(self.memory)
+        self.recorder._record(self.name, seconds, self.samples, allocated, peak, self.tags)
+        return False
+
+
+class Recorder:
+    """
+    Collects per-stage timings, allocations and sample rates.
+
+    Args:
+        trace_allocations (bool): Measure bytes allocated per stage with tracemalloc.
+            Slows down allocation heavy code noticeably. By default False
+        callbacks (list[callable]): Called with an event dict after every stage, with
+            keys stage, seconds, samples, allocated_bytes, peak_bytes and tags.
+
+    """
+
+    def __init__(self, trace_allocations: bool = False, callbacks=()):
+        self.trace_allocations = trace_allocations
+        self.callbacks = list(callbacks)
+        self.stages = {}
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stage(self, name: str, samples: int = None, **tags) -> _Stage:
+        """
+        Context manager measuring one run of a stage.
+
+        Args:
+            name (str): Stage name. Calls with the same name are aggregated.
+            samples (int or None): Samples handled, for the sample rate.
+            **tags: Extra values passed on to callbacks.
+
+        """
+        return _Stage(self, name, samples, tags)
+
+    def add_callback(self, callback) -> None:
+        """Adds a callable that receives an event dict after every stage."""
+        self.callbacks.append(callback)
+
+    def reset(self) -> None:
+        """Forgets all measurements."""
+        with self._lock:
+            self.stages = {}
+
+    def to_dict(self) -> dict:
+        """Returns stage name to metrics, in the order stages first finished."""
+        with self._lock:
+            return {name: metrics.to_dict() for name, metrics in self.stages.items()}
+
+    def to_json(self, indent: int = 2) -> str:
+        """Returns the metrics as JSON."""
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_text(self) -> str:
+        """Returns the metrics as a plain-text table."""
+        lines = [
+            f"{'stage':<32} {'calls':>6} {'total s':>10} {'mean ms':>10}"
+            f" {'samples/s':>12} {'alloc MiB':>10} {'peak MiB':>10}"
+        ]
+        for name, metrics in self.to_dict().items():
+            rate = metrics["samples_per_sec"]
+            mean_ms = 1000 * metrics["seconds"] / metrics["calls"]
+            lines.append(
+                f"{name:<32} {metrics['calls']:>6} {metrics['seconds']:>10.4f} {mean_ms:>10.3f}"
+                f" {f'{rate:.3e}' if rate else '-':>12}"
+                f" {metrics['allocated_bytes'] / 2**20:>10.2f} {metrics['peak_bytes'] / 2**20:>10.2f}"
+            )
+        return "\n".join(lines)
+
+    def _record(self, name, seconds, samples, allocated, peak, tags):
+        with self._lock:
+            metrics = self.stages.get(name)
+            if metrics is None:
+                metrics = self.stages[name] = StageMetrics(name)
+            metrics.calls += 1
+            metrics.seconds += seconds
+            metrics.min_seconds = min(metrics.min_seconds, seconds)
+            metrics.max_seconds = max(metrics.max_seconds, seconds)
+            metrics.samples += samples or 0
+            metrics.allocated_bytes += allocated or 0
+            metrics.peak_bytes = max(metrics.peak_bytes, peak or 0)
+
+        if self.callbacks:
+            event = {
+                "stage": name,
+                "seconds": seconds,
+                "samples": samples,
+                "allocated_bytes": allocated,
+                "peak_bytes": peak,
+                "tags": tags,
+            }
+            for callback in self.callbacks:
+                callback(event)
+
+    # tracemalloc keeps a single peak, so nested stages reset it and hand the
+    # highest value seen on to the enclosing stage
+    def _enter_memory(self):
+        if not tracemalloc.is_tracing():
+            return [0, 0]
+        stack = self._local.__dict__.setdefault("stack", [])
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        stack.append(frame)
+        return frame
+
+    def _exit_memory(self, frame):
+        stack = self._local.__dict__.get("stack", [])
+        if frame in stack:
+            stack.remove(frame)
+        if not tracemalloc.is_tracing():
+            return None, None
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(frame[1], peak)
+        if stack:
+            stack[-1][1] = max(stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        return current - frame[0], peak - frame[0]
+
+
+def stage(name: str, samples: int = None, **tags):
+    """
+    Measures a stage with the active recorder, does nothing while instrumentation is off.
+
+    Args:
+        name (str): Stage name.
+        samples (int or None): Samples handled, for the sample rate.
+        **tags: Extra values passed on to callbacks.
+
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NULL_STAGE
+    return recorder.stage(name, samples, **tags)
+
+
+def enable(trace_allocations: bool = False, callbacks=()) -> Recorder:
+    """
+    Turns instrumentation on for the whole interpreter.
+
+    Args:
+        trace_allocations (bool): Measure bytes allocated per stage. By default False
+        callbacks (list[callable]): Called with an event dict after every stage.
+
+    Returns:
+        Recorder: The active recorder.
+
+    """
+    global _recorder
+    disable()
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing.set()
+    _recorder = Recorder(trace_allocations=trace_allocations, callbacks=callbacks)
+    return _recorder
+
+
+def disable() -> None:
+    """Turns instrumentation off, and stops tracemalloc if ``enable`` started it."""
+    global _recorder
+    _recorder = None
+    if _started_tracing.is_set():
+        _started_tracing.clear()
+        tracemalloc.stop()
+
+
+def get_recorder() -> Recorder:
+    """Returns the active recorder, or None while instrumentation is off."""
+    return _recorder
+
+
+@contextlib.contextmanager
+def instrumented(trace_allocations: bool = False, callbacks=()):
+    """
+    Turns instrumentation on inside a ``with`` block and restores the previous state.
+
+    Yields:
+        Recorder: The recorder of the block.
+
+    """
+    global _recorder
+    previous = _recorder
+    recorder = enable(trace_allocations=trace_allocations, callbacks=callbacks)
+    try:
+        yield recorder
+    finally:
+        disable()
+        _recorder = previous
@@ -0,0 +1,292 @@
+import copy
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import instrumentation
+from copula import checked_groups, draw_correlated
+from results import SimulationResult
+from rng import step_generators
+
+JOB_STATES = ("queued", "running", "done", "cancelled", "failed")
+
+
+class Job:
+    """
+    Simulation running in the background, drawn chunk by chunk.
+
+    Every step keeps one generator across chunks, so a finished job has the same
+    samples as ``Process.simulate_process`` with the same seed, correlations
+    included. Cancellation is checked between chunks, and the chunks finished so
+    far are kept.
+
+    Attributes:
+        id (str): Unique identifier of the job.
+        steps (list[ProcessStep]): Copy of the steps taken at submission.
+        correlations (dict): (name, name) to correlation, see ``Process.set_correlation``.
+        n_simulations (int): Number of samples requested.
+        seed (None or int): Seed of the run.
+        owner (str or None): Who submitted the job, e.g. a session id.
+        status (str): One of JOB_STATES.
+        completed (int): Samples finished so far.
+        error (Exception or None): Error of a failed job.
+        started (float or None): ``time.perf_counter()`` when the job started.
+        finished (float or None): ``time.perf_counter()`` when the job stopped.
+
+    """
+
+    def __init__(
+        self,
+        steps,
+        n_simulations: int,
+        seed=None,
+        owner: str = None,
+        dtype=np.float64,
+        chunk_size: int = 2**16,
+        bit_generator: str = "PCG64",
+        correlations: dict = None,
+    ):
+        assert chunk_size > 0, f"Chunk size must be positive, but got {chunk_size}"
+
+        self.id = uuid.uuid4().hex
+        self.steps = copy.deepcopy(steps or [])
+        self.correlations = dict(correlations or {})
+        self.n_simulations = n_simulations
+        self.seed = seed
+        self.owner = owner
+        self.status = "queued"
+        self.completed = 0
+        self.error = None
+        self.started = None
+        self.finished = None
+
+        self._dtype = dtype
+        self._chunk_size = chunk_size
+        self._bit_generator = bit_generator
+        self._cancel = threading.Event()
+        self._stopped = threading.Event()
+        self._data = None
+        self._result = None
+
+    @property
+    def progress(self) -> float:
+        """Finished fraction between 0 and 1."""
+        return self.completed / self.n_simulations if self.n_simulations else 1.0
+
+    @property
+    def done(self) -> bool:
+        """True once the job finished, was cancelled or failed."""
+        return self._stopped.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the job has been running."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def result(self):
+        """
+        Samples finished so far as a SimulationResult, or None before the first chunk.
+
+        After a cancellation this is the partial result of the finished chunks.
+        """
+        if self._result is not None:
+            return self._result
+        if self._data is None:
+            return None
+        return SimulationResult(
+            [step.name for step in self.steps], self._data[:, : self.completed]
+        )
+
+    def cancel(self) -> None:
+        """Asks the job to stop after the running chunk."""
+        self._cancel.set()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Blocks until the job stops.
+
+        Args:
+            timeout (float or None): Seconds to wait at most. By default no limit
+
+        Returns:
+            bool: True if the job stopped.
+
+        """
+        return self._stopped.wait(timeout)
+
+    def run(self) -> None:
+        """Simulates the job in the calling thread."""
+        if self._cancel.is_set():
+            self._stop("cancelled")
+            return
+
+        self.status = "running"
+        self.started = time.perf_counter()
+        names = [step.name for step in self.steps]
+
+        try:
+            generators = step_generators(names, self.seed, self._bit_generator)
+            groups = checked_groups(self.steps, self.correlations)
+            self._data = np.empty((len(names), self.n_simulations), dtype=self._dtype)
+
+            for start in range(0, self.n_simulations, self._chunk_size):
+                if self._cancel.is_set():
+                    break
+                stop = min(start + self._chunk_size, self.n_simulations)
+                with instrumentation.stage("job_chunk", samples=stop - start):
+                    columns = draw_correlated(self.steps, groups, generators, stop - start)
+                    for row, column in zip(self._data, columns):
+                        row[start:stop] = column
+                self.completed = stop
+
+        except Exception as e:
+            self.error = e
+            self._stop("failed")
+            return
+
+        self._result = self.result
+        self._stop("done" if self.completed == self.n_simulations else "cancelled")
+
+    def _stop(self, status):
+        self.status = status
+        self.finished = time.perf_counter()
+        self._stopped.set()
+
+
+class JobRunner:
+    """
+    Runs simulation jobs on a shared thread pool.
+
+    At most ``max_workers`` jobs run at the same time, later jobs wait in the
+    queue. Each owner may have at most ``max_jobs_per_owner`` unfinished jobs,
+    so a single user cannot fill the queue and starve the others.
+
+    Args:
+        max_workers (int): Jobs running at the same time. By default 2
+        max_jobs_per_owner (int): Unfinished jobs allowed per owner. By default 1
+        chunk_size (int): Samples per chunk, the granularity of progress and
+            cancellation. By default 2**16
+
+    """
+
+    def __init__(self, max_workers: int = 2, max_jobs_per_owner: int = 1, chunk_size: int = 2**16):
+        assert max_workers > 0, f"Max workers must be positive, but got {max_workers}"
+        assert max_jobs_per_owner > 0, (
+            f"Max jobs per owner must be positive, but got {max_jobs_per_owner}"
+        )
+
+        self.max_workers = max_workers
+        self.max_jobs_per_owner = max_jobs_per_owner
+        self.chunk_size = chunk_size
+
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="simulation-job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        steps,
+        n_simulations: int,
+        seed=None,
+        owner: str = None,
+        dtype=np.float64,
+        bit_generator: str = "PCG64",
+        correlations: dict = None,
+    ) -> Job:
+        """
+        Queues a simulation.
+
+        Args:
+            steps (list[ProcessStep]): Steps in process order, copied at submission.
+            n_simulations (int): Number of samples.
+            seed (None or int): Seed of the run. By default fresh entropy
+            owner (str or None): Who submits the job, e.g. a session id. Jobs without an
+                owner are not limited.
+            dtype (np.dtype): Storage dtype of the samples. By default np.float64
+            bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+            correlations (dict or None): (name, name) to correlation. By default independent steps
+
+        Returns:
+            Job: The queued job.
+
+        Raises:
+            RuntimeError: If the owner already has ``max_jobs_per_owner`` unfinished jobs.
+
+        """
+        job = Job(
+            steps,
+            n_simulations,
+            seed=seed,
+            owner=owner,
+            dtype=dtype,
+            chunk_size=self.chunk_size,
+            bit_generator=bit_generator,
+            correlations=correlations,
+        )
+
+        with self._lock:
+            if owner is not None and len(self.active_jobs(owner)) >= self.max_jobs_per_owner:
+                raise RuntimeError(
+                    f"{owner} already has {self.max_jobs_per_owner} simulation(s) running"
+                )
+            self._jobs[job.id] = job
+
+        future = self._executor.submit(job.run)
+        future.add_done_callback(lambda _: self._forget(job.id))
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Returns an unfinished job, or None."""
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancels an unfinished job.
+
+        Args:
+            job_id (str): Id of the job.
+
+        Returns:
+            bool: True if the job was found.
+
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def active_jobs(self, owner: str = None) -> list[Job]:
+        """
+        Returns unfinished jobs.
+
+        Args:
+            owner (str or None): Only jobs of this owner. By default all jobs
+
+        """
+        return [
+            job
+            for job in list(self._jobs.values())
+            if not job.done and (owner is None or job.owner == owner)
+        ]
+
+    def shutdown(self, cancel: bool = True) -> None:
+        """
+        Stops the runner.
+
+        Args:
+            cancel (bool): Cancel unfinished jobs instead of waiting for them. By default True
+
+        """
+        if cancel:
+            for job in self.active_jobs():
+                job.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _forget(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
@@ -0,0 +1,162 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from copula import checked_groups, draw_correlated
+from rng import child_sequence, seed_sequence, step_generators
+from streaming import simulate_streaming
+
+BACKENDS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def _block_bounds(n_simulations, block_size):
+    starts = range(0, n_simulations, block_size)
+    return [(start, min(block_size, n_simulations - start)) for start in starts]
+
+
+def _simulate_block(steps, groups, size, root, block_index, bit_generator, out=None, start=0):
+    """
+    Simulates one block of samples with streams derived from the block index.
+
+    With ``out`` the columns are written into preallocated arrays (thread backend),
+    otherwise they are returned (process backend).
+
+    """
+    generators = step_generators(
+        [step.name for step in steps], child_sequence(root, block_index), bit_generator
+    )
+    columns = {}
+    total_time = np.zeros(size)
+
+    for step, step_time in zip(steps, draw_correlated(steps, groups, generators, size)):
+        total_time += step_time
+        columns[step.name] = step_time
+
+    columns["Total"] = total_time
+
+    if out is None:
+        return columns
+
+    for name, values in columns.items():
+        out[name][start : start + size] = values
+
+
+def _summarize_block(steps, correlations, size, root, block_index, bit_generator, summary_kwargs):
+    return simulate_streaming(
+        steps,
+        size,
+        chunk_size=size,
+        seed=child_sequence(root, block_index),
+        bit_generator=bit_generator,
+        correlations=correlations,
+        **summary_kwargs,
+    )
+
+
+def simulate_parallel(
+    steps,
+    n_simulations: int,
+    seed=None,
+    n_workers: int = None,
+    backend: str = "thread",
+    block_size: int = 2**18,
+    summary: bool = False,
+    bit_generator: str = "PCG64",
+    correlations: dict = None,
+    **summary_kwargs,
+):
+    """
+    Simulates steps in blocks on a thread or process pool.
+
+    ``n_simulations`` is split into blocks of ``block_size`` samples. Every block
+    draws from streams derived from the seed, the block index and the step name,
+    and blocks are merged in order, so for a given seed the result is the same
+    for any worker count and backend. Correlated steps are drawn with a Gaussian
+    copula in every block.
+
+    Args:
+        steps (list[ProcessStep]): Steps to simulate, in order.
+        n_simulations (int): Total number of samples to draw.
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        n_workers (int or None): Number of workers. By default the number of CPUs
+        backend (str): "thread" (NumPy releases the GIL while drawing) or "process".
+            By default "thread"
+        block_size (int): Samples per block. By default 2**18
+        summary (bool): Return merged online aggregates instead of the samples. By default False
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+        correlations (dict or None): (name, name) to correlation. By default independent steps
+        **summary_kwargs: Passed to ``simulate_streaming`` when ``summary`` is True.
+
+    Returns:
+        pd.DataFrame or SimulationSummary: Samples per step and "Total", or their aggregates.
+
+    Raises:
+        TypeError: If a correlated step has no inverse CDF.
+
+    """
+    import pandas as pd
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend {backend}, expected one of {list(BACKENDS)}")
+    assert block_size > 0, f"Block size must be positive, but got {block_size}"
+
+    root = seed_sequence(seed)
+    blocks = _block_bounds(n_simulations, block_size)
+    n_workers = n_workers or os.cpu_count() or 1
+    groups = checked_groups(steps, correlations)
+
+    if summary:
+        return _simulate_summary(
+            steps, correlations, blocks, root, n_workers, backend, bit_generator, summary_kwargs
+        )
+
+    names = [step.name for step in steps] + ["Total"]
+
+    with BACKENDS[backend](max_workers=n_workers) as executor:
+        if backend == "thread":
+            out = {name: np.empty(n_simulations) for name in names}
+            futures = [
+                executor.submit(_simulate_block, steps, groups, size, root, i, bit_generator, out, start)
+                for i, (start, size) in enumerate(blocks)
+            ]
+            for future in futures:
+                future.result()
+        else:
+            futures = [
+                executor.submit(_simulate_block, steps, groups, size, root, i, bit_generator)
+                for i, (start, size) in enumerate(blocks)
+            ]
+            out = {name: np.empty(n_simulations) for name in names}
+            for (start, size), future in zip(blocks, futures):
+                for name, values in future.result().items():
+                    out[name][start : start + size] = values
+
+    return pd.DataFrame(out)
+
+
+def _simulate_summary(steps, correlations, blocks, root, n_workers, backend, bit_generator, summary_kwargs):
+    if not blocks:
+        return simulate_streaming(steps, 0, **summary_kwargs)
+
+    # The first block fixes the histogram edges so every block can be merged
+    summary = _summarize_block(steps, correlations, blocks[0][1], root, 0, bit_generator, summary_kwargs)
+    if summary_kwargs.get("hist_range") is None:
+        summary_kwargs = {
+            **summary_kwargs,
+            "hist_range": {
+                name: (column.histogram.edges[0], column.histogram.edges[-1])
+                for name, column in summary.columns.items()
+            },
+        }
+
+    with BACKENDS[backend](max_workers=n_workers) as executor:
+        futures = [
+            executor.submit(
+                _summarize_block, steps, correlations, size, root, i, bit_generator, summary_kwargs
+            )
+            for i, (_, size) in enumerate(blocks)
+            if i > 0
+        ]
+        for future in futures:
+            summary.merge(future.result())
+
+    return summary
@@ -1,31 +1,67 @@
+import os
+import sys
+from typing import TYPE_CHECKING
 import numpy as np
-import pandas as pd
+import instrumentation
+from adaptive import AdaptiveResult, simulate_adaptive
+from analytic import TotalDistribution, analyze_total
+from compiled import CompiledProcess
+from copula import correlation_key, correlation_matrix, mixing_matrix, simulate_correlated
+from importance import TailEstimate, estimate_tail
+from incremental import IncrementalSimulator
+from parallel import simulate_parallel
+from process_graph import ProcessGraph
 from process_steps import ProcessStep
+from results import SimulationResult
+from rng import step_generators
+from sampling import simulate_sampled
+import serialization
+from streaming import SimulationSummary, simulate_streaming
+from sweep import SweepResult, sweep
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class Process:
     """
     Represents a sequential single step process.
 
+    Steps are linked through ``ProcessStep.next`` and indexed by name, so
+    lookups by name are O(1).
+
     Attributes:
         head (None , ProcessStep): First step in the process
+        seed (None or int): Seed the process is simulated with, kept when it is saved
 
     """
 
     def __init__(self):
         self.head = None  # By defaults None
         self.tail = None
-    
+        self._steps = {}  # Step name to step, in process order
+        self._compiled = None
+        self._incremental = None
+        self._correlations = {}  # (name, name) to correlation, see set_correlation
+        self.seed = None
+
     def insertAtEnd(self, new_process_step: ProcessStep) -> None:
 
         if not isinstance(new_process_step, ProcessStep):
             raise TypeError(f"Expected a ProcessStep, but got {type(new_process_step)}")
 
+        if new_process_step.name in self._steps:
+            raise ValueError(f"Step name {new_process_step.name} already exists")
+
         if self.head is None:
             self.head = self.tail = new_process_step
         else:
             self.tail.next = new_process_step
             self.tail = new_process_step
-    
+
+        self._steps[new_process_step.name] = new_process_step
+        self._compiled = None
+
     def deleteStep(self, step_name: str) -> bool:
         """
         Deletes step by name
@@ -40,21 +76,31 @@ class Process:
 
         if self.head is None:
             raise ValueError("No process steps to delete.")
-    
-        if self.head.name == step_name:
-            self.head = self.head.next
-            return True
-        
+
+        if step_name not in self._steps:
+            return False
+
+        previous_step = None
         current_step = self.head
-        while current_step and current_step.name != step_name:
+        while current_step.name != step_name:
             previous_step = current_step
             current_step = current_step.next
-        
-        if current_step is None:
-            return False
+
+        if previous_step is None:
+            self.head = current_step.next
         else:
             previous_step.next = current_step.next
-            return True
+
+        if current_step is self.tail:
+            self.tail = previous_step
+
+        current_step.next = None
+        del self._steps[step_name]
+        self._correlations = {
+            pair: rho for pair, rho in self._correlations.items() if step_name not in pair
+        }
+        self._compiled = None
+        return True
 
     def get_names(self) -> list[str]:
         """
@@ -64,17 +110,7 @@ class Process:
             list : List with step names
 
         """
-        names = []
-        current = self.head
-        if current is None:
-            return names
-        
-        current = self.head
-        while current:
-            names.append(current.name)
-            current = current.next
-
-        return names
+        return list(self._steps)
 
     def get_steps(self) -> list[ProcessStep]:
         """
@@ -84,17 +120,26 @@ class Process:
             list: List with process steps. 
 
         """
-        current = self.head
-        if current is None:
+        if not self._steps:
             return None
 
-        steps = []
+        return list(self._steps.values())
 
-        while current:
-            steps.append(current)
-            current = current.next
+    def get_step(self, step_name: str) -> ProcessStep:
+        """
+        Returns a process step by name.
 
-        return steps
+        Args:
+            step_name (str): Step name
+
+        Returns:
+            ProcessStep: The step
+
+        Raises:
+            KeyError: If no step has the name.
+
+        """
+        return self._steps[step_name]
 
     def update_step(self, step_name:str, **kwargs):
         """
@@ -106,34 +151,667 @@ class Process:
             **kwargs: Attribute-value pairs to update
 
         """
-        current_step = self.head
-        while current_step:
-            if current_step.name == step_name:
-                for key, value in kwargs.items():
-                    setattr(current_step, key, value)
-            current_step = current_step.next
+        current_step = self._steps.get(step_name)
+        if current_step is None:
+            return
+
+        for key, value in kwargs.items():
+            setattr(current_step, key, value)
+        self._compiled = None
+
+    def set_correlation(self, step_a: str, step_b: str, rho: float) -> None:
+        """
+        Sets the correlation between the durations of two steps.
+
+        Correlations are applied with a Gaussian copula by every simulation method, so
+        every step keeps its own distribution. ``estimate_tail`` does not support them.
+
+        Args:
+            step_a (str): Name of a step.
+            step_b (str): Name of another step.
+            rho (float): Correlation between -1 and 1, 0 removes it.
+
+        Raises:
+            KeyError: If a step does not exist.
+            ValueError: If the correlations no longer form a valid correlation matrix.
+
+        """
+        for name in (step_a, step_b):
+            if name not in self._steps:
+                raise KeyError(f"No step named {name}")
+        if step_a == step_b:
+            raise ValueError("A step cannot be correlated with itself")
+
+        correlations = dict(self._correlations)
+        correlations[correlation_key(step_a, step_b)] = float(rho)
+        correlations = {pair: value for pair, value in correlations.items() if value != 0}
+
+        mixing_matrix(correlation_matrix(self.get_names(), correlations))
+        self._correlations = correlations
+        self._compiled = None
+
+    def set_correlation_matrix(self, matrix, names=None) -> None:
+        """
+        Replaces all correlations with a full correlation matrix.
+
+        Args:
+            matrix (array-like or pd.DataFrame): Correlation matrix. A DataFrame gives the
+                step names through its index.
+            names (list[str] or None): Step names of the rows. By default all steps in order
+
+        """
+        # A DataFrame can only exist once pandas is imported, so this never imports it
+        pd = sys.modules.get("pandas")
+        if pd is not None and isinstance(matrix, pd.DataFrame):
+            names = list(matrix.index) if names is None else names
+            matrix = matrix.to_numpy()
+        names = self.get_names() if names is None else list(names)
+        matrix = np.asarray(matrix, dtype=np.float64)
+
+        for name in names:
+            if name not in self._steps:
+                raise KeyError(f"No step named {name}")
+        if matrix.shape != (len(names), len(names)):
+            raise ValueError(f"Expected a {len(names)}x{len(names)} matrix, but got {matrix.shape}")
+        mixing_matrix(matrix)
+
+        self._correlations = {
+            correlation_key(names[i], names[j]): float(matrix[i, j])
+            for i in range(len(names))
+            for j in range(i + 1, len(names))
+            if matrix[i, j] != 0
+        }
+        self._compiled = None
+
+    def get_correlations(self) -> dict:
+        """
+        Returns the pairwise correlations that are set.
+
+        Returns:
+            dict: (name, name) to correlation, pairs without correlation left out.
+
+        """
+        return dict(self._correlations)
+
+    def get_correlation_matrix(self) -> "pd.DataFrame":
+        """
+        Returns the correlation matrix of all steps.
+
+        Returns:
+            pd.DataFrame: Correlations with step names as index and columns.
+
+        """
+        import pandas as pd
+
+        names = self.get_names()
+        return pd.DataFrame(
+            correlation_matrix(names, self._correlations), index=names, columns=names
+        )
+
+    def to_graph(self) -> ProcessGraph:
+        """
+        Returns the process as a graph in which every step waits for the previous one.
+
+        Further steps can be added to the graph with dependencies on any step, for
+        parallel branches that join later.
+
+        Returns:
+            ProcessGraph: Chain of the process steps.
+
+        """
+        return ProcessGraph.from_process(self)
+
+    def to_dict(self) -> dict:
+        """
+        Returns a plain, JSON-serializable definition of the process.
+
+        Returns:
+            dict: "seed", "steps" in order as dicts with "name", "type" and parameters,
+                and "correlations" as [step, step, rho].
+
+        """
+        return {
+            "seed": self.seed,
+            "steps": [serialization.step_to_dict(step) for step in self._steps.values()],
+            "correlations": [[a, b, rho] for (a, b), rho in self._correlations.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, definition: dict, trusted: bool = True) -> "Process":
+        """
+        Builds a process from its definition, see ``to_dict``.
+
+        Args:
+            definition (dict): "steps" and optional "correlations" and "seed".
+            trusted (bool): Whether steps may refer to any file of the server, False for
+                uploads. By default True
+
+        Returns:
+            Process: The process.
+
+        Raises:
+            ValueError: If the definition is malformed, a step type is unknown, its
+                parameters are invalid or an untrusted step refers to a file outside
+                the upload cache.
+            KeyError: If a correlation refers to a missing step.
+
+        """
+        serialization.check_definition(definition)
+
+        process = cls()
+        for step_definition in definition.get("steps") or []:
+            process.insertAtEnd(serialization.step_from_dict(step_definition, trusted))
+
+        correlations = {}
+        for step_a, step_b, rho in definition.get("correlations") or []:
+            for name in (step_a, step_b):
+                if name not in process._steps:
+                    raise KeyError(f"No step named {name}")
+            if step_a == step_b:
+                raise ValueError("A step cannot be correlated with itself")
+            if rho != 0:
+                correlations[correlation_key(step_a, step_b)] = float(rho)
+        if correlations:
+            # Checked once, instead of once per pair as in set_correlation
+            mixing_matrix(correlation_matrix(process.get_names(), correlations))
+        process._correlations = correlations
+
+        process.seed = definition.get("seed")
+        return process
+
+    def save(self, file, result: SimulationResult = None) -> None:
+        """
+        Saves the process, and optionally simulation results, to one binary file.
+
+        The definition is stored as a JSON header and the samples as raw arrays, so
+        ``load`` maps them instead of parsing them.
+
+        Args:
+            file (str or file-like): Path or binary file, by convention ending in ".mcsim".
+            result (SimulationResult or None): Samples to store with the process.
+
+        Raises:
+            ValueError: If a step type cannot be serialized.
+
+        """
+        header = {"process": self.to_dict()}
+        arrays = {}
+        if result is not None:
+            header["result"] = {"names": list(result.names)}
+            arrays["result"] = result.data
+        serialization.write(file, header, arrays)
+
+    @classmethod
+    def load(cls, source, mmap: bool = True, trusted: bool = True) -> tuple:
+        """
+        Loads a process saved with ``save``.
+
+        Samples of a file are memory-mapped, and samples of bytes or an in-memory
+        file are views of its buffer, so neither is copied.
+
+        Args:
+            source (str, bytes or file-like): Path, contents or binary file.
+            mmap (bool): Memory-map the samples of a file. By default True
+            trusted (bool): Whether steps may refer to any file of the server. Pass False
+                for uploads, see ``from_dict``. By default True
+
+        Returns:
+            tuple: (Process, SimulationResult or None).
+
+        Raises:
+            ValueError: If the source is not a saved process, or a step is invalid.
+
+        """
+        header, arrays = serialization.read(source, mmap=mmap)
+        if "process" not in header:
+            raise ValueError("Not a saved process, the file has no process definition")
+        process = cls.from_dict(header["process"], trusted)
+
+        result = None
+        if "result" in header:
+            names = header["result"].get("names") if isinstance(header["result"], dict) else None
+            data = arrays.get("result")
+            if (
+                not isinstance(names, list)
+                or not all(isinstance(name, str) for name in names)
+                or data is None
+                or data.ndim != 2
+                or data.shape[0] != len(names)
+            ):
+                raise ValueError("The saved results do not match their step names")
+            path = source if isinstance(source, (str, os.PathLike)) and mmap else None
+            result = SimulationResult(names, data, path=path)
+        return process, result
+
+    def compile(self) -> CompiledProcess:
+        """
+        Returns a frozen, array-backed representation of the process.
+
+        The result is cached until a step is inserted, deleted or updated, or a
+        correlation is set through the Process. Changing step attributes directly
+        does not invalidate it.
+
+        Returns:
+            CompiledProcess: Steps grouped by distribution family.
 
-    def simulate_process(self, n_simulations=1000) -> pd.DataFrame:
+        """
+        if self._compiled is None:
+            self._compiled = CompiledProcess(self.get_steps() or [], self._correlations)
+        return self._compiled
+
+    def simulate_process(
+        self, n_simulations=1000, seed=None, bit_generator="PCG64", sampling="random"
+    ) -> "pd.DataFrame":
         """
         Simulates number of samples and calculates the total time.
 
+        Every step draws from its own random stream derived from the seed and the
+        step name, so adding or removing a step does not change the draws of the others.
+
+        Other sampling methods draw a joint uniform design with one dimension per step
+        and map it through each step's inverse CDF. They reduce the variance of
+        estimates such as the mean or a quantile of "Total" for the same sample count.
+
+        Steps correlated with ``set_correlation`` are drawn jointly with a Gaussian copula.
+
         Args:
             n_simualtions (int): number of samples to draw. By default 1000
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+            bit_generator (str): name of the numpy bit generator, e.g. "PCG64" or "SFC64".
+                By default "PCG64"
+            sampling (str): "random", "antithetic", "lhs" (Latin hypercube), "halton" or
+                "sobol" (scrambled quasi-Monte Carlo). By default "random"
 
         Returns:
             results (pd.DataFrame) : returns a Pandas dataframe with results
 
         """
-        results = {}
-        total_time = np.zeros(n_simulations)
-        current = self.head
+        import pandas as pd
+
+        with instrumentation.stage("simulate_process", samples=n_simulations):
+            if self._correlations or sampling != "random":
+                if self._correlations:
+                    results = simulate_correlated(
+                        self.get_steps(),
+                        self._correlations,
+                        n_simulations,
+                        seed,
+                        sampling,
+                        bit_generator,
+                    )
+                else:
+                    results = simulate_sampled(
+                        self.get_steps() or [], n_simulations, sampling, seed, bit_generator
+                    )
+                with instrumentation.stage("dataframe", samples=n_simulations):
+                    return pd.DataFrame(results)
+
+            results = {}
+            total_time = np.zeros(n_simulations)
+            generators = step_generators(self.get_names(), seed, bit_generator)
+            current = self.head
+
+            while current:
+                with instrumentation.stage(f"draw:{current.name}", samples=n_simulations):
+                    step_time = current.simulate(
+                        n_simulations=n_simulations, rng=generators[current.name]
+                    )
+                results[current.name] = step_time
+                with instrumentation.stage("accumulate", samples=n_simulations):
+                    total_time += step_time
+
+                current = current.next
+
+            results["Total"] = total_time
+            with instrumentation.stage("dataframe", samples=n_simulations):
+                return pd.DataFrame(results)
+
+    def simulate_streaming(
+        self,
+        n_simulations=1000,
+        chunk_size=2**20,
+        bins=100,
+        hist_range=None,
+        sketch_size=4096,
+        seed=None,
+        bit_generator="PCG64",
+    ) -> SimulationSummary:
+        """
+        Simulates in fixed-size chunks and returns online aggregates instead of samples.
 
-        while current:
-            step_time = current.simulate(n_simulations=n_simulations)
-            results[current.name] = step_time
-            total_time += step_time
+        Memory stays flat no matter how many simulations are requested, which makes
+        runs of 10^8 draws and more possible.
 
-            current = current.next
+        Args:
+            n_simulations (int): number of samples to draw. By default 1000
+            chunk_size (int): number of samples drawn at once. By default 2**20
+            bins (int): number of histogram bins per column. By default 100
+            hist_range (tuple, dict or None): histogram range for all columns or per column name.
+                By default taken from the first chunk.
+            sketch_size (int): capacity of a quantile sketch level. By default 4096
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+            bit_generator (str): name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            summary (SimulationSummary): count, mean, variance, min/max, histogram and
+                quantile sketch per step and for "Total"
+
+        """
+        return simulate_streaming(
+            self.get_steps() or [],
+            n_simulations,
+            chunk_size=chunk_size,
+            bins=bins,
+            hist_range=hist_range,
+            sketch_size=sketch_size,
+            seed=seed,
+            bit_generator=bit_generator,
+            correlations=self._correlations,
+        )
+
+    def simulate_parallel(
+        self,
+        n_simulations=1000,
+        seed=None,
+        n_workers=None,
+        backend="thread",
+        block_size=2**18,
+        summary=False,
+        bit_generator="PCG64",
+        **summary_kwargs,
+    ):
+        """
+        Simulates in blocks on a thread or process pool and merges the blocks.
+
+        For a given seed the results are identical for any worker count and backend.
+        They differ from ``simulate_process`` with the same seed, because every block
+        draws from its own streams.
+
+        Args:
+            n_simulations (int): number of samples to draw. By default 1000
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+            n_workers (int or None): number of workers. By default the number of CPUs
+            backend (str): "thread" or "process". By default "thread"
+            block_size (int): samples per block. By default 2**18
+            summary (bool): return a SimulationSummary instead of the samples. By default False
+            bit_generator (str): name of the numpy bit generator. By default "PCG64"
+            **summary_kwargs: histogram and sketch options, see ``simulate_streaming``
+
+        Returns:
+            results (pd.DataFrame or SimulationSummary): samples or merged aggregates
+
+        """
+        return simulate_parallel(
+            self.get_steps() or [],
+            n_simulations,
+            seed=seed,
+            n_workers=n_workers,
+            backend=backend,
+            block_size=block_size,
+            summary=summary,
+            bit_generator=bit_generator,
+            correlations=self._correlations,
+            **summary_kwargs,
+        )
+
+    def simulate_compiled(self, n_simulations=1000, seed=None, bit_generator="PCG64") -> "pd.DataFrame":
+        """
+        Simulates with one vectorized draw per distribution family.
+
+        Much faster than ``simulate_process`` for processes with many steps. Streams
+        are per family instead of per step, so results differ from ``simulate_process``
+        for the same seed.
+
+        Args:
+            n_simulations (int): number of samples to draw. By default 1000
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+            bit_generator (str): name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            results (pd.DataFrame) : returns a Pandas dataframe with results
+
+        """
+        return self.compile().simulate(n_simulations, seed=seed, bit_generator=bit_generator)
+
+    def simulate_incremental(self, n_simulations=1000, seed=None, bit_generator="PCG64") -> "pd.DataFrame":
+        """
+        Simulates like ``simulate_process``, redrawing only steps changed since the last call.
+
+        Per-step samples of the previous call are kept on the process. With the same
+        seed and number of simulations, only added or updated steps are drawn again and
+        "Total" is adjusted by their difference.
+
+        Args:
+            n_simulations (int): number of samples to draw. By default 1000
+            seed (None or int): seed of the run. Unseeded runs redraw every step.
+            bit_generator (str): name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            results (pd.DataFrame) : returns a Pandas dataframe with results
 
-        results["Total"] = total_time
-        return pd.DataFrame(results)
+        """
+        import pandas as pd
+
+        if self._incremental is None:
+            self._incremental = IncrementalSimulator()
+
+        results = self._incremental.run(
+            self.get_steps(), n_simulations, seed=seed, bit_generator=bit_generator
+        )
+        with instrumentation.stage("dataframe", samples=n_simulations):
+            return pd.DataFrame(results)
+
+    def simulate_result(
+        self,
+        n_simulations=1000,
+        seed=None,
+        dtype=np.float64,
+        storage="memory",
+        path=None,
+        incremental=False,
+        bit_generator="PCG64",
+    ) -> SimulationResult:
+        """
+        Simulates into a compact columnar result instead of a DataFrame.
+
+        Samples are the same as ``simulate_process`` with the same seed, including
+        correlations, stored in the chosen dtype. "Total" is computed lazily and a DataFrame is only built on
+        ``to_frame``.
+
+        Args:
+            n_simulations (int): number of samples to draw. By default 1000
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+            dtype (np.dtype): storage dtype, e.g. np.float32. By default np.float64
+            storage (str): "memory" or "mmap" for a memory-mapped .npy file. By default "memory"
+            path (str or None): file for "mmap" storage. By default a temporary file
+            incremental (bool): redraw only steps changed since the last incremental run.
+                Ignored for processes with correlations. By default False
+            bit_generator (str): name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            result (SimulationResult): samples per step
+
+        """
+        with instrumentation.stage("simulate_result", samples=n_simulations):
+            # Correlated steps are drawn together, so they cannot be redrawn one by one
+            if self._correlations or incremental:
+                if self._correlations:
+                    columns = simulate_correlated(
+                        self.get_steps(),
+                        self._correlations,
+                        n_simulations,
+                        seed,
+                        bit_generator=bit_generator,
+                    )
+                else:
+                    if self._incremental is None:
+                        self._incremental = IncrementalSimulator()
+                    columns = self._incremental.run(
+                        self.get_steps(), n_simulations, seed=seed, bit_generator=bit_generator
+                    )
+                with instrumentation.stage("store", samples=n_simulations):
+                    return SimulationResult.from_columns(
+                        columns, dtype=dtype, storage=storage, path=path
+                    )
+
+            names = self.get_names()
+            result = SimulationResult.allocate(
+                names, n_simulations, dtype=dtype, storage=storage, path=path
+            )
+            generators = step_generators(names, seed, bit_generator)
+            for row, step in zip(result.data, self._steps.values()):
+                with instrumentation.stage(f"draw:{step.name}", samples=n_simulations):
+                    row[:] = step.simulate(n_simulations=n_simulations, rng=generators[step.name])
+
+            return result
+
+    def analyze_total(self, grid_size=2**14, n_fallback=200_000, seed=None) -> TotalDistribution:
+        """
+        Computes mean, variance, quantiles and density of "Total" without sampling.
+
+        Sums of normals are exact, sums of same-rate exponentials are gamma (Erlang),
+        other mixes are convolved numerically on a grid. Steps without a known
+        distribution, and correlations of other steps than normals, fall back to Monte Carlo.
+
+        Args:
+            grid_size (int): points of the density grid. By default 2**14
+            n_fallback (int): samples for the Monte Carlo fallback. By default 200 000
+            seed (None, int, SeedSequence or Generator): seed of the Monte Carlo fallback
+
+        Returns:
+            distribution (TotalDistribution): distribution of the total time
+
+        """
+        return analyze_total(
+            self.get_steps(),
+            grid_size=grid_size,
+            n_fallback=n_fallback,
+            seed=seed,
+            correlations=self._correlations,
+        )
+
+    def simulate_adaptive(
+        self,
+        target_relative_error=None,
+        target_absolute_error=None,
+        quantile=None,
+        target_halfwidth=None,
+        confidence=0.95,
+        initial_batch=10_000,
+        max_samples=10**7,
+        seed=None,
+    ) -> AdaptiveResult:
+        """
+        Simulates "Total" in growing batches until a precision target or the budget is reached.
+
+        Args:
+            target_relative_error (float or None): target standard error of the mean divided
+                by the mean, e.g. 0.001
+            target_absolute_error (float or None): target standard error of the mean, for
+                means near 0 where a relative error cannot be met. Either target meets the
+                mean target
+            quantile (float or None): quantile level of a quantile target, e.g. 0.95
+            target_halfwidth (float or None): target confidence interval half-width of that quantile
+            confidence (float): confidence level of the quantile interval. By default 0.95
+            initial_batch (int): size of the first batch. By default 10 000
+            max_samples (int): budget of samples. By default 10**7
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+
+        Returns:
+            result (AdaptiveResult): estimates, reached precision and the number of samples used
+
+        """
+        return simulate_adaptive(
+            self.get_steps(),
+            target_relative_error=target_relative_error,
+            target_absolute_error=target_absolute_error,
+            quantile=quantile,
+            target_halfwidth=target_halfwidth,
+            confidence=confidence,
+            initial_batch=initial_batch,
+            max_samples=max_samples,
+            seed=seed,
+            correlations=self._correlations,
+        )
+
+    def sweep(
+        self,
+        overrides,
+        n_simulations=10_000,
+        design="grid",
+        quantiles=(0.5, 0.9, 0.95),
+        sampling="random",
+        seed=None,
+    ) -> SweepResult:
+        """
+        Simulates parameter scenarios in batched draws with common random numbers.
+
+        All scenarios share the same uniforms, so their differences have much lower variance
+        than separate runs, and hundreds of scenarios cost about as much as a few runs. The
+        process itself is not changed.
+
+        Args:
+            overrides (dict or list[dict]): step name to {parameter: list of values}, e.g.
+                {"review": {"mean": [9, 10, 11]}}, or a list of scenarios as step name to
+                {parameter: value}
+            n_simulations (int): samples per scenario. By default 10 000
+            design (str): "grid" for every combination of values or "one_at_a_time".
+                By default "grid"
+            quantiles (tuple[float]): quantiles of "Total" in the summary. By default (0.5, 0.9, 0.95)
+            sampling (str): uniform design, e.g. "random" or "lhs". By default "random"
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+
+        Returns:
+            result (SweepResult): summary per scenario, with ``tornado()`` for sensitivities
+
+        """
+        return sweep(
+            self.get_steps(),
+            overrides,
+            n_simulations=n_simulations,
+            design=design,
+            quantiles=quantiles,
+            sampling=sampling,
+            seed=seed,
+            correlations=self._correlations,
+        )
+
+    def estimate_tail(
+        self, threshold, n_simulations=100_000, confidence=0.95, theta=None, seed=None
+    ) -> TailEstimate:
+        """
+        Estimates the probability that "Total" exceeds a threshold, e.g. an SLA.
+
+        Uses importance sampling: steps are drawn from exponentially tilted distributions
+        that make exceeding the threshold common, and samples are weighted by their
+        likelihood ratio. Rare probabilities such as 1e-5 need orders of magnitude fewer
+        samples than with ``simulate_process``.
+
+        Args:
+            threshold (float): threshold of the total time
+            n_simulations (int): number of samples to draw. By default 100 000
+            confidence (float): confidence level of the interval. By default 0.95
+            theta (float or None): tilt to use instead of the solved one, 0 gives plain
+                Monte Carlo. Required for steps other than normal, exponential and uniform
+            seed (None, int, SeedSequence or Generator): seed of the run. By default fresh entropy
+
+        Returns:
+            estimate (TailEstimate): probability, standard error and confidence interval
+
+        Raises:
+            ValueError: If steps are correlated, the tilted draws assume independent steps,
+                or a step cannot be tilted and no theta is given.
+
+        """
+        if self._correlations:
+            raise ValueError(
+                "Tail estimates need independent steps, use simulate_result for correlated processes"
+            )
+        return estimate_tail(
+            self.get_steps(),
+            threshold,
+            n_simulations=n_simulations,
+            confidence=confidence,
+            theta=theta,
+            seed=seed,
+        )
@@ -0,0 +1,282 @@
+import numpy as np
+from copula import checked_groups, correlation_key, correlation_matrix, draw_correlated, mixing_matrix
+from process_steps import ProcessStep
+from rng import step_generators
+
+# Largest number of finish times held per chunk of samples
+_CHUNK_ELEMENTS = 2**22
+
+
+class GraphResult:
+    """
+    Outcome of a process graph simulation.
+
+    Attributes:
+        names (list[str]): Step names in topological order.
+        total (np.ndarray): Completion time of the whole process per sample.
+        critical_frequency (pd.Series): Share of samples in which each step lies on
+            the critical path, indexed by step name.
+        durations (dict or None): Step name to durations, if they were kept.
+
+    """
+
+    def __init__(self, names, total, critical_frequency, durations=None):
+        self.names = names
+        self.total = total
+        self.critical_frequency = critical_frequency
+        self.durations = durations
+
+    @property
+    def n_simulations(self) -> int:
+        """Number of samples."""
+        return self.total.size
+
+
+class ProcessGraph:
+    """
+    Process of steps with dependencies, so branches can run in parallel.
+
+    A step starts when all steps it depends on have finished. The completion
+    time of the process is the latest finish of the steps nothing depends on.
+    Steps are added after their dependencies, so insertion order is always a
+    topological order and the graph cannot have cycles.
+
+    """
+
+    def __init__(self):
+        self._steps = {}  # Step name to step, in topological order
+        self._dependencies = {}  # Step name to names of the steps it waits for
+        self._correlations = {}  # (name, name) to correlation, see set_correlation
+
+    @classmethod
+    def from_process(cls, process) -> "ProcessGraph":
+        """
+        Builds a graph in which every step of a sequential Process waits for the previous one.
+
+        The correlations of the process are kept.
+
+        Args:
+            process (Process): Sequential process.
+
+        Returns:
+            ProcessGraph: Chain of the same steps.
+
+        """
+        graph = cls()
+        previous = ()
+        for step in process.get_steps() or []:
+            graph.add_step(step, after=previous)
+            previous = (step.name,)
+        graph._correlations = process.get_correlations()
+        return graph
+
+    def add_step(self, step: ProcessStep, after=()) -> None:
+        """
+        Adds a step that starts when all steps in ``after`` have finished.
+
+        Args:
+            step (ProcessStep): Step to add.
+            after (iterable[str]): Names of steps that must finish first. By default none,
+                the step starts at time 0.
+
+        Raises:
+            TypeError: If step is not a ProcessStep.
+            ValueError: If the name exists already.
+            KeyError: If a dependency does not exist.
+
+        """
+        if not isinstance(step, ProcessStep):
+            raise TypeError(f"Expected a ProcessStep, but got {type(step)}")
+        if step.name in self._steps:
+            raise ValueError(f"Step name {step.name} already exists")
+
+        after = list(dict.fromkeys(after))
+        for name in after:
+            if name not in self._steps:
+                raise KeyError(f"No step named {name}")
+
+        self._steps[step.name] = step
+        self._dependencies[step.name] = after
+
+    def remove_step(self, step_name: str) -> None:
+        """
+        Removes a step that no other step depends on.
+
+        Args:
+            step_name (str): Step name.
+
+        Raises:
+            KeyError: If no step has the name.
+            ValueError: If other steps depend on it.
+
+        """
+        if step_name not in self._steps:
+            raise KeyError(f"No step named {step_name}")
+        dependents = self.successors(step_name)
+        if dependents:
+            raise ValueError(f"Steps {dependents} depend on {step_name}")
+
+        del self._steps[step_name]
+        del self._dependencies[step_name]
+        self._correlations = {
+            pair: rho for pair, rho in self._correlations.items() if step_name not in pair
+        }
+
+    def set_correlation(self, step_a: str, step_b: str, rho: float) -> None:
+        """
+        Sets the correlation between the durations of two steps, see ``Process.set_correlation``.
+
+        Args:
+            step_a (str): Name of a step.
+            step_b (str): Name of another step.
+            rho (float): Correlation between -1 and 1, 0 removes it.
+
+        Raises:
+            KeyError: If a step does not exist.
+            ValueError: If the correlations no longer form a valid correlation matrix.
+
+        """
+        for name in (step_a, step_b):
+            if name not in self._steps:
+                raise KeyError(f"No step named {name}")
+        if step_a == step_b:
+            raise ValueError("A step cannot be correlated with itself")
+
+        correlations = dict(self._correlations)
+        correlations[correlation_key(step_a, step_b)] = float(rho)
+        correlations = {pair: value for pair, value in correlations.items() if value != 0}
+
+        mixing_matrix(correlation_matrix(self.get_names(), correlations))
+        self._correlations = correlations
+
+    def get_names(self) -> list[str]:
+        """Returns step names in topological order."""
+        return list(self._steps)
+
+    def get_steps(self) -> list[ProcessStep]:
+        """Returns steps in topological order."""
+        return list(self._steps.values())
+
+    def get_step(self, step_name: str) -> ProcessStep:
+        """Returns a step by name, raises KeyError if it does not exist."""
+        return self._steps[step_name]
+
+    def predecessors(self, step_name: str) -> list[str]:
+        """Returns the names of the steps a step waits for."""
+        return list(self._dependencies[step_name])
+
+    def successors(self, step_name: str) -> list[str]:
+        """Returns the names of the steps that wait for a step."""
+        return [name for name, after in self._dependencies.items() if step_name in after]
+
+    def sinks(self) -> list[str]:
+        """Returns the names of the steps nothing depends on."""
+        waited_for = {name for after in self._dependencies.values() for name in after}
+        return [name for name in self._steps if name not in waited_for]
+
+    def simulate(
+        self,
+        n_simulations: int = 1000,
+        seed=None,
+        keep_durations: bool = False,
+        bit_generator: str = "PCG64",
+    ) -> GraphResult:
+        """
+        Simulates completion times of the process and its critical paths.
+
+        Steps are evaluated in topological order on whole arrays of samples: a
+        step's finish time is the element-wise maximum of its dependencies'
+        finish times plus its duration. The critical path of every sample is
+        traced back from the latest finishing sink through the dependency that
+        finished last. Samples are processed in chunks, so memory does not grow
+        with the number of steps times the number of samples.
+
+        Every step draws from its own stream keyed on the seed and its name, so a
+        chain built with ``from_process`` has the durations of
+        ``Process.simulate_process`` with the same seed, including correlated steps.
+
+        Args:
+            n_simulations (int): Number of samples. By default 1000
+            seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+            keep_durations (bool): Keep the step durations in the result. By default False
+            bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+
+        Returns:
+            GraphResult: Completion times and critical path frequencies.
+
+        """
+        import pandas as pd
+
+        names = self.get_names()
+        steps = self.get_steps()
+        index = {name: i for i, name in enumerate(names)}
+        dependencies = [[index[name] for name in self._dependencies[step]] for step in names]
+        sinks = [index[name] for name in self.sinks()]
+
+        generators = step_generators(names, seed, bit_generator)
+        groups = checked_groups(steps, self._correlations)
+        total = np.zeros(n_simulations)
+        critical_counts = np.zeros(len(names), dtype=np.int64)
+        durations = (
+            {name: np.empty(n_simulations) for name in names} if keep_durations else None
+        )
+
+        chunk_size = max(_CHUNK_ELEMENTS // max(len(names), 1), 1)
+        for start in range(0, n_simulations if names else 0, chunk_size):
+            stop = min(start + chunk_size, n_simulations)
+            finish = np.empty((len(names), stop - start))
+
+            chunk = draw_correlated(steps, groups, generators, stop - start)
+            for i, (step, after, duration) in enumerate(zip(steps, dependencies, chunk)):
+                if durations is not None:
+                    durations[step.name][start:stop] = duration
+
+                if after:
+                    finish[i] = finish[after[0]]
+                    for j in after[1:]:
+                        np.maximum(finish[i], finish[j], out=finish[i])
+                    finish[i] += duration
+                else:
+                    finish[i] = duration
+
+            total[start:stop] = finish[sinks].max(axis=0)
+            critical_counts += _critical_path(finish, dependencies, sinks).sum(axis=1)
+
+        critical_frequency = pd.Series(
+            critical_counts / max(n_simulations, 1), index=names, name="critical_frequency"
+        )
+        return GraphResult(names, total, critical_frequency, durations)
+
+
+def _latest(finish, rows):
+    """Position in ``rows`` of the row with the latest finish per sample, first on ties."""
+    # A running maximum over contiguous rows is much faster than argmax along axis 0
+    best = finish[rows[0]].copy()
+    choice = np.zeros(finish.shape[1], dtype=np.intp)
+    for k, row in enumerate(rows[1:], 1):
+        later = finish[row] > best
+        choice[later] = k
+        np.maximum(best, finish[row], out=best)
+    return choice
+
+
+def _critical_path(finish, dependencies, sinks):
+    """Marks per sample the steps on the path that determines the completion time."""
+    on_path = np.zeros(finish.shape, dtype=bool)
+    last = _latest(finish, sinks)
+    for k, sink in enumerate(sinks):
+        on_path[sink] = last == k
+
+    for i in reversed(range(len(dependencies))):
+        after = dependencies[i]
+        if not after or not on_path[i].any():
+            continue
+        if len(after) == 1:
+            on_path[after[0]] |= on_path[i]
+            continue
+
+        latest = _latest(finish, after)
+        for k, j in enumerate(after):
+            on_path[j] |= on_path[i] & (latest == k)
+
+    return on_path
@@ -1,4 +1,30 @@
 import numpy as np
+from special import betaincinv, gammaincinv, norm_ppf
+
+
+class Param:
+    """
+    Schema of one distribution parameter, from which the app builds its inputs.
+
+    Attributes:
+        name (str): Keyword of the step constructor.
+        label (str): Label of the input.
+        default (float or tuple): Value of a new input.
+        min_value (float or None): Smallest value the input accepts, None for no limit.
+        kind (str): "number" for a single value, "list" for a sequence of numbers.
+
+    """
+
+    __slots__ = ("name", "label", "default", "min_value", "kind")
+
+    def __init__(self, name: str, label: str, default=0.0, min_value=0.0, kind: str = "number"):
+        assert kind in ("number", "list"), f"Kind must be number or list, but got {kind}"
+
+        self.name = name
+        self.label = label
+        self.default = default
+        self.min_value = min_value
+        self.kind = kind
 
 
 class ProcessStep:
@@ -8,17 +34,79 @@ class ProcessStep:
     Attributes:
         name (str): Name of the process.
         next (ProcessStep or None): Next step in the process.
+        family (str or None): Distribution family, used to batch draws of similar steps.
+        param_names (tuple): Names of the distribution parameters.
+        label (str or None): Name of the distribution in the app.
+        schema (tuple[Param]): Parameter inputs of the app, in constructor order.
+        sample_batch (callable or None): Draws a (n_steps, n) block for steps of the
+            family at once, given a generator, parameter name to array and n.
+        inverse_cdf (callable or None): Static method mapping uniforms in (0, 1) and the
+            parameters, broadcast against them, to samples. None for steps that can only
+            be simulated, which rules out other sampling methods, correlations and sweeps.
 
     Args:
         name (str): Name of the process
     """
 
+    __slots__ = ("name", "next")
+    family = None
+    param_names = ()
+    label = None
+    schema = ()
+    sample_batch = None
+    inverse_cdf = None
+
     def __init__(self, name: str):
         assert isinstance(name, str), f"Name must be a string, but got {type(name)}"
 
         self.name = name
         self.next = None
 
+    def get_params(self) -> dict:
+        """
+        Returns the distribution parameters of the step.
+
+        Returns:
+            dict: Parameter name to value.
+
+        """
+        return {key: getattr(self, key) for key in self.param_names}
+
+    def ppf(self, u) -> np.ndarray:
+        """
+        Maps uniforms to samples of the step's distribution (inverse CDF).
+
+        Args:
+            u (np.ndarray): Uniforms in (0, 1).
+
+        Returns:
+            samples (np.ndarray): Quantiles of the distribution at ``u``.
+
+        Raises:
+            TypeError: If the step type has no inverse CDF.
+
+        """
+        if self.inverse_cdf is None:
+            raise TypeError(f"Step {self.name} of type {type(self).__name__} has no inverse CDF")
+        return self.inverse_cdf(u, **self.get_params())
+
+
+def require_inverse_cdf(steps, purpose: str) -> None:
+    """
+    Checks that steps have an inverse CDF, before any sampling starts.
+
+    Args:
+        steps (list[ProcessStep]): Steps to check.
+        purpose (str): What needs the inverse CDF, for the error message.
+
+    Raises:
+        TypeError: Naming the steps without an inverse CDF.
+
+    """
+    missing = [step.name for step in steps if step.inverse_cdf is None]
+    if missing:
+        raise TypeError(f"{purpose} needs an inverse CDF, which steps {missing} do not have")
+
 
 class UniformStep(ProcessStep):
     """
@@ -38,6 +126,12 @@ class UniformStep(ProcessStep):
 
     """
 
+    __slots__ = ("low", "high")
+    param_names = __slots__
+    family = "uniform"
+    label = "Uniform"
+    schema = (Param("low", "Lower Bound"), Param("high", "Upper Bound"))
+
     def __init__(self, name: str, low: float, high: float):
         super().__init__(name)
 
@@ -52,18 +146,25 @@ class UniformStep(ProcessStep):
         self.low = low
         self.high = high
 
-    def simulate(self, n_simulations: int) -> np.ndarray:
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
         """
         Draws n samples from a uniform distribution.
 
         Args:
             n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
 
         Returns:
             samples (np.ndarray): An array of drawn samples.
 
         """
-        return np.random.uniform(low=self.low, high=self.high, size=n_simulations)
+        rng = np.random.default_rng(rng)
+        return rng.uniform(low=self.low, high=self.high, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, low, high):
+        return low + (high - low) * u
 
 
 class NormalStep(ProcessStep):
@@ -84,6 +185,12 @@ class NormalStep(ProcessStep):
 
     """
 
+    __slots__ = ("mean", "stdev")
+    param_names = __slots__
+    family = "normal"
+    label = "Normal"
+    schema = (Param("mean", "Mean"), Param("stdev", "Standard Deviation"))
+
     def __init__(self, name: str, mean: float, stdev: float):
         super().__init__(name)
 
@@ -99,18 +206,25 @@ class NormalStep(ProcessStep):
         self.mean = mean
         self.stdev = stdev
 
-    def simulate(self, n_simulations: int) -> np.ndarray:
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
         """
         Draws n samples from a normal distribution.
 
         Args:
             n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
 
         Returns:
             samples (np.ndarray): An array of drawn samples.
 
         """
-        return np.random.normal(loc=self.mean, scale=self.stdev, size=n_simulations)
+        rng = np.random.default_rng(rng)
+        return rng.normal(loc=self.mean, scale=self.stdev, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, mean, stdev):
+        return mean + stdev * norm_ppf(u)
 
 
 class ExponentialStep(ProcessStep):
@@ -129,6 +243,12 @@ class ExponentialStep(ProcessStep):
 
     """
 
+    __slots__ = ("rate",)
+    param_names = __slots__
+    family = "exponential"
+    label = "Exponential"
+    schema = (Param("rate", "Rate (lambda)", default=0.01, min_value=0.01),)
+
     def __init__(self, name: str, rate: float):
         super().__init__(name)
         assert isinstance(
@@ -138,14 +258,585 @@ class ExponentialStep(ProcessStep):
 
         self.rate = rate
 
-    def simulate(self, n_simulations: int) -> np.ndarray:
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
         """
         Draws n samples from a exponential distribution.
 
         Args:
             n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
 
         Returns:
             samples (np.ndarray): An array of drawn samples.
         """
-        return np.random.exponential(1 / self.rate, size=n_simulations)
\ No newline at end of file
+        rng = np.random.default_rng(rng)
+        return rng.exponential(1 / self.rate, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, rate):
+        return -np.log1p(-u) / rate
+
+
+class LognormalStep(ProcessStep):
+    """
+    Represents a process step with a lognormal distribution.
+
+    Attributes:
+        mu (float): Mean of the logarithm of the duration.
+        sigma (float): Standard deviation of the logarithm of the duration.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        mu (float): Mean of the logarithm of the duration.
+        sigma (float): Standard deviation of the logarithm. Must be non-negative.
+
+    """
+
+    __slots__ = ("mu", "sigma")
+    param_names = __slots__
+    family = "lognormal"
+    label = "Lognormal"
+    schema = (
+        Param("mu", "Log Mean (mu)", min_value=None),
+        Param("sigma", "Log Standard Deviation (sigma)", default=0.5),
+    )
+
+    def __init__(self, name: str, mu: float, sigma: float):
+        super().__init__(name)
+        assert isinstance(mu, (int, float)), f"Mu must be a number, but got {type(mu)}"
+        assert isinstance(
+            sigma, (int, float)
+        ), f"Sigma must be a number, but got {type(sigma)}"
+        assert sigma >= 0, f"Sigma must be a non-negative number, but got {sigma}"
+
+        self.mu = mu
+        self.sigma = sigma
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from a lognormal distribution.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        return rng.lognormal(mean=self.mu, sigma=self.sigma, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, mu, sigma):
+        return np.exp(mu + sigma * norm_ppf(u))
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        samples = rng.standard_normal((params["mu"].size, n))
+        samples *= params["sigma"][:, None]
+        samples += params["mu"][:, None]
+        return np.exp(samples, out=samples)
+
+
+class GammaStep(ProcessStep):
+    """
+    Represents a process step with a gamma distribution.
+
+    Attributes:
+        shape (float): Shape (k) of the distribution.
+        scale (float): Scale (theta) of the distribution.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        shape (float): Shape (k) of the distribution. Must be a positive number.
+        scale (float): Scale (theta) of the distribution. Must be a positive number.
+
+    """
+
+    __slots__ = ("shape", "scale")
+    param_names = __slots__
+    family = "gamma"
+    label = "Gamma"
+    schema = (
+        Param("shape", "Shape (k)", default=2.0, min_value=0.01),
+        Param("scale", "Scale (theta)", default=1.0, min_value=0.01),
+    )
+
+    def __init__(self, name: str, shape: float, scale: float):
+        super().__init__(name)
+        assert isinstance(
+            shape, (int, float)
+        ), f"Shape must be a number, but got {type(shape)}"
+        assert isinstance(
+            scale, (int, float)
+        ), f"Scale must be a number, but got {type(scale)}"
+        assert shape > 0, f"Shape must be a positive number, but got {shape}"
+        assert scale > 0, f"Scale must be a positive number, but got {scale}"
+
+        self.shape = shape
+        self.scale = scale
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from a gamma distribution.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        return rng.gamma(self.shape, self.scale, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, shape, scale):
+        return scale * gammaincinv(shape, u)
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        samples = rng.standard_gamma(params["shape"][:, None], size=(params["shape"].size, n))
+        samples *= params["scale"][:, None]
+        return samples
+
+
+class WeibullStep(ProcessStep):
+    """
+    Represents a process step with a Weibull distribution.
+
+    Attributes:
+        shape (float): Shape (k) of the distribution.
+        scale (float): Scale (lambda) of the distribution.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        shape (float): Shape (k) of the distribution. Must be a positive number.
+        scale (float): Scale (lambda) of the distribution. Must be a positive number.
+
+    """
+
+    __slots__ = ("shape", "scale")
+    param_names = __slots__
+    family = "weibull"
+    label = "Weibull"
+    schema = (
+        Param("shape", "Shape (k)", default=1.5, min_value=0.01),
+        Param("scale", "Scale (lambda)", default=1.0, min_value=0.01),
+    )
+
+    def __init__(self, name: str, shape: float, scale: float):
+        super().__init__(name)
+        assert isinstance(
+            shape, (int, float)
+        ), f"Shape must be a number, but got {type(shape)}"
+        assert isinstance(
+            scale, (int, float)
+        ), f"Scale must be a number, but got {type(scale)}"
+        assert shape > 0, f"Shape must be a positive number, but got {shape}"
+        assert scale > 0, f"Scale must be a positive number, but got {scale}"
+
+        self.shape = shape
+        self.scale = scale
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from a Weibull distribution.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        return self.scale * rng.weibull(self.shape, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, shape, scale):
+        return scale * (-np.log1p(-u)) ** (1 / shape)
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        samples = rng.weibull(params["shape"][:, None], size=(params["shape"].size, n))
+        samples *= params["scale"][:, None]
+        return samples
+
+
+def _check_range(low, mode, high):
+    assert isinstance(
+        low, (int, float)
+    ), f"Lower bound must be a number, but got {type(low)}"
+    assert isinstance(mode, (int, float)), f"Mode must be a number, but got {type(mode)}"
+    assert isinstance(
+        high, (int, float)
+    ), f"Upper bound must be a number, but got {type(high)}"
+    assert low <= mode <= high, "Mode must be between the lower and upper bound"
+    assert low < high, "Lower bound must be less than upper bound"
+
+
+class TriangularStep(ProcessStep):
+    """
+    Represents a process step with a triangular distribution.
+
+    Attributes:
+        low (float): Lower bound of the distribution.
+        mode (float): Most likely value.
+        high (float): Upper bound of the distribution.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        low (float): Lower bound of the distribution.
+        mode (float): Most likely value, between the bounds.
+        high (float): Upper bound of the distribution, greater than the lower bound.
+
+    """
+
+    __slots__ = ("low", "mode", "high")
+    param_names = __slots__
+    family = "triangular"
+    label = "Triangular"
+    schema = (
+        Param("low", "Lower Bound"),
+        Param("mode", "Most Likely", default=1.0),
+        Param("high", "Upper Bound", default=2.0),
+    )
+
+    def __init__(self, name: str, low: float, mode: float, high: float):
+        super().__init__(name)
+        _check_range(low, mode, high)
+
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from a triangular distribution.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        return rng.triangular(self.low, self.mode, self.high, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, low, mode, high):
+        width = high - low
+        below = np.sqrt(u * width * (mode - low))
+        above = np.sqrt((1 - u) * width * (high - mode))
+        return np.where(u * width < mode - low, low + below, high - above)
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        u = rng.random((params["low"].size, n))
+        return TriangularStep.inverse_cdf(
+            u, params["low"][:, None], params["mode"][:, None], params["high"][:, None]
+        )
+
+
+class PertStep(ProcessStep):
+    """
+    Represents a process step with a (Beta-)PERT distribution.
+
+    A beta distribution on [low, high] with the given mode, a smoother
+    alternative to the triangular distribution for three-point estimates.
+
+    Attributes:
+        low (float): Optimistic duration.
+        mode (float): Most likely duration.
+        high (float): Pessimistic duration.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        low (float): Optimistic duration.
+        mode (float): Most likely duration, between the bounds.
+        high (float): Pessimistic duration, greater than the optimistic one.
+
+    """
+
+    __slots__ = ("low", "mode", "high")
+    param_names = __slots__
+    family = "pert"
+    label = "PERT"
+    schema = (
+        Param("low", "Optimistic"),
+        Param("mode", "Most Likely", default=1.0),
+        Param("high", "Pessimistic", default=2.0),
+    )
+
+    def __init__(self, name: str, low: float, mode: float, high: float):
+        super().__init__(name)
+        _check_range(low, mode, high)
+
+        self.low = low
+        self.mode = mode
+        self.high = high
+
+    @staticmethod
+    def shape_params(low, mode, high):
+        """Alpha and beta of the underlying beta distribution."""
+        width = high - low
+        return 1 + 4 * (mode - low) / width, 1 + 4 * (high - mode) / width
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from a PERT distribution.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        alpha, beta = self.shape_params(self.low, self.mode, self.high)
+        return self.low + (self.high - self.low) * rng.beta(alpha, beta, size=n_simulations)
+
+    @staticmethod
+    def inverse_cdf(u, low, mode, high):
+        alpha, beta = PertStep.shape_params(low, mode, high)
+        return low + (high - low) * betaincinv(alpha, beta, u)
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        low, mode, high = (params[key][:, None] for key in ("low", "mode", "high"))
+        alpha, beta = PertStep.shape_params(low, mode, high)
+        samples = rng.beta(alpha, beta, size=(low.size, n))
+        samples *= high - low
+        samples += low
+        return samples
+
+
+def _number_tuple(values, label: str) -> tuple:
+    # Sequences are stored as tuples of floats, so steps stay hashable and picklable
+    values = np.asarray(values)
+    assert values.ndim == 1 and values.size > 0, f"{label} must be a non-empty list of numbers"
+    assert np.issubdtype(
+        values.dtype, np.number
+    ), f"{label} must be numbers, but got {values.dtype}"
+    assert np.all(np.isfinite(values)), f"{label} must be finite"
+    return tuple(values.astype(np.float64).tolist())
+
+
+class EmpiricalStep(ProcessStep):
+    """
+    Represents a process step that resamples observed durations.
+
+    Attributes:
+        values (tuple[float]): Observed durations.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        values (list[float]): Observed durations, at least one.
+
+    """
+
+    __slots__ = ("values",)
+    param_names = __slots__
+    family = "empirical"
+    label = "Empirical"
+    schema = (Param("values", "Observed Values", default=(1.0, 2.0, 3.0), kind="list"),)
+
+    def __init__(self, name: str, values):
+        super().__init__(name)
+        self.values = _number_tuple(values, "Values")
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from the observed values with replacement.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        values = np.asarray(self.values)
+        return values[rng.integers(values.size, size=n_simulations)]
+
+    @staticmethod
+    def inverse_cdf(u, values):
+        ordered = np.sort(np.asarray(values, dtype=np.float64))
+        index = np.ceil(np.asarray(u) * ordered.size).astype(np.intp) - 1
+        return ordered[np.clip(index, 0, ordered.size - 1)]
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        # Tables of different lengths arrive as rows padded with NaN
+        values = params["values"]
+        sizes = np.count_nonzero(~np.isnan(values), axis=1)
+        index = rng.random((values.shape[0], n))
+        index *= sizes[:, None]
+        return np.take_along_axis(values, index.astype(np.intp), axis=1)
+
+
+class DiscreteStep(ProcessStep):
+    """
+    Represents a process step that takes one of a few durations with given probabilities.
+
+    Attributes:
+        values (tuple[float]): Possible durations.
+        probabilities (tuple[float]): Probability of each duration.
+
+    Inheritance:
+        ProcessStep: Base class
+
+    Args:
+        name (str): Name of the process step.
+        values (list[float]): Possible durations.
+        probabilities (list[float]): Probability of each duration, non-negative and summing to 1.
+
+    """
+
+    __slots__ = ("values", "probabilities")
+    param_names = __slots__
+    family = "discrete"
+    label = "Discrete"
+    schema = (
+        Param("values", "Values", default=(1.0, 2.0), kind="list"),
+        Param("probabilities", "Probabilities", default=(0.5, 0.5), kind="list"),
+    )
+
+    def __init__(self, name: str, values, probabilities):
+        super().__init__(name)
+        values = _number_tuple(values, "Values")
+        probabilities = _number_tuple(probabilities, "Probabilities")
+        assert len(values) == len(
+            probabilities
+        ), f"Got {len(values)} values but {len(probabilities)} probabilities"
+        assert min(probabilities) >= 0, "Probabilities must be non-negative"
+        assert np.isclose(
+            sum(probabilities), 1
+        ), f"Probabilities must sum to 1, but sum to {sum(probabilities)}"
+
+        self.values = values
+        self.probabilities = probabilities
+
+    def simulate(self, n_simulations: int, rng=None) -> np.ndarray:
+        """
+        Draws n samples from the discrete distribution.
+
+        Args:
+            n_simulations (int): number of samples to draw.
+            rng (None, int or np.random.Generator): random number generator or seed.
+                By default fresh OS entropy.
+
+        Returns:
+            samples (np.ndarray): An array of drawn samples.
+
+        """
+        rng = np.random.default_rng(rng)
+        return self.inverse_cdf(rng.random(n_simulations), self.values, self.probabilities)
+
+    @staticmethod
+    def inverse_cdf(u, values, probabilities):
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        cdf = np.cumsum(np.asarray(probabilities, dtype=np.float64)[order])
+        cdf /= cdf[-1]
+        index = np.searchsorted(cdf, u, side="left")
+        return values[order][np.minimum(index, values.size - 1)]
+
+    @staticmethod
+    def sample_batch(rng, params, n):
+        # NaN padded values sort last, padded probabilities count as zero
+        order = np.argsort(params["values"], axis=1, kind="stable")
+        values = np.take_along_axis(params["values"], order, axis=1)
+        cdf = np.cumsum(np.nan_to_num(np.take_along_axis(params["probabilities"], order, axis=1)), axis=1)
+        cdf /= cdf[:, -1:]
+        # Shifting row i into [i, i + 1] turns the per-step searches into one
+        n_steps, width = values.shape
+        rows = np.arange(n_steps)[:, None]
+        u = 1.0 - rng.random((n_steps, n))
+        index = np.searchsorted((cdf + rows).ravel(), (u + rows).ravel(), side="left")
+        index = index.reshape(n_steps, n) - rows * width
+        sizes = np.count_nonzero(~np.isnan(values), axis=1)
+        return np.take_along_axis(values, np.clip(index, 0, sizes[:, None] - 1), axis=1)
+
+
+# Step types by the name shown in the app, in the order they are offered
+STEP_TYPES = {}
+
+
+def register_step(step_type: type) -> type:
+    """
+    Makes a step type available in the app, usable as a class decorator.
+
+    The engine only uses ``simulate``, ``inverse_cdf`` and, if present,
+    ``sample_batch`` of a step, so a new family needs no other changes.
+
+    Args:
+        step_type (type): ProcessStep subclass with a label and a parameter schema.
+
+    Returns:
+        type: The registered step type.
+
+    Raises:
+        TypeError: If step_type is not a ProcessStep subclass.
+        ValueError: If it has no label or its schema does not match its parameters.
+
+    """
+    if not (isinstance(step_type, type) and issubclass(step_type, ProcessStep)):
+        raise TypeError(f"Expected a ProcessStep subclass, but got {step_type}")
+    if not step_type.label:
+        raise ValueError(f"{step_type.__name__} has no label")
+    if tuple(param.name for param in step_type.schema) != tuple(step_type.param_names):
+        raise ValueError(f"Schema of {step_type.__name__} does not match its parameters")
+
+    STEP_TYPES[step_type.label] = step_type
+    return step_type
+
+
+for _step_type in (
+    ExponentialStep,
+    NormalStep,
+    UniformStep,
+    LognormalStep,
+    GammaStep,
+    WeibullStep,
+    TriangularStep,
+    PertStep,
+    EmpiricalStep,
+    DiscreteStep,
+):
+    register_step(_step_type)
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import serialization
+from results import SimulationResult
+
+
+def process_fingerprint(steps, correlations: dict = None) -> str:
+    """
+    Stable hash of the ordered step definitions and their correlations.
+
+    Two processes with the same step types, names and parameters in the same
+    order, and the same correlations, get the same fingerprint, across sessions
+    and servers.
+
+    Args:
+        steps (list[ProcessStep] or None): Steps in process order.
+        correlations (dict or None): (name, name) to correlation. By default none
+
+    Returns:
+        str: Hex digest.
+
+    """
+    definition = [
+        [type(step).__name__, step.name, _normalize(step.get_params())]
+        for step in steps or []
+    ]
+    pairs = sorted([*pair, float(rho)] for pair, rho in (correlations or {}).items() if rho != 0)
+    if pairs:
+        # Left out without correlations, so fingerprints of independent steps stay the same
+        definition = {"steps": definition, "correlations": pairs}
+    payload = json.dumps(definition, separators=(",", ":"), sort_keys=True)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def cache_key(steps, n_simulations: int, seed: int, correlations: dict = None, **options) -> str:
+    """
+    Content-addressed key of a simulation result.
+
+    Args:
+        steps (list[ProcessStep] or None): Steps in process order.
+        n_simulations (int): Number of samples.
+        seed (int): Seed of the run. Unseeded runs are not reproducible and cannot be cached.
+        correlations (dict or None): (name, name) to correlation. By default none
+        **options: Other settings that change the result, e.g. the simulation method.
+
+    Returns:
+        str: Hex digest.
+
+    """
+    if seed is None:
+        raise ValueError("Unseeded simulations cannot be cached")
+
+    payload = json.dumps(
+        {
+            "process": process_fingerprint(steps, correlations),
+            "n_simulations": int(n_simulations),
+            "seed": int(seed),
+            "options": _normalize(options),
+        },
+        separators=(",", ":"),
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _normalize(value):
+    # 4 and 4.0 draw the same samples, so they must hash the same
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return repr(value)
+
+
+def sizeof(value) -> int:
+    """
+    Approximate memory footprint of a cached value in bytes.
+
+    Args:
+        value: Cached value.
+
+    Returns:
+        int: Size in bytes.
+
+    """
+    # A DataFrame can only exist once pandas is imported, so this never imports it
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache of simulation results with a byte budget.
+
+    Entries live in memory and, if a directory is given, are also written to
+    disk so they survive restarts and can be shared between server processes.
+    Cached values are shared, callers must not modify them.
+
+    The disk tier only holds data: simulation results, arrays and bytes are
+    stored in the format of ``Process.save`` and memory-mapped when read, other
+    values stay in memory. Nothing read from the directory is executed, but the
+    directory should still only be writable by the server, since anyone who can
+    write there can change the cached results.
+
+    Args:
+        max_bytes (int): Memory budget. By default 512 MiB
+        directory (str or None): Directory for the disk tier. By default memory only
+        max_disk_bytes (int): Disk budget. By default 4 GiB
+
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 512 * 2**20,
+        directory: str = None,
+        max_disk_bytes: int = 4 * 2**30,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()  # key -> (value, size), least recently used first
+        self._lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries or (
+            self.directory is not None and os.path.exists(self._path(key))
+        )
+
+    def get(self, key: str, default=None):
+        """
+        Returns a cached value and marks it as recently used.
+
+        Args:
+            key (str): Cache key.
+            default: Returned when the key is not cached. By default None
+
+        Returns:
+            The cached value or ``default``.
+
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        value = self._read(key)
+        if value is None:
+            with self._lock:
+                self.misses += 1
+            return default
+
+        with self._lock:
+            self.hits += 1
+        self._insert(key, value)
+        return value
+
+    def put(self, key: str, value) -> None:
+        """
+        Stores a value, evicting least recently used entries beyond the budgets.
+
+        Values larger than the memory budget are only written to disk.
+
+        Args:
+            key (str): Cache key.
+            value: Value to store.
+
+        """
+        self._insert(key, value)
+        self._write(key, value)
+
+    def get_or_compute(self, key: str, compute):
+        """
+        Returns a cached value, computing and storing it on a miss.
+
+        Args:
+            key (str): Cache key.
+            compute (callable): Called without arguments to produce the value.
+
+        Returns:
+            The cached or computed value.
+
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drops all in-memory entries. The disk tier is left untouched."""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def _insert(self, key, value):
+        size = sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.nbytes -= evicted
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}{serialization.EXTENSION}")
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        try:
+            header, arrays = serialization.read(self._path(key))
+            value = _from_arrays(header, arrays)
+            os.utime(self._path(key))  # Recently used entries survive disk eviction
+        except (AssertionError, FileNotFoundError, KeyError, TypeError, ValueError):
+            return None
+
+        return value
+
+    def _write(self, key, value):
+        if self.directory is None:
+            return
+        stored = _to_arrays(value)
+        if stored is None:
+            return
+
+        # Write to a temporary file first so readers never see partial entries
+        temporary = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        serialization.write(temporary, *stored)
+        os.replace(temporary, self._path(key))
+        self._evict_disk()
+
+    def _evict_disk(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(serialization.EXTENSION):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        used = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if used <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            used -= size
+
+
+def _to_arrays(value):
+    # Header and arrays of a value the disk tier can hold, None for any other value
+    if isinstance(value, SimulationResult):
+        return {"kind": "result", "names": value.names}, {"data": value.data}
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return {"kind": "array"}, {"data": value}
+    if isinstance(value, bytes):
+        return {"kind": "bytes"}, {"data": np.frombuffer(value, dtype=np.uint8)}
+    return None
+
+
+def _from_arrays(header, arrays):
+    kind = header["kind"]
+    if kind == "result":
+        return SimulationResult(header["names"], arrays["data"])
+    if kind == "array":
+        return arrays["data"]
+    if kind == "bytes":
+        return arrays["data"].tobytes()
+    raise ValueError(f"Unknown cache entry {kind}")
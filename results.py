@@ -0,0 +1,224 @@
+import os
+import tempfile
+import uuid
+import weakref
+from typing import TYPE_CHECKING
+import numpy as np
+from summary_stats import DEFAULT_QUANTILES, summarize
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+STORAGES = ("memory", "mmap")
+
+
+class SimulationResult:
+    """
+    Compact columnar container of simulation samples.
+
+    Step samples are stored as rows of one (n_steps, n_simulations) block in the
+    chosen dtype, either on the heap or in a memory-mapped ``.npy`` file. "Total"
+    is not stored, it is computed on first access. A DataFrame is only built
+    when ``to_frame`` is called.
+
+    Attributes:
+        names (list[str]): Step names in process order.
+        data (np.ndarray): Samples with shape (n_steps, n_simulations).
+        path (str or None): Backing file of memory-mapped results.
+        id (str): Unique identifier of the result, for caches keyed on results.
+
+    Args:
+        names (list[str]): Step names in process order.
+        data (np.ndarray): Samples with shape (n_steps, n_simulations).
+        path (str or None): Backing file, if ``data`` is memory-mapped.
+
+    """
+
+    def __init__(self, names: list[str], data: np.ndarray, path: str = None):
+        assert data.ndim == 2 and data.shape[0] == len(names), (
+            f"Expected data with {len(names)} rows, but got shape {data.shape}"
+        )
+
+        self.names = list(names)
+        self.data = data
+        self.path = path
+        self.id = uuid.uuid4().hex
+        self._total = None
+        self._summaries = {}
+
+    @classmethod
+    def allocate(
+        cls,
+        names: list[str],
+        n_simulations: int,
+        dtype=np.float64,
+        storage: str = "memory",
+        path: str = None,
+    ) -> "SimulationResult":
+        """
+        Creates an empty result to be filled row by row.
+
+        Args:
+            names (list[str]): Step names in process order.
+            n_simulations (int): Number of samples per step.
+            dtype (np.dtype): Storage dtype, e.g. np.float32. By default np.float64
+            storage (str): "memory" or "mmap". By default "memory"
+            path (str or None): File for "mmap" storage. By default a temporary file
+                that is deleted together with the result.
+
+        Returns:
+            SimulationResult: Result with uninitialized samples.
+
+        """
+        if storage not in STORAGES:
+            raise ValueError(f"Unknown storage {storage}, expected one of {STORAGES}")
+
+        shape = (len(names), n_simulations)
+        if storage == "memory":
+            return cls(names, np.empty(shape, dtype=dtype))
+
+        temporary = path is None
+        if temporary:
+            handle, path = tempfile.mkstemp(suffix=".npy", prefix="mc-simulation-")
+            os.close(handle)
+
+        data = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+        result = cls(names, data, path=path)
+        if temporary:
+            weakref.finalize(result, _remove, path)
+        return result
+
+    @classmethod
+    def from_columns(
+        cls, columns: dict, dtype=np.float64, storage: str = "memory", path: str = None
+    ) -> "SimulationResult":
+        """
+        Packs per-step sample arrays into a result. A "Total" column is ignored.
+
+        Args:
+            columns (dict or pd.DataFrame): Step name to samples.
+            dtype (np.dtype): Storage dtype. By default np.float64
+            storage (str): "memory" or "mmap". By default "memory"
+            path (str or None): File for "mmap" storage.
+
+        Returns:
+            SimulationResult: Packed result.
+
+        """
+        names = [name for name in columns if name != "Total"]
+        n_simulations = len(columns[next(iter(columns))]) if len(columns) else 0
+
+        result = cls.allocate(names, n_simulations, dtype=dtype, storage=storage, path=path)
+        for row, name in zip(result.data, names):
+            row[:] = columns[name]
+        return result
+
+    @classmethod
+    def open(cls, path: str, names: list[str]) -> "SimulationResult":
+        """
+        Opens a result stored in a ``.npy`` file without reading it into memory.
+
+        Args:
+            path (str): Path of the ``.npy`` file.
+            names (list[str]): Step names of the rows.
+
+        Returns:
+            SimulationResult: Memory-mapped result.
+
+        """
+        return cls(names, np.load(path, mmap_mode="r"), path=path)
+
+    @property
+    def n_simulations(self) -> int:
+        """Number of samples per step."""
+        return self.data.shape[1]
+
+    @property
+    def columns(self) -> list[str]:
+        """Column names as in ``to_frame``, steps followed by "Total"."""
+        return [*self.names, "Total"]
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the DataFrame ``to_frame`` would return."""
+        return (self.n_simulations, len(self.names) + 1)
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Storage dtype of the samples."""
+        return self.data.dtype
+
+    @property
+    def total(self) -> np.ndarray:
+        """Total time per sample, summed in float64 on first access."""
+        if self._total is None:
+            total = self.data.sum(axis=0, dtype=np.float64)
+            self._total = total.astype(self.dtype, copy=False)
+        return self._total
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held on the heap, memory-mapped samples excluded."""
+        total = 0 if self._total is None else self._total.nbytes
+        if isinstance(self.data, np.memmap):
+            return total
+        return self.data.nbytes + total
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name == "Total":
+            return self.total
+        return self.data[self.names.index(name)]
+
+    def __len__(self) -> int:
+        return self.n_simulations
+
+    def to_frame(self) -> "pd.DataFrame":
+        """
+        Converts the result into a DataFrame with a column per step and "Total".
+
+        Returns:
+            pd.DataFrame: Simulation results.
+
+        """
+        import pandas as pd
+
+        frame = pd.DataFrame(dict(zip(self.names, self.data)))
+        frame["Total"] = self.total
+        return frame
+
+    def describe(self) -> "pd.DataFrame":
+        """Same as ``to_frame().describe()``."""
+        return self.to_frame().describe()
+
+    def summary(self, quantiles=DEFAULT_QUANTILES) -> "pd.DataFrame":
+        """
+        Count, mean, std, min, quantiles and max per column, computed once per result.
+
+        Uses one partition pass per column instead of sorting, and caches the table
+        per set of quantiles, so reruns of the app do not recompute it.
+
+        Args:
+            quantiles (tuple[float]): Quantiles between 0 and 1. By default P50, P90, P95 and P99
+
+        Returns:
+            pd.DataFrame: Statistics as rows, columns as in ``to_frame``.
+
+        """
+        key = tuple(quantiles)
+        if key not in self._summaries:
+            self._summaries[key] = summarize(self, key)
+        return self._summaries[key]
+
+    def __getstate__(self):
+        # Memory-mapped data is pickled by value, the temporary file is not shared
+        state = self.__dict__.copy()
+        state["data"] = np.asarray(self.data)
+        state["path"] = None
+        return state
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
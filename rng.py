@@ -0,0 +1,107 @@
+import hashlib
+import numpy as np
+
+BIT_GENERATORS = {
+    "PCG64": np.random.PCG64,
+    "PCG64DXSM": np.random.PCG64DXSM,
+    "SFC64": np.random.SFC64,
+    "Philox": np.random.Philox,
+    "MT19937": np.random.MT19937,
+}
+
+
+def seed_sequence(seed=None) -> np.random.SeedSequence:
+    """
+    Turns a seed into the root SeedSequence of a simulation.
+
+    Args:
+        seed (None, int, SeedSequence or Generator): Seed of the run. ``None`` draws fresh entropy
+            from the OS, a Generator is advanced so that repeated calls give new streams.
+
+    Returns:
+        np.random.SeedSequence: Root seed sequence.
+
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    if isinstance(seed, np.random.Generator):
+        return np.random.SeedSequence(seed.integers(2**63, size=4).tolist())
+    return np.random.SeedSequence(seed)
+
+
+def name_key(name: str) -> int:
+    """
+    Stable 64-bit key of a step name, used as a spawn key.
+
+    Args:
+        name (str): Step name.
+
+    Returns:
+        int: Key derived from the name.
+
+    """
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), "little")
+
+
+def child_sequence(root: np.random.SeedSequence, *keys: int) -> np.random.SeedSequence:
+    """
+    Derives an independent child of a SeedSequence from integer keys.
+
+    Unlike ``SeedSequence.spawn`` the child depends on the keys only, not on how
+    many children were spawned before it.
+
+    Args:
+        root (np.random.SeedSequence): Parent sequence.
+        *keys (int): Keys appended to the parent's spawn key.
+
+    Returns:
+        np.random.SeedSequence: Child sequence.
+
+    """
+    return np.random.SeedSequence(
+        entropy=root.entropy,
+        spawn_key=(*root.spawn_key, *keys),
+        pool_size=root.pool_size,
+    )
+
+
+def make_generator(seq: np.random.SeedSequence, bit_generator: str = "PCG64") -> np.random.Generator:
+    """
+    Creates a Generator for a SeedSequence.
+
+    Args:
+        seq (np.random.SeedSequence): Seed sequence of the stream.
+        bit_generator (str): Name of the bit generator, see BIT_GENERATORS. By default "PCG64"
+
+    Returns:
+        np.random.Generator: Random number generator.
+
+    """
+    if bit_generator not in BIT_GENERATORS:
+        raise ValueError(
+            f"Unknown bit generator {bit_generator}, expected one of {list(BIT_GENERATORS)}"
+        )
+    return np.random.Generator(BIT_GENERATORS[bit_generator](seq))
+
+
+def step_generators(names: list[str], seed=None, bit_generator: str = "PCG64") -> dict:
+    """
+    Creates one independent Generator per step.
+
+    Streams are keyed on the step name, so adding, removing or reordering
+    steps does not change the draws of the other steps.
+
+    Args:
+        names (list[str]): Step names.
+        seed (None, int, SeedSequence or Generator): Seed of the run.
+        bit_generator (str): Name of the bit generator. By default "PCG64"
+
+    Returns:
+        dict: Step name to np.random.Generator.
+
+    """
+    root = seed_sequence(seed)
+    return {
+        name: make_generator(child_sequence(root, name_key(name)), bit_generator)
+        for name in names
+    }
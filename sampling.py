@@ -0,0 +1,135 @@
+import numpy as np
+import instrumentation
+from process_steps import require_inverse_cdf
+from rng import child_sequence, make_generator, name_key, seed_sequence
+
+SAMPLING_METHODS = ("random", "antithetic", "lhs", "halton", "sobol")
+
+# Keeps uniforms strictly inside (0, 1), so inverse CDFs stay finite
+_EPS = 2.0**-53
+
+
+def _primes(count):
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def _antithetic(rng, n_dims, n):
+    half = rng.random((n_dims, (n + 1) // 2))
+    return np.concatenate((half, 1 - half), axis=1)[:, :n]
+
+
+def _latin_hypercube(rng, n_dims, n):
+    strata = rng.permuted(np.tile(np.arange(n), (n_dims, 1)), axis=1)
+    return (strata + rng.random((n_dims, n))) / n
+
+
+def _halton(rng, n_dims, n):
+    # Halton sequence with an independent random permutation of the digits at
+    # every position (random digit scrambling), jittered inside the last digit
+    index = np.arange(n)
+    points = np.empty((n_dims, n))
+
+    for dim, base in enumerate(_primes(n_dims)):
+        n_digits = int(np.ceil(np.log(n + 1) / np.log(base))) + 1
+        value = np.zeros(n)
+        remaining = index.copy()
+        scale = 1.0
+        for _ in range(n_digits):
+            scale /= base
+            value += rng.permutation(base)[remaining % base] * scale
+            remaining //= base
+        points[dim] = value + rng.random(n) * scale
+
+    return points
+
+
+def _sobol(rng, n_dims, n):
+    try:
+        from scipy.stats import qmc
+    except ImportError as e:
+        raise ImportError("Sobol sampling requires the scipy package, use 'halton' instead") from e
+
+    return qmc.Sobol(n_dims, scramble=True, seed=rng).random(n).T
+
+
+_DESIGNS = {
+    "random": lambda rng, n_dims, n: rng.random((n_dims, n)),
+    "antithetic": _antithetic,
+    "lhs": _latin_hypercube,
+    "halton": _halton,
+    "sobol": _sobol,
+}
+
+
+def uniforms(method: str, n_dims: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws a uniform design on the unit hypercube.
+
+    Args:
+        method (str): One of SAMPLING_METHODS.
+            "random": independent pseudo-random uniforms.
+            "antithetic": pairs of u and 1 - u.
+            "lhs": Latin hypercube, one point per stratum and dimension.
+            "halton": randomly digit-scrambled Halton quasi-Monte Carlo.
+            "sobol": scrambled Sobol quasi-Monte Carlo (needs scipy).
+        n_dims (int): Number of dimensions, one per step.
+        n (int): Number of points.
+        rng (np.random.Generator): Random number generator for the randomization.
+
+    Returns:
+        np.ndarray: Uniforms in (0, 1) with shape (n_dims, n).
+
+    """
+    if method not in _DESIGNS:
+        raise ValueError(f"Unknown sampling method {method}, expected one of {SAMPLING_METHODS}")
+
+    return np.clip(_DESIGNS[method](rng, n_dims, n), _EPS, 1 - _EPS)
+
+
+def simulate_sampled(
+    steps, n_simulations: int, method: str, seed=None, bit_generator: str = "PCG64"
+) -> dict:
+    """
+    Simulates steps by mapping a uniform design through each step's inverse CDF.
+
+    Every step is one dimension of the design, so stratification and low
+    discrepancy carry over to the total.
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        n_simulations (int): Number of samples.
+        method (str): One of SAMPLING_METHODS.
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+
+    Returns:
+        dict: Step name to samples, plus "Total".
+
+    Raises:
+        TypeError: If a step has no inverse CDF.
+
+    """
+    require_inverse_cdf(steps, f"Sampling method {method}")
+
+    root = seed_sequence(seed)
+    rng = make_generator(child_sequence(root, name_key(method)), bit_generator)
+    with instrumentation.stage(f"design:{method}", samples=n_simulations):
+        design = uniforms(method, len(steps), n_simulations, rng)
+
+    results = {}
+    total_time = np.zeros(n_simulations)
+    for step, u in zip(steps, design):
+        with instrumentation.stage(f"draw:{step.name}", samples=n_simulations):
+            step_time = step.ppf(u)
+        results[step.name] = step_time
+        with instrumentation.stage("accumulate", samples=n_simulations):
+            total_time += step_time
+
+    results["Total"] = total_time
+    return results
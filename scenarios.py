@@ -0,0 +1,159 @@
+import json
+import os
+import re
+import time
+from export import WRITERS
+from process import Process
+from results import SimulationResult
+from summary_stats import DEFAULT_QUANTILES
+
+# Settings a scenario inherits from the defaults of its file
+SCENARIO_SETTINGS = ("n_simulations", "seed", "sampling", "bit_generator")
+
+DEFAULTS = {"n_simulations": 10_000, "seed": None, "sampling": "random", "bit_generator": "PCG64"}
+
+
+def load_scenarios(path: str) -> list[dict]:
+    """
+    Reads scenarios from a JSON or YAML file.
+
+    The file holds a list of scenarios, a single scenario, or a mapping with
+    "scenarios" and optional "defaults" that every scenario inherits::
+
+        {
+          "defaults": {"n_simulations": 100000, "seed": 1},
+          "scenarios": [
+            {
+              "name": "baseline",
+              "steps": [
+                {"name": "build", "type": "Normal", "mean": 10, "stdev": 2},
+                {"name": "review", "type": "PERT", "low": 1, "mode": 2, "high": 6}
+              ],
+              "correlations": [["build", "review", 0.5]],
+              "sampling": "lhs"
+            }
+          ]
+        }
+
+    YAML files need the optional PyYAML package.
+
+    Args:
+        path (str): Scenario file, .json, .yaml or .yml.
+
+    Returns:
+        list[dict]: Scenarios with defaults applied and a name each.
+
+    Raises:
+        ValueError: If the format or layout is unknown.
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in (".json", ".yaml", ".yml"):
+        raise ValueError(f"Unknown scenario file format {extension}, expected .json or .yaml")
+
+    with open(path, encoding="utf-8") as file:
+        if extension == ".json":
+            content = json.load(file)
+        else:
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML scenario files require the PyYAML package") from e
+            content = yaml.safe_load(file)
+
+    defaults = {}
+    if isinstance(content, dict) and "scenarios" in content:
+        defaults = content.get("defaults") or {}
+        content = content["scenarios"]
+    if isinstance(content, dict):
+        content = [content]
+    if not isinstance(content, list) or not all(isinstance(spec, dict) for spec in content):
+        raise ValueError(f"{path} must hold a scenario, a list of scenarios or a 'scenarios' list")
+
+    base = os.path.splitext(os.path.basename(path))[0]
+    return [
+        {"name": f"{base}-{i}", **defaults, **spec}
+        for i, spec in enumerate(content)
+    ]
+
+
+def build_process(spec: dict) -> Process:
+    """
+    Builds the Process of a scenario.
+
+    Args:
+        spec (dict): Scenario with "steps", a list of dicts with "name", "type" and the
+            parameters of the type, and optional "correlations" as [step, step, rho].
+
+    Returns:
+        Process: Process with the steps and correlations.
+
+    Raises:
+        ValueError: If a step type is unknown or its parameters are invalid.
+
+    """
+    return Process.from_dict(spec)
+
+
+def sample_file_name(index: int, spec: dict, fmt: str) -> str:
+    """File name of the samples of a scenario, unique per position in the batch."""
+    name = re.sub(r"[^\w.-]+", "_", str(spec.get("name", "scenario")))
+    return f"{index:05d}-{name}.{fmt}"
+
+
+def run_scenario(
+    spec: dict,
+    quantiles=DEFAULT_QUANTILES,
+    index: int = 0,
+    samples_dir: str = None,
+    samples_format: str = "npz",
+) -> dict:
+    """
+    Simulates one scenario and summarizes every step and the total.
+
+    Args:
+        spec (dict): Scenario, see ``load_scenarios``.
+        quantiles (tuple[float]): Quantiles in the summary. By default P50, P90, P95 and P99
+        index (int): Position of the scenario in the batch. By default 0
+        samples_dir (str or None): Directory to write the samples to. By default none are written
+        samples_format (str): One of export.WRITERS. By default "npz"
+
+    Returns:
+        dict: Scenario name, index, settings, run time and summary as column to statistic to value.
+
+    """
+    settings = {key: spec.get(key, DEFAULTS[key]) for key in SCENARIO_SETTINGS}
+    start = time.perf_counter()
+
+    process = build_process(spec)
+    if settings["sampling"] == "random":
+        result = process.simulate_result(
+            settings["n_simulations"], seed=settings["seed"], bit_generator=settings["bit_generator"]
+        )
+    else:
+        # Other sampling methods are only available as a DataFrame
+        frame = process.simulate_process(
+            settings["n_simulations"],
+            seed=settings["seed"],
+            bit_generator=settings["bit_generator"],
+            sampling=settings["sampling"],
+        )
+        result = SimulationResult.from_columns(frame)
+
+    record = {
+        "scenario": spec.get("name"),
+        "index": index,
+        **settings,
+        "summary": result.summary(tuple(quantiles)).to_dict(),
+    }
+
+    if samples_dir is not None:
+        if samples_format not in WRITERS:
+            raise ValueError(f"Unknown sample format {samples_format}, expected one of {list(WRITERS)}")
+        path = os.path.join(samples_dir, sample_file_name(index, spec, samples_format))
+        with open(path, "wb") as file:
+            WRITERS[samples_format](result, file)
+        record["samples"] = path
+
+    record["seconds"] = time.perf_counter() - start
+    return record
@@ -0,0 +1,274 @@
+import io
+import json
+import os
+import struct
+import numpy as np
+from empirical import DurationLogStep, cache_dir
+from process_steps import STEP_TYPES
+
+# File layout: MAGIC, header length as uint64, JSON header, then raw arrays.
+# Arrays start at multiples of _ALIGNMENT, so they can be mapped or viewed in place.
+MAGIC = b"MCSIM\x00\x01\x00"
+FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sQ")
+_ALIGNMENT = 64
+
+# File extension of saved processes
+EXTENSION = ".mcsim"
+
+# Largest quantile table of a duration log that an untrusted definition may ask for
+MAX_UPLOADED_TABLE_POINTS = 2**16
+
+
+def step_types() -> dict:
+    """
+    Step types by family and by lower-case app label, e.g. "pert" and "duration log".
+
+    Returns:
+        dict: Name to ProcessStep subclass.
+
+    """
+    types = {}
+    for step_type in [*STEP_TYPES.values(), DurationLogStep]:
+        types[step_type.family] = step_type
+        if step_type.label:
+            types[step_type.label.lower()] = step_type
+    types["duration log"] = DurationLogStep
+    return types
+
+
+def check_definition(definition) -> None:
+    """
+    Checks the structure of a process definition, see ``Process.to_dict``.
+
+    Step parameters are checked by the steps themselves.
+
+    Args:
+        definition (dict): "steps" and optional "correlations" and "seed".
+
+    Raises:
+        ValueError: If a part of the definition has the wrong type or shape.
+
+    """
+    if not isinstance(definition, dict):
+        raise ValueError(f"A process definition must be a dict, but got {type(definition).__name__}")
+
+    steps = definition.get("steps") or []
+    if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+        raise ValueError("Steps must be a list of step definitions")
+
+    correlations = definition.get("correlations") or []
+    if not isinstance(correlations, list) or not all(
+        isinstance(pair, list)
+        and len(pair) == 3
+        and isinstance(pair[0], str)
+        and isinstance(pair[1], str)
+        and isinstance(pair[2], (int, float))
+        and not isinstance(pair[2], bool)
+        for pair in correlations
+    ):
+        raise ValueError("Correlations must be a list of [step, step, correlation]")
+
+    seed = definition.get("seed")
+    if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+        raise ValueError(f"Seed must be an integer, but got {seed!r}")
+
+
+def step_to_dict(step) -> dict:
+    """
+    Plain definition of a step: name, type (its family) and parameters.
+
+    Args:
+        step (ProcessStep): Step with a registered family.
+
+    Returns:
+        dict: JSON-serializable definition.
+
+    Raises:
+        ValueError: If the step type is not registered.
+
+    """
+    if step_types().get(step.family) is not type(step):
+        raise ValueError(f"Step {step.name} of type {type(step).__name__} cannot be serialized")
+
+    params = {
+        key: list(value) if isinstance(value, tuple) else _python_scalar(value)
+        for key, value in step.get_params().items()
+    }
+    return {"name": step.name, "type": step.family, **params}
+
+
+def step_from_dict(definition: dict, trusted: bool = True):
+    """
+    Builds a step from its definition.
+
+    Args:
+        definition (dict): "name", "type" (family or app label) and the parameters.
+        trusted (bool): Whether the definition may refer to any file of the server.
+            Untrusted definitions, e.g. uploads, may only use duration logs stored
+            in ``cache_dir()`` with their digest, and quantile tables of at most
+            MAX_UPLOADED_TABLE_POINTS. By default True
+
+    Returns:
+        ProcessStep: The step.
+
+    Raises:
+        ValueError: If the type is unknown, the parameters are invalid or an
+            untrusted step refers to another file.
+
+    """
+    if not isinstance(definition, dict):
+        raise ValueError(f"A step definition must be a dict, but got {type(definition).__name__}")
+    params = dict(definition)
+    name = params.pop("name", None)
+    type_name = str(params.pop("type", "")).lower()
+
+    types = step_types()
+    if type_name not in types:
+        raise ValueError(f"Step {name} has unknown type {type_name!r}, expected one of {sorted(types)}")
+    if not trusted and types[type_name] is DurationLogStep:
+        _check_uploaded_log(name, params)
+    try:
+        return types[type_name](name, **params)
+    except (AssertionError, TypeError) as e:
+        raise ValueError(f"Invalid step {name}: {e}") from e
+
+
+def _check_uploaded_log(name, params):
+    # Logs uploaded through the app are stored in the cache under their content hash
+    path = params.get("path")
+    directory = os.path.realpath(cache_dir())
+    if not isinstance(path, str) or os.path.commonpath([os.path.realpath(path), directory]) != directory:
+        raise ValueError(f"Step {name} may only use duration logs uploaded to this server")
+    if not params.get("digest"):
+        raise ValueError(f"Step {name} must give the digest of its duration log")
+
+    # Quantile tables are allocated in full, so their size is bounded
+    max_points = params.get("max_points")
+    if max_points is not None and (
+        not isinstance(max_points, int) or not 2 <= max_points <= MAX_UPLOADED_TABLE_POINTS
+    ):
+        raise ValueError(
+            f"Step {name} may use quantile tables of 2 to {MAX_UPLOADED_TABLE_POINTS} points, "
+            f"but got {max_points!r}"
+        )
+
+
+def _python_scalar(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write(file, header: dict, arrays: dict = None) -> None:
+    """
+    Writes a JSON header followed by raw arrays.
+
+    Args:
+        file (str or file-like): Path or binary file to write to.
+        header (dict): JSON-serializable metadata.
+        arrays (dict or None): Name to array. Stored in C order with their dtype.
+
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in (arrays or {}).items()}
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset = _aligned(offset + array.nbytes)
+
+    encoded = json.dumps(
+        {"version": FORMAT_VERSION, **header, "arrays": layout}, separators=(",", ":")
+    ).encode()
+    start = _aligned(_PREFIX.size + len(encoded))
+
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "wb") as target:
+            _write(target, encoded, start, arrays, layout)
+    else:
+        _write(file, encoded, start, arrays, layout)
+
+
+def _write(file, encoded, start, arrays, layout):
+    file.write(_PREFIX.pack(MAGIC, len(encoded)))
+    file.write(encoded)
+    position = _PREFIX.size + len(encoded)
+    for name, array in arrays.items():
+        target = start + layout[name]["offset"]
+        file.write(b"\0" * (target - position))
+        file.write(array.data if array.size else b"")
+        position = target + array.nbytes
+
+
+def read(source, mmap: bool = True) -> tuple:
+    """
+    Reads a header and its arrays without copying them.
+
+    Arrays of a file are memory-mapped (or read with ``mmap=False``), arrays
+    of bytes or an in-memory file are read-only views of its buffer.
+
+    Args:
+        source (str, bytes or file-like): Path, contents or binary file.
+        mmap (bool): Memory-map arrays of files. By default True
+
+    Returns:
+        tuple: (header dict, name to np.ndarray).
+
+    Raises:
+        ValueError: If the source is not in this format or from a newer version.
+
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            header, start = _read_header(file.read(_PREFIX.size), file.read)
+        return header, {
+            name: _map_array(source, start + spec["offset"], spec, mmap)
+            for name, spec in header.pop("arrays").items()
+        }
+
+    if isinstance(source, io.BytesIO):
+        buffer = source.getbuffer()
+    elif hasattr(source, "read"):
+        buffer = source.read()
+    else:
+        buffer = source
+    buffer = memoryview(buffer).cast("B")
+
+    def read_header(size):
+        return bytes(buffer[_PREFIX.size : _PREFIX.size + size])
+
+    header, start = _read_header(bytes(buffer[: _PREFIX.size]), read_header)
+    arrays = {}
+    for name, spec in header.pop("arrays").items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"]))
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=start + spec["offset"])
+        arrays[name] = array.reshape(spec["shape"])
+    return header, arrays
+
+
+def _read_header(prefix, read):
+    if len(prefix) < _PREFIX.size:
+        raise ValueError("Not a saved process, the file is too short")
+    magic, length = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError("Not a saved process")
+
+    header = json.loads(read(length))
+    if header.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Saved with a newer format version {header['version']}")
+    return header, _aligned(_PREFIX.size + length)
+
+
+def _map_array(path, offset, spec, mmap):
+    dtype = np.dtype(spec["dtype"])
+    shape = tuple(spec["shape"])
+    count = int(np.prod(shape))
+    if not count:
+        return np.empty(shape, dtype=dtype)
+    if mmap:
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+    return np.fromfile(path, dtype=dtype, count=count, offset=offset).reshape(shape)
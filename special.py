@@ -0,0 +1,414 @@
+import numpy as np
+
+# Vectorized special functions, so the core does not depend on scipy.
+
+# Coefficients of Acklam's rational approximation of the normal quantile
+_A = (-3.969683028665376e01, 2.209460984245205e02, -2.759285104469687e02,
+      1.383577518672690e02, -3.066479806614716e01, 2.506628277459239e00)
+_B = (-5.447609879822406e01, 1.615858368580409e02, -1.556989798598866e02,
+      6.680131188771972e01, -1.328068155288572e01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e00,
+      -2.549732539343734e00, 4.374664141464968e00, 2.938163982698783e00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e00,
+      3.754408661907416e00)
+_P_LOW = 0.02425
+
+# Chebyshev fit of erfc from Numerical Recipes, fractional error below 1.2e-7
+_ERFC = (-1.26551223, 1.00002368, 0.37409196, 0.09678418, -0.18628806,
+         0.27886807, -1.13520398, 1.48851587, -0.82215223, 0.17087277)
+
+
+def _polyval(coefficients, x):
+    # Horner's scheme in place, one buffer for the whole polynomial
+    result = np.full_like(x, coefficients[0])
+    for coefficient in coefficients[1:]:
+        result *= x
+        result += coefficient
+    return result
+
+
+def erfc(x):
+    """
+    Complementary error function.
+
+    Args:
+        x (array-like): Points to evaluate.
+
+    Returns:
+        np.ndarray: erfc(x), with a fractional error below 1.2e-7.
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    shape = x.shape
+    x = x.reshape(-1)
+    z = np.abs(x)
+    t = 0.5 * z
+    t += 1.0
+    np.reciprocal(t, out=t)
+
+    exponent = _polyval(_ERFC[::-1], t)
+    z *= z
+    exponent -= z
+    tail = np.exp(exponent, out=exponent)
+    tail *= t
+
+    np.subtract(2.0, tail, out=tail, where=x < 0)
+    return tail.reshape(shape)
+
+
+def norm_cdf(x):
+    """
+    Standard normal cumulative distribution function.
+
+    Args:
+        x (array-like): Points to evaluate.
+
+    Returns:
+        np.ndarray: P(Z <= x).
+
+    """
+    return 0.5 * erfc(-np.asarray(x, dtype=np.float64) / np.sqrt(2.0))
+
+
+def norm_ppf(p):
+    """
+    Standard normal quantile function (inverse CDF).
+
+    Uses Acklam's rational approximation, relative error below 1.2e-9.
+
+    Args:
+        p (array-like): Probabilities in [0, 1].
+
+    Returns:
+        np.ndarray: z with P(Z <= z) = p, -inf and inf at 0 and 1.
+
+    """
+    p = np.asarray(p, dtype=np.float64)
+    x = np.empty_like(p)
+
+    low = p < _P_LOW
+    high = p > 1 - _P_LOW
+    central = ~(low | high)
+
+    q = p[central] - 0.5
+    r = q * q
+    x[central] = q * _polyval(_A, r) / (_polyval(_B, r) * r + 1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        q = np.sqrt(-2 * np.log(p[low]))
+        x[low] = _polyval(_C, q) / (_polyval(_D, q) * q + 1)
+
+        q = np.sqrt(-2 * np.log1p(-p[high]))
+        x[high] = -_polyval(_C, q) / (_polyval(_D, q) * q + 1)
+
+    x[p == 0] = -np.inf
+    x[p == 1] = np.inf
+    return x
+
+
+# Lanczos coefficients of the log-gamma function from Numerical Recipes, g = 671/128
+_LANCZOS = (57.1562356658629235, -59.5979603554754912, 14.1360979747417471,
+            -0.491913816097620199, 0.339946499848118887e-4, 0.465236289270485756e-4,
+            -0.983744753048795646e-4, 0.158088703224912494e-3, -0.210264441724104883e-3,
+            0.217439618115212643e-3, -0.164318106536763890e-3, 0.844182239838527433e-4,
+            -0.261908384015814087e-4, 0.368991826595316234e-5)
+
+# Convergence settings of the series, continued fractions and Halley iterations
+_EPS = np.finfo(np.float64).eps
+_TINY = np.finfo(np.float64).tiny / _EPS
+_TOLERANCE = 4 * _EPS
+_HALLEY_TOLERANCE = 1e-12
+_MAX_TERMS = 1000
+_MAX_HALLEY = 12
+
+
+def gammaln(x):
+    """
+    Natural logarithm of the gamma function.
+
+    Args:
+        x (array-like): Positive points to evaluate.
+
+    Returns:
+        np.ndarray: log(Gamma(x)), with a relative error near machine precision.
+
+    """
+    x = np.asarray(x, dtype=np.float64)
+    tmp = x + 5.24218750000000000
+    tmp = (x + 0.5) * np.log(tmp) - tmp
+    series = np.full_like(x, 0.999999999999997092)
+    y = x.copy()
+    for coefficient in _LANCZOS:
+        y += 1
+        series += coefficient / y
+    return tmp + np.log(2.5066282746310005 * series / x)
+
+
+def _flat(*arrays):
+    # Broadcast arguments to flat float arrays, plus the shape to restore
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=np.float64) for a in arrays))
+    return arrays[0].shape, [a.ravel() for a in arrays]
+
+
+def _gamma_series(a, x):
+    # Series of P(a, x), converges quickly for x < a + 1
+    ap = a.copy()
+    term = 1 / a
+    total = term.copy()
+    for _ in range(_MAX_TERMS):
+        ap += 1
+        term *= x / ap
+        total += term
+        if np.all(np.abs(term) < np.abs(total) * _TOLERANCE):
+            break
+    return total * np.exp(a * np.log(x) - x - gammaln(a))
+
+
+def _gamma_fraction(a, x):
+    # Lentz's continued fraction of Q(a, x), converges quickly for x >= a + 1.
+    # Converged values drop out, so slow points do not hold up the others.
+    b = x + 1 - a
+    c = np.full_like(x, 1 / _TINY)
+    d = 1 / b
+    h = d.copy()
+    active = np.arange(x.size)
+    for i in range(1, _MAX_TERMS):
+        an = -i * (i - a[active])
+        b[active] += 2
+        da = an * d[active] + b[active]
+        da[np.abs(da) < _TINY] = _TINY
+        ca = b[active] + an / c[active]
+        ca[np.abs(ca) < _TINY] = _TINY
+        da = 1 / da
+        delta = da * ca
+        h[active] *= delta
+        d[active] = da
+        c[active] = ca
+
+        active = active[np.abs(delta - 1) > _TOLERANCE]
+        if not active.size:
+            break
+    return h * np.exp(a * np.log(x) - x - gammaln(a))
+
+
+def gammainc(a, x):
+    """
+    Regularized lower incomplete gamma function P(a, x).
+
+    Args:
+        a (array-like): Positive shape parameters.
+        x (array-like): Non-negative points to evaluate. Broadcasts against ``a``.
+
+    Returns:
+        np.ndarray: P(a, x), the CDF of a Gamma(a, 1) distribution at x.
+
+    """
+    shape, (a, x) = _flat(a, x)
+    result = np.zeros(a.shape)
+    series = (x > 0) & (x < a + 1)
+    fraction = x >= a + 1
+    if series.any():
+        result[series] = _gamma_series(a[series], x[series])
+    if fraction.any():
+        result[fraction] = 1 - _gamma_fraction(a[fraction], x[fraction])
+    return result.reshape(shape)
+
+
+def gammaincinv(a, p):
+    """
+    Inverse of the regularized lower incomplete gamma function in x.
+
+    Starts from the guesses of Numerical Recipes and refines them with Halley
+    steps, iterating only on the values that have not converged yet.
+
+    Args:
+        a (array-like): Positive shape parameters.
+        p (array-like): Probabilities in [0, 1]. Broadcasts against ``a``.
+
+    Returns:
+        np.ndarray: x with P(a, x) = p, 0 and inf at 0 and 1.
+
+    """
+    shape, (a, p) = _flat(a, p)
+    a1 = a - 1
+    large = a > 1
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        gln = gammaln(a)
+        lna1 = np.log(a1)
+        afac = np.exp(a1 * (lna1 - 1) - gln)
+
+        tail = np.where(p < 0.5, p, 1 - p)
+        t = np.sqrt(-2 * np.log(tail))
+        z = (2.30753 + t * 0.27061) / (1 + t * (0.99229 + t * 0.04481)) - t
+        z = np.where(p < 0.5, -z, z)
+        guess_large = np.maximum(1e-3, a * (1 - 1 / (9 * a) - z / (3 * np.sqrt(a))) ** 3)
+
+        t = 1 - a * (0.253 + a * 0.12)
+        guess_small = np.where(p < t, (p / t) ** (1 / a), 1 - np.log1p(-(p - t) / (1 - t)))
+        x = np.where(large, guess_large, guess_small)
+
+        active = np.flatnonzero((p > 0) & (p < 1))
+        for _ in range(_MAX_HALLEY):
+            xa, aa, a1a = x[active], a[active], a1[active]
+            error = gammainc(aa, xa) - p[active]
+            density = np.where(
+                large[active],
+                afac[active] * np.exp(a1a * (np.log(xa) - lna1[active]) - (xa - a1a)),
+                np.exp(a1a * np.log(xa) - xa - gln[active]),
+            )
+            u = error / density
+            step = u / (1 - 0.5 * np.minimum(1, u * (a1a / xa - 1)))
+            updated = xa - step
+            updated = np.where(updated <= 0, 0.5 * xa, updated)
+            x[active] = updated
+
+            active = active[np.abs(step) > _HALLEY_TOLERANCE * updated]
+            if not active.size:
+                break
+
+    x[p <= 0] = 0.0
+    x[p >= 1] = np.inf
+    return x.reshape(shape)
+
+
+def _beta_fraction(a, b, x):
+    # Lentz's continued fraction of the incomplete beta function, converged values drop out
+    qab = a + b
+    qap = a + 1
+    qam = a - 1
+    c = np.ones_like(x)
+    d = 1 - qab * x / qap
+    d[np.abs(d) < _TINY] = _TINY
+    d = 1 / d
+    h = d.copy()
+    active = np.arange(x.size)
+    for m in range(1, _MAX_TERMS):
+        m2 = 2 * m
+        aa_, ba, xa, qa = a[active], b[active], x[active], qab[active]
+        da, ca = d[active], c[active]
+
+        aa = m * (ba - m) * xa / ((qam[active] + m2) * (aa_ + m2))
+        da = 1 + aa * da
+        da[np.abs(da) < _TINY] = _TINY
+        ca = 1 + aa / ca
+        ca[np.abs(ca) < _TINY] = _TINY
+        da = 1 / da
+        factor = da * ca
+
+        aa = -(aa_ + m) * (qa + m) * xa / ((aa_ + m2) * (qap[active] + m2))
+        da = 1 + aa * da
+        da[np.abs(da) < _TINY] = _TINY
+        ca = 1 + aa / ca
+        ca[np.abs(ca) < _TINY] = _TINY
+        da = 1 / da
+        delta = da * ca
+        h[active] *= factor * delta
+        d[active] = da
+        c[active] = ca
+
+        active = active[np.abs(delta - 1) > _TOLERANCE]
+        if not active.size:
+            break
+    return h
+
+
+def betainc(a, b, x):
+    """
+    Regularized incomplete beta function I_x(a, b).
+
+    Args:
+        a (array-like): Positive shape parameters.
+        b (array-like): Positive shape parameters.
+        x (array-like): Points in [0, 1]. Arguments broadcast against each other.
+
+    Returns:
+        np.ndarray: I_x(a, b), the CDF of a Beta(a, b) distribution at x.
+
+    """
+    shape, (a, b, x) = _flat(a, b, x)
+    result = np.where(x >= 1, 1.0, 0.0)
+    inside = (x > 0) & (x < 1)
+    a, b, x = a[inside], b[inside], x[inside]
+
+    front = np.exp(
+        gammaln(a + b) - gammaln(a) - gammaln(b) + a * np.log(x) + b * np.log1p(-x)
+    )
+    # The continued fraction converges fast below the mean, the symmetry is used above it
+    direct = x < (a + 1) / (a + b + 2)
+    values = np.empty(x.shape)
+    if direct.any():
+        values[direct] = (
+            front[direct] * _beta_fraction(a[direct], b[direct], x[direct]) / a[direct]
+        )
+    mirrored = ~direct
+    if mirrored.any():
+        values[mirrored] = 1 - front[mirrored] * _beta_fraction(
+            b[mirrored], a[mirrored], 1 - x[mirrored]
+        ) / b[mirrored]
+
+    result[inside] = values
+    return result.reshape(shape)
+
+
+def betaincinv(a, b, p):
+    """
+    Inverse of the regularized incomplete beta function in x.
+
+    Starts from the guesses of Numerical Recipes and refines them with Halley
+    steps, iterating only on the values that have not converged yet.
+
+    Args:
+        a (array-like): Positive shape parameters.
+        b (array-like): Positive shape parameters.
+        p (array-like): Probabilities in [0, 1]. Arguments broadcast against each other.
+
+    Returns:
+        np.ndarray: x with I_x(a, b) = p.
+
+    """
+    shape, (a, b, p) = _flat(a, b, p)
+    a1 = a - 1
+    b1 = b - 1
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        tail = np.where(p < 0.5, p, 1 - p)
+        t = np.sqrt(-2 * np.log(tail))
+        z = (2.30753 + t * 0.27061) / (1 + t * (0.99229 + t * 0.04481)) - t
+        z = np.where(p < 0.5, -z, z)
+        al = (z * z - 3) / 6
+        h = 2 / (1 / (2 * a - 1) + 1 / (2 * b - 1))
+        w = z * np.sqrt(al + h) / h - (1 / (2 * b - 1) - 1 / (2 * a - 1)) * (al + 5 / 6 - 2 / (3 * h))
+        guess_large = a / (a + b * np.exp(2 * w))
+
+        lna = np.log(a / (a + b))
+        lnb = np.log(b / (a + b))
+        t = np.exp(a * lna) / a
+        u = np.exp(b * lnb) / b
+        w = t + u
+        guess_small = np.where(
+            p < t / w, (a * w * p) ** (1 / a), 1 - (b * w * (1 - p)) ** (1 / b)
+        )
+        x = np.where((a >= 1) & (b >= 1), guess_large, guess_small)
+        x = np.clip(np.nan_to_num(x, nan=0.5), _TINY, 1 - _EPS)
+
+        afac = gammaln(a + b) - gammaln(a) - gammaln(b)
+        active = np.flatnonzero((p > 0) & (p < 1))
+        for _ in range(_MAX_HALLEY):
+            xa, a1a, b1a = x[active], a1[active], b1[active]
+            error = betainc(a[active], b[active], xa) - p[active]
+            density = np.exp(a1a * np.log(xa) + b1a * np.log1p(-xa) + afac[active])
+            u = error / density
+            step = u / (1 - 0.5 * np.minimum(1, u * (a1a / xa - b1a / (1 - xa))))
+            updated = xa - step
+            updated = np.where(updated <= 0, 0.5 * xa, updated)
+            updated = np.where(updated >= 1, 0.5 * (xa + 1), updated)
+            x[active] = updated
+
+            active = active[np.abs(step) > _HALLEY_TOLERANCE * updated]
+            if not active.size:
+                break
+
+    x[p <= 0] = 0.0
+    x[p >= 1] = 1.0
+    return x.reshape(shape)
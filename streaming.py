@@ -0,0 +1,493 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from copula import checked_groups, draw_correlated
+from rng import step_generators
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class RunningStats:
+    """
+    Running count, mean, variance, min and max of a stream of samples.
+
+    Chunks are folded in with the pairwise update of Chan et al., so the
+    result does not depend on how the stream was split into chunks (up to
+    floating point rounding).
+
+    Attributes:
+        count (int): Number of samples seen.
+        mean (float): Running mean.
+        m2 (float): Running sum of squared deviations from the mean.
+        min (float): Smallest sample seen.
+        max (float): Largest sample seen.
+
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Folds a chunk of samples into the running statistics.
+
+        Args:
+            values (np.ndarray): Samples to add.
+
+        """
+        values = np.asarray(values, dtype=np.float64)
+        n = values.size
+        if n == 0:
+            return
+
+        chunk_mean = float(values.mean())
+        chunk_m2 = float(np.square(values - chunk_mean).sum())
+        self._combine(n, chunk_mean, chunk_m2, float(values.min()), float(values.max()))
+
+    def merge(self, other: "RunningStats") -> None:
+        """
+        Merges the statistics of another stream into this one.
+
+        Args:
+            other (RunningStats): Statistics to merge.
+
+        """
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def _combine(self, n, mean, m2, low, high):
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), NaN with fewer than two samples."""
+        if self.count < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)."""
+        return float(np.sqrt(self.variance))
+
+
+class StreamingHistogram:
+    """
+    Histogram with fixed bin edges that is filled chunk by chunk.
+
+    Samples outside the edges are not dropped silently, they are counted in
+    ``underflow`` and ``overflow``.
+
+    Attributes:
+        edges (np.ndarray): Bin edges, ``bins + 1`` values.
+        counts (np.ndarray): Counts per bin.
+        underflow (int): Samples below the first edge.
+        overflow (int): Samples above the last edge.
+
+    Args:
+        low (float): Lower edge of the first bin.
+        high (float): Upper edge of the last bin.
+        bins (int): Number of bins. By default 100
+
+    """
+
+    def __init__(self, low: float, high: float, bins: int = 100):
+        assert bins > 0, f"Number of bins must be positive, but got {bins}"
+        if high <= low:
+            high = low + 1.0
+
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Adds a chunk of samples to the histogram.
+
+        Args:
+            values (np.ndarray): Samples to add.
+
+        """
+        low, high = self.edges[0], self.edges[-1]
+        bins = self.counts.size
+
+        index = np.floor((values - low) * (bins / (high - low))).astype(np.int64)
+        # The upper edge belongs to the last bin, as in np.histogram
+        index[values == high] = bins - 1
+
+        below = index < 0
+        above = index >= bins
+        self.underflow += int(below.sum())
+        self.overflow += int(above.sum())
+
+        inside = index[~(below | above)]
+        self.counts += np.bincount(inside, minlength=bins)
+
+    def merge(self, other: "StreamingHistogram") -> None:
+        """
+        Merges another histogram with identical edges into this one.
+
+        Args:
+            other (StreamingHistogram): Histogram to merge.
+
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms with different bin edges cannot be merged.")
+
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with bounded memory (a simplified KLL sketch).
+
+    Items are kept in levels, an item on level ``i`` stands for ``2**i``
+    samples. When a level holds more than ``k`` items it is sorted and every
+    other item is promoted to the next level. The rank error is roughly
+    ``log2(n / k) / k``, and memory stays ``O(k log(n / k))``.
+
+    Compaction offsets alternate deterministically, so the same stream split
+    into the same chunks always gives the same sketch.
+
+    Args:
+        k (int): Capacity of a single level. By default 4096
+
+    """
+
+    def __init__(self, k: int = 4096):
+        assert k >= 2, f"Sketch capacity must be at least 2, but got {k}"
+
+        self.k = k
+        self.count = 0
+        self.levels = []
+        self._offset = 0
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Adds a chunk of samples to the sketch.
+
+        Args:
+            values (np.ndarray): Samples to add.
+
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        self.count += values.size
+
+        # Large chunks are compacted on their own before entering the levels
+        level = 0
+        if values.size > self.k:
+            values = np.sort(values)
+            while values.size > self.k:
+                values = values[self._next_offset() :: 2]
+                level += 1
+
+        self._push(level, values)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        Merges another sketch into this one.
+
+        Args:
+            other (QuantileSketch): Sketch to merge.
+
+        """
+        self.count += other.count
+        for level, items in enumerate(other.levels):
+            if items.size:
+                self._push(level, items)
+
+    def quantile(self, q):
+        """
+        Estimates quantiles of the stream.
+
+        Args:
+            q (float or array-like): Quantile(s) between 0 and 1.
+
+        Returns:
+            float or np.ndarray: Estimated quantile value(s).
+
+        """
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        values, weights = self._weighted_items()
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        weights = weights[order]
+
+        cumulative = np.cumsum(weights)
+        positions = (cumulative - weights / 2) / cumulative[-1]
+        result = np.interp(q, positions, values)
+        return float(result) if np.ndim(q) == 0 else result
+
+    def _weighted_items(self):
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(items.size, 2.0**level) for level, items in enumerate(self.levels)]
+        )
+        return values, weights
+
+    def _next_offset(self):
+        offset = self._offset
+        self._offset ^= 1
+        return offset
+
+    def _push(self, level, values):
+        while len(self.levels) <= level:
+            self.levels.append(np.empty(0))
+        self.levels[level] = np.concatenate((self.levels[level], values))
+
+        while self.levels[level].size > self.k:
+            items = np.sort(self.levels[level])
+            # An odd item stays behind so no weight is lost
+            keep = items[-1:] if items.size % 2 else items[:0]
+            items = items[: items.size - keep.size]
+
+            self.levels[level] = keep
+            level += 1
+            if len(self.levels) <= level:
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate(
+                (self.levels[level], items[self._next_offset() :: 2])
+            )
+
+
+class ColumnSummary:
+    """
+    Online aggregates of a single result column.
+
+    Attributes:
+        stats (RunningStats): Count, mean, variance, min and max.
+        histogram (StreamingHistogram or None): Fixed-bin histogram, created from the first chunk.
+        sketch (QuantileSketch): Quantile sketch.
+
+    Args:
+        bins (int): Number of histogram bins.
+        hist_range (tuple or None): Histogram range. By default taken from the first chunk.
+        sketch_size (int): Capacity of a quantile sketch level.
+
+    """
+
+    def __init__(self, bins: int = 100, hist_range=None, sketch_size: int = 4096):
+        self.bins = bins
+        self.hist_range = hist_range
+        self.stats = RunningStats()
+        self.histogram = None
+        self.sketch = QuantileSketch(k=sketch_size)
+
+    def update(self, values: np.ndarray) -> None:
+        """
+        Folds a chunk of samples into every aggregate.
+
+        Args:
+            values (np.ndarray): Samples to add.
+
+        """
+        if values.size == 0:
+            return
+
+        if self.histogram is None:
+            self.histogram = StreamingHistogram(*self._initial_range(values), bins=self.bins)
+
+        self.stats.update(values)
+        self.histogram.update(values)
+        self.sketch.update(values)
+
+    def merge(self, other: "ColumnSummary") -> None:
+        """
+        Merges the aggregates of another column summary into this one.
+
+        Args:
+            other (ColumnSummary): Summary to merge.
+
+        """
+        if other.histogram is not None:
+            if self.histogram is None:
+                self.histogram = StreamingHistogram(
+                    other.histogram.edges[0], other.histogram.edges[-1], bins=other.bins
+                )
+            self.histogram.merge(other.histogram)
+
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+
+    def quantile(self, q):
+        """
+        Estimates quantiles of the column.
+
+        Args:
+            q (float or array-like): Quantile(s) between 0 and 1.
+
+        Returns:
+            float or np.ndarray: Estimated quantile value(s).
+
+        """
+        return self.sketch.quantile(q)
+
+    def _initial_range(self, values):
+        if self.hist_range is not None:
+            return self.hist_range
+
+        # Pad the range of the first chunk, later tails go to under/overflow
+        low, high = float(values.min()), float(values.max())
+        padding = 0.25 * (high - low)
+        return low - padding, high + padding
+
+
+class SimulationSummary:
+    """
+    Summary of a streamed simulation, one ColumnSummary per step plus "Total".
+
+    Attributes:
+        n_simulations (int): Number of simulated samples.
+        columns (dict): Column name to ColumnSummary.
+
+    """
+
+    def __init__(self, names: list[str], bins: int = 100, hist_range=None, sketch_size: int = 4096):
+        self.n_simulations = 0
+        self.columns = {
+            name: ColumnSummary(
+                bins=bins, hist_range=_column_range(hist_range, name), sketch_size=sketch_size
+            )
+            for name in [*names, "Total"]
+        }
+
+    def __getitem__(self, name: str) -> ColumnSummary:
+        return self.columns[name]
+
+    def update(self, chunk: dict) -> None:
+        """
+        Folds a chunk of results into the summary.
+
+        Args:
+            chunk (dict): Column name to sample array, including "Total".
+
+        """
+        for name, summary in self.columns.items():
+            summary.update(chunk[name])
+        self.n_simulations += len(chunk["Total"])
+
+    def merge(self, other: "SimulationSummary") -> None:
+        """
+        Merges another summary over the same columns into this one.
+
+        Args:
+            other (SimulationSummary): Summary to merge.
+
+        """
+        for name, summary in self.columns.items():
+            summary.merge(other.columns[name])
+        self.n_simulations += other.n_simulations
+
+    def describe(self, quantiles=(0.25, 0.5, 0.75)) -> "pd.DataFrame":
+        """
+        Returns the summary in the layout of ``pd.DataFrame.describe``.
+
+        Args:
+            quantiles (tuple): Quantiles to report. By default quartiles
+
+        Returns:
+            pd.DataFrame: Statistics per column.
+
+        """
+        import pandas as pd
+
+        index = ["count", "mean", "std", "min", *[f"{q:.0%}" for q in quantiles], "max"]
+        data = {}
+        for name, summary in self.columns.items():
+            stats = summary.stats
+            data[name] = [
+                stats.count,
+                stats.mean,
+                stats.std,
+                stats.min,
+                *np.atleast_1d(summary.quantile(list(quantiles))),
+                stats.max,
+            ]
+        return pd.DataFrame(data, index=index)
+
+
+def _column_range(hist_range, name):
+    if isinstance(hist_range, dict):
+        return hist_range.get(name)
+    return hist_range
+
+
+def simulate_streaming(
+    steps,
+    n_simulations: int,
+    chunk_size: int = 2**20,
+    bins: int = 100,
+    hist_range=None,
+    sketch_size: int = 4096,
+    seed=None,
+    bit_generator: str = "PCG64",
+    correlations: dict = None,
+) -> SimulationSummary:
+    """
+    Simulates steps in fixed-size chunks and keeps only online aggregates.
+
+    Peak memory is bounded by ``chunk_size`` samples per step, regardless of
+    ``n_simulations``. Each step keeps one random stream across chunks, so for a
+    given seed the draws equal those of ``Process.simulate_process``, including
+    correlated steps.
+
+    Args:
+        steps (list[ProcessStep]): Steps to simulate, in order.
+        n_simulations (int): Total number of samples to draw.
+        chunk_size (int): Number of samples drawn at once. By default 2**20
+        bins (int): Number of histogram bins per column. By default 100
+        hist_range (tuple, dict or None): Histogram range for all columns, or per column name.
+        sketch_size (int): Capacity of a quantile sketch level. By default 4096
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+        correlations (dict or None): (name, name) to correlation. By default independent steps
+
+    Returns:
+        SimulationSummary: Aggregates per step and for "Total".
+
+    Raises:
+        TypeError: If a correlated step has no inverse CDF.
+
+    """
+    assert chunk_size > 0, f"Chunk size must be positive, but got {chunk_size}"
+
+    summary = SimulationSummary(
+        [step.name for step in steps], bins=bins, hist_range=hist_range, sketch_size=sketch_size
+    )
+
+    generators = step_generators([step.name for step in steps], seed, bit_generator)
+    groups = checked_groups(steps, correlations)
+
+    remaining = n_simulations
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        chunk = {}
+        total_time = np.zeros(size)
+
+        for step, step_time in zip(steps, draw_correlated(steps, groups, generators, size)):
+            chunk[step.name] = step_time
+            total_time += step_time
+
+        chunk["Total"] = total_time
+        summary.update(chunk)
+        remaining -= size
+
+    return summary
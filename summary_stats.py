@@ -0,0 +1,81 @@
+from typing import TYPE_CHECKING
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Quantiles reported by default, e.g. for delivery-time SLAs
+DEFAULT_QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def quantile_label(q: float) -> str:
+    """Row label of a quantile, e.g. "P95" for 0.95."""
+    return f"P{100 * q:g}"
+
+
+def column_stats(values: np.ndarray, quantiles=DEFAULT_QUANTILES) -> list[float]:
+    """
+    Count, mean, std, min, quantiles and max of one column.
+
+    All order statistics come from a single ``np.partition`` of a copy at the
+    ranks the quantiles need, instead of a full sort. Quantiles interpolate
+    linearly between ranks, like ``np.quantile`` and ``DataFrame.describe``.
+
+    Args:
+        values (np.ndarray): Samples.
+        quantiles (tuple[float]): Quantiles between 0 and 1.
+
+    Returns:
+        list[float]: count, mean, std, min, one value per quantile and max.
+
+    """
+    values = np.asarray(values).ravel()
+    n = values.size
+    if n == 0:
+        return [0.0] + [np.nan] * (len(quantiles) + 4)
+
+    positions = np.asarray(quantiles, dtype=np.float64) * (n - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    ranks = np.unique(np.concatenate(([0, n - 1], lower, upper)))
+
+    ordered = np.partition(values, ranks)
+    low = ordered[lower].astype(np.float64)
+    high = ordered[upper].astype(np.float64)
+    quantile_values = low + (high - low) * (positions - lower)
+
+    mean = values.mean(dtype=np.float64)
+    std = values.std(dtype=np.float64, ddof=1) if n > 1 else np.nan
+    return [
+        float(n),
+        float(mean),
+        float(std),
+        float(ordered[0]),
+        *quantile_values.tolist(),
+        float(ordered[n - 1]),
+    ]
+
+
+def summarize(columns, quantiles=DEFAULT_QUANTILES) -> "pd.DataFrame":
+    """
+    Summary statistics per column, laid out like ``DataFrame.describe``.
+
+    Args:
+        columns (dict, pd.DataFrame or SimulationResult): Column name to samples.
+        quantiles (tuple[float]): Quantiles between 0 and 1. By default P50, P90, P95 and P99
+
+    Returns:
+        pd.DataFrame: Rows count, mean, std, min, one per quantile and max; a column per input column.
+
+    """
+    import pandas as pd
+
+    for q in quantiles:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantiles must be between 0 and 1, but got {q}")
+
+    names = list(columns.columns) if hasattr(columns, "columns") else list(columns)
+    index = ["count", "mean", "std", "min", *map(quantile_label, quantiles), "max"]
+    return pd.DataFrame(
+        {name: column_stats(columns[name], quantiles) for name in names}, index=index
+    )
@@ -0,0 +1,253 @@
+import itertools
+from typing import TYPE_CHECKING
+import numpy as np
+from copula import correlated_uniforms, group_factors
+from process_steps import require_inverse_cdf
+from rng import child_sequence, make_generator, name_key, seed_sequence
+from sampling import uniforms
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+SWEEP_DESIGNS = ("grid", "one_at_a_time")
+
+# Largest number of samples held per block of scenarios
+_BLOCK_ELEMENTS = 2**22
+
+
+def _factors(overrides):
+    """Flattens {step: {param: values}} into [((step, param), values)]."""
+    return [
+        ((step_name, param), list(values))
+        for step_name, params in overrides.items()
+        for param, values in params.items()
+    ]
+
+
+def expand_scenarios(overrides: dict, design: str = "grid") -> list[dict]:
+    """
+    Expands value lists per step parameter into scenarios.
+
+    Args:
+        overrides (dict): Step name to {parameter: list of values},
+            e.g. {"review": {"mean": [8, 10, 12]}, "fix": {"rate": [0.5, 1]}}.
+        design (str): "grid" for every combination of values, "one_at_a_time" to
+            vary one parameter while the others keep their current value.
+            By default "grid"
+
+    Returns:
+        list[dict]: Scenarios as step name to {parameter: value}.
+
+    """
+    if design not in SWEEP_DESIGNS:
+        raise ValueError(f"Unknown sweep design {design}, expected one of {SWEEP_DESIGNS}")
+
+    factors = _factors(overrides)
+    scenarios = []
+
+    if design == "grid":
+        for values in itertools.product(*(values for _, values in factors)):
+            scenario = {}
+            for (step_name, param), value in zip((factor for factor, _ in factors), values):
+                scenario.setdefault(step_name, {})[param] = value
+            scenarios.append(scenario)
+    else:
+        for (step_name, param), values in factors:
+            scenarios.extend({step_name: {param: value}} for value in values)
+
+    return scenarios
+
+
+class SweepResult:
+    """
+    Summary of a parameter sweep.
+
+    Attributes:
+        summary (pd.DataFrame): One row per scenario. Row 0 is the baseline with the
+            current parameters. Columns are the swept "step.param" values, followed by
+            mean, std, quantiles of "Total" and the difference of the mean to the
+            baseline with its standard error.
+        factors (list[str]): Swept parameters as "step.param".
+        baseline (dict): Current value of every swept parameter.
+        n_simulations (int): Samples per scenario.
+
+    """
+
+    def __init__(self, summary, factors, baseline, n_simulations):
+        self.summary = summary
+        self.factors = factors
+        self.baseline = baseline
+        self.n_simulations = n_simulations
+
+    def tornado(self, statistic: str = "mean") -> "pd.DataFrame":
+        """
+        Swing of a statistic of "Total" over the range of every swept parameter.
+
+        Each parameter is read at its lowest and highest swept value with the other
+        parameters at their current value. When the sweep has no such scenarios the
+        statistic is averaged over the other parameters (main effect).
+
+        Args:
+            statistic (str): Summary column, e.g. "mean" or "p95". By default "mean"
+
+        Returns:
+            pd.DataFrame: Columns factor, low_value, high_value, low, high and swing,
+                sorted by decreasing swing.
+
+        """
+        import pandas as pd
+
+        if statistic not in self.summary.columns:
+            raise ValueError(f"Unknown statistic {statistic}")
+
+        rows = []
+        for factor in self.factors:
+            others = [other for other in self.factors if other != factor]
+            at_baseline = np.ones(len(self.summary), dtype=bool)
+            for other in others:
+                at_baseline &= self.summary[other].to_numpy() == self.baseline[other]
+
+            values = self.summary[factor].to_numpy()
+            low_value, high_value = values.min(), values.max()
+            low = self._effect(factor, low_value, at_baseline, statistic)
+            high = self._effect(factor, high_value, at_baseline, statistic)
+            rows.append((factor, low_value, high_value, low, high, abs(high - low)))
+
+        columns = ["factor", "low_value", "high_value", "low", "high", "swing"]
+        tornado = pd.DataFrame(rows, columns=columns)
+        return tornado.sort_values("swing", ascending=False, ignore_index=True)
+
+    def _effect(self, factor, value, at_baseline, statistic):
+        matches = self.summary[factor].to_numpy() == value
+        rows = matches & at_baseline if (matches & at_baseline).any() else matches
+        return float(self.summary[statistic].to_numpy()[rows].mean())
+
+
+def sweep(
+    steps,
+    overrides,
+    n_simulations: int = 10_000,
+    design: str = "grid",
+    quantiles=(0.5, 0.9, 0.95),
+    sampling: str = "random",
+    seed=None,
+    bit_generator: str = "PCG64",
+    correlations: dict = None,
+) -> SweepResult:
+    """
+    Simulates many parameter scenarios with common random numbers.
+
+    One uniform design is drawn per step and shared by all scenarios, and each
+    scenario maps it through the step's inverse CDF with its own parameters. This
+    is broadcast over blocks of scenarios, so a sweep costs little more than
+    its summaries, and differences between scenarios are not blurred by
+    independent sampling noise. Correlated steps share correlated uniforms
+    under a Gaussian copula. The baseline equals ``simulate_process`` with
+    the same seed and a sampling method other than "random".
+
+    Args:
+        steps (list[ProcessStep]): Steps in process order.
+        overrides (dict or list[dict]): Step name to {parameter: list of values}, expanded
+            with ``design``, or a list of scenarios as step name to {parameter: value}.
+        n_simulations (int): Samples per scenario. By default 10 000
+        design (str): "grid" or "one_at_a_time", see ``expand_scenarios``. By default "grid"
+        quantiles (tuple[float]): Quantiles of "Total" in the summary. By default (0.5, 0.9, 0.95)
+        sampling (str): Uniform design, one of SAMPLING_METHODS. By default "random"
+        seed (None, int, SeedSequence or Generator): Seed of the run. By default fresh entropy
+        bit_generator (str): Name of the numpy bit generator. By default "PCG64"
+        correlations (dict or None): (name, name) to correlation. By default independent steps
+
+    Returns:
+        SweepResult: Summary per scenario and sensitivity measures.
+
+    """
+    import pandas as pd
+
+    steps = steps or []
+    require_inverse_cdf(steps, "A sweep")
+    scenarios = overrides if isinstance(overrides, list) else expand_scenarios(overrides, design)
+    index = {step.name: i for i, step in enumerate(steps)}
+
+    factors = {}
+    for scenario in scenarios:
+        for step_name, params in scenario.items():
+            if step_name not in index:
+                raise KeyError(f"No step named {step_name}")
+            for param in params:
+                if param not in steps[index[step_name]].param_names:
+                    raise ValueError(f"Step {step_name} has no parameter {param}")
+                if not np.isscalar(getattr(steps[index[step_name]], param)):
+                    raise ValueError(f"Parameter {step_name}.{param} is not a number and cannot be swept")
+                factors.setdefault(f"{step_name}.{param}", (step_name, param))
+
+    # Parameters of every step per scenario, baseline first. Building the steps
+    # runs their validation on every scenario.
+    scenarios = [{}, *scenarios]
+    params = []
+    for step in steps:
+        rows = []
+        for scenario in scenarios:
+            values = {**step.get_params(), **_python_scalars(scenario.get(step.name, {}))}
+            type(step)(step.name, **values)
+            rows.append(values)
+        params.append({key: np.array([row[key] for row in rows]) for key in step.param_names})
+
+    root = seed_sequence(seed)
+    rng = make_generator(child_sequence(root, name_key(sampling)), bit_generator)
+    design_u = uniforms(sampling, len(steps), n_simulations, rng)
+    for group, factor in group_factors([step.name for step in steps], correlations or {}):
+        design_u[group] = correlated_uniforms(factor, design_u[group])
+
+    # Steps that are not swept are the same in every scenario
+    fixed_total = np.zeros(n_simulations)
+    swept = []
+    for step, u, step_params in zip(steps, design_u, params):
+        if all(np.all(values == values[0]) for values in step_params.values()):
+            fixed_total += step.ppf(u)
+        else:
+            swept.append((step, u, step_params))
+
+    n_scenarios = len(scenarios)
+    block = max(1, _BLOCK_ELEMENTS // max(n_simulations, 1))
+    stats = {name: np.empty(n_scenarios) for name in ("mean", "std", "delta_mean", "delta_se")}
+    quantile_values = np.empty((len(quantiles), n_scenarios))
+    baseline_total = None
+
+    for start in range(0, n_scenarios, block):
+        stop = min(start + block, n_scenarios)
+        total = np.broadcast_to(fixed_total, (stop - start, n_simulations)).copy()
+        for step, u, step_params in swept:
+            block_params = {key: values[start:stop, None] for key, values in step_params.items()}
+            total += step.inverse_cdf(u[None, :], **block_params)
+
+        if baseline_total is None:
+            baseline_total = total[0].copy()
+
+        delta = total - baseline_total
+        stats["mean"][start:stop] = total.mean(axis=1)
+        stats["std"][start:stop] = total.std(axis=1, ddof=1)
+        stats["delta_mean"][start:stop] = delta.mean(axis=1)
+        stats["delta_se"][start:stop] = delta.std(axis=1, ddof=1) / np.sqrt(n_simulations)
+        if len(quantiles):
+            quantile_values[:, start:stop] = np.quantile(total, quantiles, axis=1)
+
+    summary = pd.DataFrame({"scenario": np.arange(n_scenarios)})
+    baseline = {}
+    for factor, (step_name, param) in factors.items():
+        values = params[index[step_name]][param]
+        summary[factor] = values
+        baseline[factor] = values[0]
+
+    summary["mean"] = stats["mean"]
+    summary["std"] = stats["std"]
+    for q, values in zip(quantiles, quantile_values):
+        summary[f"p{100 * q:g}"] = values
+    summary["delta_mean"] = stats["delta_mean"]
+    summary["delta_se"] = stats["delta_se"]
+
+    return SweepResult(summary, list(factors), baseline, n_simulations)
+
+
+def _python_scalars(params):
+    # Step validation expects Python numbers, not NumPy scalars
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in params.items()}
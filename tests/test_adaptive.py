@@ -0,0 +1,83 @@
+import unittest
+from process import Process
+from process_steps import ExponentialStep, LognormalStep, NormalStep, UniformStep
+
+
+class TestSimulateAdaptive(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_relative_error(self):
+        result = self.process.simulate_adaptive(target_relative_error=0.0005, seed=1)
+
+        self.assertTrue(result.converged)
+        self.assertLessEqual(result.relative_error, 0.0005)
+        self.assertAlmostEqual(result.mean, 21.75, delta=0.05)
+        # sd 2.19 / (21.75 * 0.0005) squared is about 40 000 samples
+        self.assertLess(result.n_simulations, 100_000)
+        self.assertGreater(len(result.history), 1)
+
+    def test_zero_mean(self):
+        process = Process()
+        process.insertAtEnd(NormalStep(name="noise", mean=0, stdev=2))
+
+        # A relative error cannot be met, so only an absolute target stops the run
+        result = process.simulate_adaptive(target_relative_error=0.01, max_samples=50_000, seed=1)
+        self.assertFalse(result.converged)
+        self.assertEqual(result.n_simulations, 50_000)
+
+        result = process.simulate_adaptive(
+            target_relative_error=0.01, target_absolute_error=0.02, seed=1
+        )
+        self.assertTrue(result.converged)
+        self.assertLessEqual(result.std_error, 0.02)
+        # sd 2 / 0.02 squared is 10 000 samples
+        self.assertLess(result.n_simulations, 100_000)
+
+        result = process.simulate_adaptive(target_absolute_error=0.02, seed=1)
+        self.assertTrue(result.converged)
+
+    def test_relative_error_is_met_for_wide_spreads(self):
+        process = Process()
+        process.insertAtEnd(LognormalStep(name="a", mu=0, sigma=1.5))
+
+        result = process.simulate_adaptive(target_relative_error=0.01, seed=1)
+        self.assertTrue(result.converged)
+        self.assertLessEqual(result.relative_error, 0.01)
+
+    def test_quantile(self):
+        result = self.process.simulate_adaptive(quantile=0.95, target_halfwidth=0.05, seed=1)
+
+        self.assertTrue(result.converged)
+        self.assertLessEqual(result.quantile_halfwidth, 0.05)
+        low, high = result.quantile_interval
+        self.assertLessEqual(low, result.quantile_value)
+        self.assertLessEqual(result.quantile_value, high)
+        self.assertAlmostEqual(result.quantile_value, self.process.analyze_total().quantile(0.95), delta=0.05)
+
+    def test_budget(self):
+        result = self.process.simulate_adaptive(
+            target_relative_error=1e-6, max_samples=50_000, seed=1
+        )
+
+        self.assertFalse(result.converged)
+        self.assertEqual(result.n_simulations, 50_000)
+
+    def test_reproducible(self):
+        first = self.process.simulate_adaptive(target_relative_error=0.001, seed=3)
+        second = self.process.simulate_adaptive(target_relative_error=0.001, seed=3)
+        self.assertEqual(first.mean, second.mean)
+        self.assertEqual(first.n_simulations, second.n_simulations)
+
+    def test_invalid_targets(self):
+        with self.assertRaises(ValueError):
+            self.process.simulate_adaptive()
+        with self.assertRaises(ValueError):
+            self.process.simulate_adaptive(quantile=0.9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import statistics
+import unittest
+import numpy as np
+from process import Process
+from process_steps import ExponentialStep, NormalStep, ProcessStep, UniformStep
+
+
+class ConstantStep(ProcessStep):
+    def simulate(self, n_simulations, rng=None):
+        return np.full(n_simulations, 2.0)
+
+
+def build_process(*steps):
+    process = Process()
+    for step in steps:
+        process.insertAtEnd(step)
+    return process
+
+
+class TestAnalyzeTotal(unittest.TestCase):
+    def test_normals(self):
+        process = build_process(NormalStep("a", 10, 3), NormalStep("b", 5, 4))
+        distribution = process.analyze_total()
+
+        self.assertEqual(distribution.method, "normal")
+        self.assertEqual(distribution.mean, 15)
+        self.assertEqual(distribution.variance, 25)
+        self.assertAlmostEqual(
+            distribution.quantile(0.95), statistics.NormalDist(15, 5).inv_cdf(0.95), places=6
+        )
+
+    def test_erlang(self):
+        process = build_process(
+            ExponentialStep("a", 2), ExponentialStep("b", 2), UniformStep("fixed", 1, 1)
+        )
+        distribution = process.analyze_total()
+
+        self.assertEqual(distribution.method, "gamma")
+        self.assertAlmostEqual(distribution.mean, 2)
+        # Erlang(2, 2) median shifted by 1
+        self.assertAlmostEqual(distribution.quantile(0.5), 1 + 0.8391734950083, places=3)
+        # P(Erlang(2, 2) > 1) = 3 exp(-2)
+        self.assertAlmostEqual(distribution.probability_above(2), 3 * np.exp(-2), places=4)
+
+    def test_convolution(self):
+        process = build_process(
+            ExponentialStep("expo", 4), NormalStep("normal", 12, 2), UniformStep("uni", 8, 11)
+        )
+        distribution = process.analyze_total()
+        samples = process.simulate_process(n_simulations=500_000, seed=1)["Total"]
+
+        self.assertEqual(distribution.method, "convolution")
+        self.assertAlmostEqual(distribution.mean, 0.25 + 12 + 9.5)
+        self.assertAlmostEqual(distribution.variance, 1 / 16 + 4 + 0.75)
+        qs = [0.05, 0.5, 0.95]
+        np.testing.assert_allclose(distribution.quantile(qs), samples.quantile(qs), atol=0.03)
+
+        step = distribution.x[1] - distribution.x[0]
+        self.assertAlmostEqual(distribution.pdf.sum() * step, 1, places=6)
+
+    def test_uniforms(self):
+        distribution = build_process(UniformStep("a", 0, 1), UniformStep("b", 0, 1)).analyze_total()
+        # Triangular distribution on [0, 2]
+        self.assertAlmostEqual(distribution.quantile(0.125), 0.5, places=3)
+
+    def test_monte_carlo_fallback(self):
+        process = build_process(NormalStep("a", 10, 1), ConstantStep("constant"))
+        distribution = process.analyze_total(n_fallback=50_000, seed=1)
+
+        self.assertEqual(distribution.method, "monte_carlo")
+        self.assertAlmostEqual(distribution.mean, 12, delta=0.05)
+        self.assertAlmostEqual(distribution.quantile(0.5), 12, delta=0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from binning import BinCache, histogram_bins
+from process import Process
+from process_steps import NormalStep
+
+
+class TestHistogramBins(unittest.TestCase):
+    def test_matches_numpy(self):
+        values = np.random.normal(size=10_000)
+        bars = histogram_bins(values, 20)
+        counts, edges = np.histogram(values, bins=20)
+
+        self.assertEqual(list(bars.columns), ["bin_start", "bin_end", "count"])
+        self.assertEqual(len(bars), 20)
+        np.testing.assert_array_equal(bars["count"], counts)
+        np.testing.assert_array_equal(bars["bin_start"], edges[:-1])
+        self.assertEqual(bars["count"].sum(), values.size)
+
+    def test_empty(self):
+        self.assertEqual(len(histogram_bins(np.array([]), 10)), 0)
+
+
+class TestBinCache(unittest.TestCase):
+    def setUp(self):
+        process = Process()
+        process.insertAtEnd(NormalStep("normal", mean=10, stdev=1))
+        self.result = process.simulate_result(n_simulations=1000, seed=1)
+
+    def test_cached_per_bins(self):
+        cache = BinCache()
+        first = cache.get(self.result, 20)
+
+        self.assertIs(cache.get(self.result, 20), first)
+        self.assertEqual(len(cache.get(self.result, 30)), 30)
+        self.assertEqual(len(cache), 2)
+
+    def test_eviction(self):
+        cache = BinCache(max_entries=2)
+        for bins in (10, 20, 30):
+            cache.get(self.result, bins)
+        self.assertEqual(len(cache), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
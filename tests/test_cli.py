@@ -0,0 +1,139 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import numpy as np
+import cli
+from process import Process
+from process_steps import NormalStep, PertStep
+from scenarios import build_process, load_scenarios, run_scenario
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "defaults": {"n_simulations": 2000, "seed": 1},
+    "scenarios": [
+        {
+            "name": "baseline",
+            "steps": [
+                {"name": "build", "type": "Normal", "mean": 10, "stdev": 2},
+                {"name": "review", "type": "pert", "low": 1, "mode": 2, "high": 6},
+            ],
+            "correlations": [["build", "review", 0.5]],
+        },
+        {
+            "name": "stratified",
+            "sampling": "lhs",
+            "n_simulations": 500,
+            "steps": [{"name": "build", "type": "Exponential", "rate": 0.5}],
+        },
+        {"name": "broken", "steps": [{"name": "build", "type": "Cauchy"}]},
+    ],
+}
+
+
+class TestScenarios(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "nightly.json")
+        with open(self.path, "w") as file:
+            json.dump(SCENARIOS, file)
+
+    def test_load_applies_defaults(self):
+        specs = load_scenarios(self.path)
+
+        self.assertEqual([spec["name"] for spec in specs], ["baseline", "stratified", "broken"])
+        self.assertEqual(specs[0]["n_simulations"], 2000)
+        self.assertEqual(specs[1]["n_simulations"], 500)
+        self.assertEqual(specs[1]["seed"], 1)
+
+    def test_load_single_scenario(self):
+        path = os.path.join(self.directory.name, "single.json")
+        with open(path, "w") as file:
+            json.dump(SCENARIOS["scenarios"][0], file)
+        self.assertEqual(len(load_scenarios(path)), 1)
+
+        with self.assertRaises(ValueError):
+            load_scenarios(os.path.join(self.directory.name, "scenarios.txt"))
+
+    def test_build_process(self):
+        process = build_process(SCENARIOS["scenarios"][0])
+
+        self.assertEqual(process.get_names(), ["build", "review"])
+        self.assertIsInstance(process.get_step("review"), PertStep)
+        self.assertEqual(process.get_correlation_matrix().loc["build", "review"], 0.5)
+
+        with self.assertRaises(ValueError):
+            build_process(SCENARIOS["scenarios"][2])
+        with self.assertRaises(ValueError):
+            build_process({"steps": [{"name": "build", "type": "normal", "mean": -1, "stdev": 1}]})
+
+    def test_run_scenario_matches_process(self):
+        spec = {"steps": [{"name": "build", "type": "normal", "mean": 10, "stdev": 2}], "seed": 3}
+        record = run_scenario(spec, quantiles=(0.5,))
+
+        process = Process()
+        process.insertAtEnd(NormalStep("build", 10, 2))
+        expected = process.simulate_process(10_000, seed=3)["Total"]
+        self.assertEqual(record["n_simulations"], 10_000)
+        self.assertAlmostEqual(record["summary"]["Total"]["mean"], expected.mean())
+        self.assertAlmostEqual(record["summary"]["Total"]["P50"], expected.median())
+
+    def test_samples(self):
+        spec = load_scenarios(self.path)[0]
+        record = run_scenario(spec, index=7, samples_dir=self.directory.name)
+
+        self.assertTrue(record["samples"].endswith("00007-baseline.npz"))
+        with np.load(record["samples"]) as samples:
+            self.assertEqual(samples["Total"].shape, (2000,))
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "nightly.json")
+        with open(self.path, "w") as file:
+            json.dump(SCENARIOS, file)
+
+    def test_jsonl(self):
+        output = os.path.join(self.directory.name, "summaries.jsonl")
+        status = cli.main([self.path, "-o", output, "-w", "0", "-q"])
+
+        with open(output) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual(status, 1)
+        self.assertEqual([record["scenario"] for record in records], ["baseline", "stratified", "broken"])
+        self.assertIn("error", records[2])
+        self.assertEqual(set(records[0]["summary"]), {"build", "review", "Total"})
+
+    def test_csv_on_pool(self):
+        output = os.path.join(self.directory.name, "summaries.csv")
+        status = cli.main([self.path, "-o", output, "-w", "1", "-q", "-n", "100", "--quantiles", "0.9"])
+
+        with open(output) as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(status, 1)
+        self.assertEqual(len(rows), 3 + 2 + 1)
+        self.assertIn("P90", rows[0])
+        baseline = [row for row in rows if row["scenario"] == "baseline"]
+        self.assertEqual(float(baseline[0]["count"]), 2000)
+
+    def test_no_streamlit(self):
+        code = (
+            "import sys, cli; cli.main(sys.argv[1:]);"
+            "print(any(name in sys.modules for name in ('streamlit', 'altair')))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code, self.path, "-o", os.devnull, "-w", "0", "-q"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(completed.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()
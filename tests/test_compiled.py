@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from process import Process
+from process_steps import DiscreteStep, EmpiricalStep, ExponentialStep, GammaStep, NormalStep, ProcessStep, UniformStep
+
+
+class ConstantStep(ProcessStep):
+    def simulate(self, n_simulations, rng=None):
+        return np.full(n_simulations, 2.0)
+
+
+class TestCompiledProcess(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+        self.process.insertAtEnd(NormalStep(name="normal2", mean=3, stdev=1))
+
+    def test_structure(self):
+        compiled = self.process.compile()
+
+        self.assertEqual(compiled.names, ("expo", "normal", "uni", "normal2"))
+        self.assertEqual(compiled.index["uni"], 2)
+        self.assertIs(compiled.get_step("normal2"), self.process.get_step("normal2"))
+
+        normal = [block for block in compiled.blocks if block.family == "normal"][0]
+        np.testing.assert_array_equal(normal.positions, [1, 3])
+        np.testing.assert_array_equal(normal.params["mean"], [12, 3])
+
+    def test_cached_until_changed(self):
+        compiled = self.process.compile()
+        self.assertIs(self.process.compile(), compiled)
+
+        self.process.update_step("normal", mean=20)
+        recompiled = self.process.compile()
+        self.assertIsNot(recompiled, compiled)
+        self.assertEqual(recompiled.blocks[1].params["mean"][0], 20)
+
+    def test_simulate(self):
+        results = self.process.simulate_compiled(n_simulations=50_000, seed=3)
+
+        self.assertEqual(list(results.columns), ["expo", "normal", "uni", "normal2", "Total"])
+        self.assertEqual(results.shape, (50_000, 5))
+        self.assertAlmostEqual(results["normal"].mean(), 12, delta=0.1)
+        self.assertAlmostEqual(results["normal2"].mean(), 3, delta=0.1)
+        self.assertAlmostEqual(results["uni"].min(), 8, delta=0.01)
+        np.testing.assert_allclose(results["Total"], results.iloc[:, :4].sum(axis=1))
+
+        again = self.process.simulate_compiled(n_simulations=50_000, seed=3)
+        self.assertTrue(results.equals(again))
+
+    def test_step_type_sampler(self):
+        self.process.insertAtEnd(GammaStep("gamma", shape=2, scale=3))
+        self.process.insertAtEnd(GammaStep("gamma2", shape=4, scale=1))
+        compiled = self.process.compile()
+
+        gamma = [block for block in compiled.blocks if block.family == "gamma"][0]
+        np.testing.assert_array_equal(gamma.positions, [4, 5])
+        self.assertEqual(compiled.singles, [])
+
+        samples = compiled.draw(50_000, seed=2)
+        np.testing.assert_allclose(samples[4:6].mean(axis=1), [6, 4], rtol=0.03)
+
+    def test_table_steps_are_batched(self):
+        self.process.insertAtEnd(EmpiricalStep("observed", [1, 2, 3]))
+        self.process.insertAtEnd(EmpiricalStep("observed2", [10, 20]))
+        self.process.insertAtEnd(DiscreteStep("choice", values=[5, 1], probabilities=[0.3, 0.7]))
+        self.process.insertAtEnd(DiscreteStep("choice2", values=[4, 2, 9], probabilities=[0, 0.5, 0.5]))
+        compiled = self.process.compile()
+
+        self.assertEqual(compiled.singles, [])
+        empirical = [block for block in compiled.blocks if block.family == "empirical"][0]
+        np.testing.assert_array_equal(empirical.params["values"], [[1, 2, 3], [10, 20, np.nan]])
+
+        samples = compiled.draw(100_000, seed=2)
+        self.assertEqual(set(np.unique(samples[4])), {1, 2, 3})
+        self.assertEqual(set(np.unique(samples[5])), {10, 20})
+        self.assertEqual(set(np.unique(samples[7])), {2, 9})
+        np.testing.assert_allclose(samples[4:8].mean(axis=1), [2, 15, 2.2, 5.5], rtol=0.02)
+
+    def test_unbatched_step(self):
+        self.process.insertAtEnd(ConstantStep("constant"))
+        compiled = self.process.compile()
+
+        self.assertEqual(compiled.singles, [4])
+        samples = compiled.draw(100, seed=1)
+        np.testing.assert_array_equal(samples[4], 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
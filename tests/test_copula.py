@@ -0,0 +1,190 @@
+import unittest
+import numpy as np
+from copula import correlated_groups, mixing_matrix, simulate_correlated
+from process import Process
+from process_steps import ExponentialStep, NormalStep, UniformStep
+
+
+class TestMixingMatrix(unittest.TestCase):
+    def test_cholesky(self):
+        matrix = np.array([[1, 0.5], [0.5, 1]])
+        factor = mixing_matrix(matrix)
+        np.testing.assert_allclose(factor @ factor.T, matrix)
+
+    def test_semi_definite(self):
+        matrix = np.ones((3, 3))
+        factor = mixing_matrix(matrix)
+        np.testing.assert_allclose(factor @ factor.T, matrix, atol=1e-12)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            mixing_matrix(np.array([[1, 0.9, 0.9], [0.9, 1, -0.9], [0.9, -0.9, 1]]))
+        with self.assertRaises(ValueError):
+            mixing_matrix(np.array([[1, 0.5], [0.4, 1]]))
+        with self.assertRaises(ValueError):
+            mixing_matrix(np.array([[2, 0], [0, 1]]))
+
+    def test_groups(self):
+        names = ["a", "b", "c", "d", "e"]
+        groups = correlated_groups(names, {("a", "c"): 0.5, ("c", "e"): 0.2, ("b", "d"): 0.0})
+        self.assertEqual(groups, [[0, 2, 4]])
+
+
+class TestCorrelatedProcess(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_correlation_and_marginals(self):
+        self.process.set_correlation("normal", "uni", 0.8)
+        results = self.process.simulate_process(n_simulations=200_000, seed=1)
+
+        rank_u = results["uni"].rank() / len(results)
+        z_normal = (results["normal"] - 12) / 2
+        self.assertAlmostEqual(np.corrcoef(z_normal, rank_u)[0, 1], 0.8 * 0.977, delta=0.01)
+        self.assertAlmostEqual(results["uni"].mean(), 9.5, delta=0.01)
+        self.assertAlmostEqual(results["uni"].min(), 8, delta=0.01)
+        self.assertAlmostEqual(results["normal"].std(), 2, delta=0.01)
+        self.assertAlmostEqual(results["Total"].var(), 0.0625 + 4 + 0.75 + 2 * 0.8 * 0.977 * 2 * 0.866, delta=0.05)
+
+    def test_uncorrelated_steps_unchanged(self):
+        independent = self.process.simulate_process(n_simulations=1000, seed=1)
+        self.process.set_correlation("normal", "uni", 0.5)
+        correlated = self.process.simulate_process(n_simulations=1000, seed=1)
+
+        np.testing.assert_array_equal(independent["expo"], correlated["expo"])
+        self.assertFalse(np.allclose(independent["uni"], correlated["uni"]))
+
+    def test_negative_correlation_with_sampling(self):
+        self.process.set_correlation("expo", "normal", -0.9)
+        results = self.process.simulate_process(n_simulations=4096, seed=1, sampling="lhs")
+
+        self.assertLess(np.corrcoef(results["expo"], results["normal"])[0, 1], -0.7)
+        self.assertAlmostEqual(results["normal"].mean(), 12, delta=0.01)
+
+    def test_simulate_result_matches(self):
+        self.process.set_correlation("expo", "uni", 0.3)
+        frame = self.process.simulate_process(n_simulations=500, seed=2)
+        result = self.process.simulate_result(n_simulations=500, seed=2)
+        np.testing.assert_allclose(result.total, frame["Total"])
+
+    def test_incremental_keeps_correlations(self):
+        self.process.simulate_result(n_simulations=5000, seed=3, incremental=True)
+        self.process.set_correlation("expo", "normal", 0.9)
+        result = self.process.simulate_result(n_simulations=5000, seed=3, incremental=True)
+
+        self.assertGreater(np.corrcoef(result["expo"], result["normal"])[0, 1], 0.7)
+        expected = self.process.simulate_result(n_simulations=5000, seed=3)
+        np.testing.assert_array_equal(result.data, expected.data)
+
+    def test_specification(self):
+        self.process.set_correlation("uni", "expo", 0.4)
+        matrix = self.process.get_correlation_matrix()
+        self.assertEqual(matrix.loc["expo", "uni"], 0.4)
+        self.assertEqual(matrix.loc["uni", "expo"], 0.4)
+
+        with self.assertRaises(KeyError):
+            self.process.set_correlation("expo", "missing", 0.1)
+        with self.assertRaises(ValueError):
+            self.process.set_correlation("expo", "expo", 0.1)
+        with self.assertRaises(ValueError):
+            self.process.set_correlation("expo", "uni", 1.5)
+
+        self.process.set_correlation_matrix(np.eye(3))
+        self.assertEqual(self.process.get_correlation_matrix().to_numpy().sum(), 3)
+
+    def test_invalid_combination_is_rejected(self):
+        self.process.set_correlation("expo", "normal", 0.6)
+        self.process.set_correlation("expo", "uni", 0.6)
+        with self.assertRaises(ValueError):
+            self.process.set_correlation("normal", "uni", -0.9)
+        self.assertEqual(self.process.get_correlation_matrix().loc["normal", "uni"], 0)
+
+    def test_delete_step_removes_correlations(self):
+        self.process.set_correlation("expo", "uni", 0.5)
+        self.process.deleteStep("uni")
+        self.assertEqual(self.process.get_correlation_matrix().to_numpy().sum(), 2)
+        self.process.simulate_process(n_simulations=10, seed=1)
+
+    def test_many_steps(self):
+        process = Process()
+        for i in range(200):
+            process.insertAtEnd(ExponentialStep(name=f"s{i}", rate=1))
+        matrix = np.full((200, 200), 0.3)
+        np.fill_diagonal(matrix, 1)
+        process.set_correlation_matrix(matrix)
+
+        results = simulate_correlated(
+            process.get_steps(), process._correlations, 2000, seed=1
+        )
+        self.assertEqual(len(results), 201)
+        self.assertAlmostEqual(np.corrcoef(results["s0"], results["s1"])[0, 1], 0.28, delta=0.07)
+
+
+
+class TestCorrelatedMethods(unittest.TestCase):
+    # Total of two Normal(10, 2) at correlation 0.9 has variance 4 + 4 + 2 * 0.9 * 4 = 15.2
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(NormalStep(name="a", mean=10, stdev=2))
+        self.process.insertAtEnd(NormalStep(name="b", mean=10, stdev=2))
+        self.process.set_correlation("a", "b", 0.9)
+        self.std = np.sqrt(15.2)
+
+    def test_streaming(self):
+        summary = self.process.simulate_streaming(n_simulations=100_000, chunk_size=30_000, seed=1)
+        self.assertAlmostEqual(summary["Total"].stats.std, self.std, delta=0.05)
+
+        frame = self.process.simulate_process(n_simulations=100_000, seed=1)
+        self.assertAlmostEqual(summary["Total"].stats.mean, frame["Total"].mean(), places=9)
+
+    def test_parallel(self):
+        frame = self.process.simulate_parallel(n_simulations=100_000, seed=1, block_size=30_000)
+        self.assertAlmostEqual(frame["Total"].std(), self.std, delta=0.05)
+
+        summary = self.process.simulate_parallel(
+            n_simulations=100_000, seed=1, block_size=30_000, summary=True
+        )
+        self.assertAlmostEqual(summary["Total"].stats.std, self.std, delta=0.05)
+
+    def test_compiled(self):
+        self.assertAlmostEqual(
+            self.process.simulate_compiled(100_000, seed=1)["Total"].std(), self.std, delta=0.05
+        )
+        self.process.set_correlation("a", "b", 0)
+        self.assertAlmostEqual(
+            self.process.simulate_compiled(100_000, seed=1)["Total"].std(), np.sqrt(8), delta=0.05
+        )
+
+    def test_graph(self):
+        result = self.process.to_graph().simulate(100_000, seed=1)
+        frame = self.process.simulate_process(100_000, seed=1)
+        np.testing.assert_allclose(result.total, frame["Total"])
+
+    def test_analyze_total(self):
+        self.assertAlmostEqual(self.process.analyze_total().variance, 15.2)
+
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=1))
+        self.process.set_correlation("a", "expo", 0.3)
+        distribution = self.process.analyze_total(seed=1)
+        simulated = self.process.simulate_process(200_000, seed=1)["Total"]
+        self.assertEqual(distribution.method, "monte_carlo")
+        self.assertAlmostEqual(distribution.variance, simulated.var(), delta=0.2)
+
+    def test_sweep(self):
+        result = self.process.sweep({"a": {"mean": [10, 12]}}, n_simulations=100_000, seed=1)
+        self.assertAlmostEqual(result.summary["std"][0], self.std, delta=0.05)
+
+    def test_adaptive(self):
+        result = self.process.simulate_adaptive(target_relative_error=0.001, seed=1)
+        self.assertAlmostEqual(result.std, self.std, delta=0.05)
+
+    def test_tail_estimate_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.process.estimate_tail(30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import copy
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import empirical
+from empirical import DurationLogStep, load_durations, save_upload
+from process import Process
+
+try:
+    import pyarrow  # noqa: F401
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class TestLoadDurations(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.directory.name, "cache")
+        patcher = mock.patch.dict(os.environ, {"MC_SIMULATOR_DURATION_CACHE": self.cache})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(empirical._loaded.clear)
+
+        self.durations = np.random.default_rng(1).lognormal(1, 0.5, 20_000)
+        self.path = os.path.join(self.directory.name, "log.csv")
+        frame = pd.DataFrame({"id": np.arange(self.durations.size), "duration": self.durations})
+        frame.loc[5, "duration"] = np.nan
+        frame.to_csv(self.path, index=False)
+
+    def test_sorted_table(self):
+        table = load_durations(self.path, "duration")
+
+        self.assertEqual(table.values.dtype, np.float32)
+        self.assertEqual(table.count, self.durations.size - 1)
+        self.assertTrue(np.all(np.diff(table.values) >= 0))
+        expected = np.sort(np.delete(self.durations, 5)).astype(np.float32)
+        np.testing.assert_array_equal(table.values, expected)
+
+    def test_chunked_read(self):
+        with mock.patch.object(empirical, "CHUNK_ROWS", 3000):
+            table = load_durations(self.path, "duration")
+        self.assertEqual(table.count, self.durations.size - 1)
+
+    def test_first_column_and_missing_column(self):
+        self.assertEqual(load_durations(self.path).values[-1], self.durations.size - 1)
+        with self.assertRaises(KeyError):
+            load_durations(self.path, "missing")
+
+    def test_cached_by_content(self):
+        table = load_durations(self.path, "duration")
+        self.assertIs(load_durations(self.path, "duration"), table)
+
+        # A copy of the log is served from the disk cache without parsing it again
+        copy_path = os.path.join(self.directory.name, "copy.csv")
+        with open(self.path, "rb") as source, open(copy_path, "wb") as target:
+            target.write(source.read())
+        with mock.patch.object(empirical, "read_chunks", side_effect=AssertionError):
+            cached = load_durations(copy_path, "duration")
+        self.assertEqual(cached.digest, table.digest)
+        np.testing.assert_array_equal(cached.values, table.values)
+
+    def test_memory_mapped(self):
+        with mock.patch.object(empirical, "MMAP_BYTES", 0):
+            table = load_durations(self.path, "duration")
+        self.assertTrue(table.is_mapped)
+
+    def test_quantile_table(self):
+        table = load_durations(self.path, "duration", max_points=513)
+
+        self.assertEqual(len(table), 513)
+        self.assertEqual(table.count, self.durations.size - 1)
+        q = np.array([0.1, 0.5, 0.9])
+        np.testing.assert_allclose(table.ppf(q), np.nanquantile(self.durations, q), rtol=0.02)
+
+    @unittest.skipUnless(HAS_PYARROW, "requires pyarrow")
+    def test_parquet(self):
+        path = os.path.join(self.directory.name, "log.parquet")
+        pd.DataFrame({"duration": self.durations}).to_parquet(path)
+
+        table = load_durations(path)
+        np.testing.assert_array_equal(table.values, np.sort(self.durations).astype(np.float32))
+
+    def test_unknown_format(self):
+        path = os.path.join(self.directory.name, "log.txt")
+        open(path, "w").close()
+        with self.assertRaises(ValueError):
+            load_durations(path)
+
+    def test_ppf(self):
+        table = load_durations(self.path, "duration")
+        values = table.values.astype(np.float64)
+
+        np.testing.assert_array_equal(table.ppf(np.array([0.0, 1.0])), [values[0], values[-1]])
+        middle = table.ppf(np.array([0.5]))[0]
+        self.assertAlmostEqual(middle, np.quantile(values, 0.5))
+
+    def test_save_upload(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        path = save_upload(data, ".csv")
+
+        self.assertEqual(save_upload(data, ".csv"), path)
+        self.assertEqual(os.path.dirname(path), self.cache)
+        self.assertEqual(load_durations(path, "duration").digest, load_durations(self.path, "duration").digest)
+
+
+class TestDurationLogStep(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        patcher = mock.patch.dict(
+            os.environ, {"MC_SIMULATOR_DURATION_CACHE": os.path.join(self.directory.name, "cache")}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(empirical._loaded.clear)
+
+        self.durations = np.random.default_rng(2).gamma(2.0, 3.0, 50_000)
+        self.path = os.path.join(self.directory.name, "log.csv")
+        pd.DataFrame({"duration": self.durations}).to_csv(self.path, index=False)
+
+    def test_simulate(self):
+        step = DurationLogStep("history", self.path)
+        samples = step.simulate(100_000, rng=1)
+
+        self.assertAlmostEqual(samples.mean(), self.durations.mean(), delta=0.1)
+        self.assertGreaterEqual(samples.min(), self.durations.min() - 1e-5)
+        self.assertLessEqual(samples.max(), self.durations.max() + 1e-5)
+        np.testing.assert_array_equal(samples, step.simulate(100_000, rng=1))
+
+    def test_in_process(self):
+        process = Process()
+        process.insertAtEnd(DurationLogStep("history", self.path))
+        results = process.simulate_process(20_000, seed=1, sampling="lhs")
+        self.assertAlmostEqual(results["Total"].mean(), self.durations.mean(), delta=0.05)
+
+    def test_copy_keeps_only_the_reference(self):
+        step = DurationLogStep("history", self.path)
+        copied = pickle.loads(pickle.dumps(copy.deepcopy(step)))
+
+        self.assertEqual(copied.get_params(), step.get_params())
+        np.testing.assert_array_equal(copied.simulate(10, rng=1), step.simulate(10, rng=1))
+
+    def test_changed_file(self):
+        step = DurationLogStep("history", self.path)
+        pd.DataFrame({"duration": [1.0, 2.0]}).to_csv(self.path, index=False)
+        os.utime(self.path, ns=(0, 0))
+
+        with self.assertRaises(AssertionError):
+            DurationLogStep("history", **step.get_params())
+
+    def test_invalid(self):
+        with self.assertRaises(AssertionError):
+            DurationLogStep("history", os.path.join(self.directory.name, "missing.csv"))
+        with self.assertRaises(AssertionError):
+            DurationLogStep("history", self.path, max_points=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import io
+import unittest
+import numpy as np
+import pandas as pd
+from export import available_formats, export_result, write_csv
+from process import Process
+from process_steps import ExponentialStep, NormalStep
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        process = Process()
+        process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.result = process.simulate_result(n_simulations=1000, seed=1)
+        self.frame = self.result.to_frame()
+
+    def test_csv_chunked(self):
+        buffer = io.BytesIO()
+        write_csv(self.result, buffer, chunk_size=300)
+
+        buffer.seek(0)
+        restored = pd.read_csv(buffer)
+        self.assertEqual(list(restored.columns), ["expo", "normal", "Total"])
+        np.testing.assert_allclose(restored, self.frame)
+
+    def test_csv_bytes(self):
+        data = export_result(self.result, "csv")
+        self.assertTrue(data.startswith(b"expo,normal,Total\n"))
+        self.assertEqual(data.count(b"\n"), 1001)
+
+    def test_npz(self):
+        archive = np.load(io.BytesIO(export_result(self.result, "npz")))
+        self.assertEqual(sorted(archive.files), ["Total", "expo", "normal"])
+        np.testing.assert_array_equal(archive["Total"], self.frame["Total"])
+
+    def test_parquet(self):
+        if "parquet" not in available_formats():
+            self.skipTest("pyarrow is not installed")
+
+        restored = pd.read_parquet(io.BytesIO(export_result(self.result, "parquet")))
+        pd.testing.assert_frame_equal(restored, self.frame)
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            export_result(self.result, "xlsx")
+
+
+if __name__ == "__main__":
+    unittest.main()
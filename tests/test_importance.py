@@ -0,0 +1,88 @@
+import math
+import unittest
+import numpy as np
+from importance import TILTS, estimate_tail, solve_tilt
+from process import Process
+from process_steps import ExponentialStep, LognormalStep, NormalStep, UniformStep
+
+
+class TestTilts(unittest.TestCase):
+    def test_tilted_means(self):
+        # The tilted mean is the derivative of the cumulant generating function
+        steps = [NormalStep("n", 10, 2), ExponentialStep("e", 0.5), UniformStep("u", 1, 4)]
+        rng = np.random.default_rng(1)
+        for step in steps:
+            tilt, draw = TILTS[step.family]
+            h = 1e-6
+            derivative = (tilt(step, 0.3 + h)[0] - tilt(step, 0.3 - h)[0]) / (2 * h)
+            self.assertAlmostEqual(derivative, tilt(step, 0.3)[1], places=5)
+            self.assertAlmostEqual(draw(step, 0.3, 200_000, rng).mean(), tilt(step, 0.3)[1], delta=0.05)
+
+    def test_solve_tilt(self):
+        steps = [ExponentialStep("a", 1), ExponentialStep("b", 2)]
+        theta = solve_tilt(steps, 10)
+        self.assertAlmostEqual(1 / (1 - theta) + 1 / (2 - theta), 10, places=6)
+        self.assertEqual(solve_tilt(steps, 1), 0.0)
+
+
+class TestEstimateTail(unittest.TestCase):
+    def test_normal_sum(self):
+        process = Process()
+        process.insertAtEnd(NormalStep("a", 10, 2))
+        process.insertAtEnd(NormalStep("b", 20, 3))
+        threshold = 30 + 4.5 * math.sqrt(13)
+        exact = 0.5 * math.erfc(4.5 / math.sqrt(2))  # 3.4e-6
+
+        estimate = process.estimate_tail(threshold, n_simulations=20_000, seed=1)
+
+        self.assertLess(abs(estimate.probability - exact), 3 * estimate.std_error)
+        self.assertLess(estimate.relative_error, 0.05)
+        self.assertLessEqual(estimate.interval[0], estimate.probability)
+        self.assertGreater(estimate.plain_equivalent, 1e8)
+
+    def test_exponential(self):
+        estimate = estimate_tail([ExponentialStep("e", 0.5)], 25, n_simulations=20_000, seed=2)
+        exact = math.exp(-0.5 * 25)
+        self.assertAlmostEqual(estimate.probability / exact, 1, delta=0.05)
+
+    def test_mixed_against_plain_monte_carlo(self):
+        steps = [ExponentialStep("e", 1), UniformStep("u", 0, 2), NormalStep("n", 3, 0.5)]
+        reference = estimate_tail(steps, 8, n_simulations=1_000_000, theta=0, seed=3)
+        plain = estimate_tail(steps, 8, n_simulations=20_000, theta=0, seed=4)
+        tilted = estimate_tail(steps, 8, n_simulations=20_000, seed=4)
+
+        self.assertGreater(tilted.theta, 0)
+        self.assertLess(
+            abs(tilted.probability - reference.probability),
+            3 * np.hypot(tilted.std_error, reference.std_error),
+        )
+        self.assertLess(tilted.std_error, plain.std_error / 2)
+
+    def test_threshold_below_mean(self):
+        estimate = estimate_tail([NormalStep("n", 10, 1)], 9, n_simulations=10_000, seed=1)
+        self.assertEqual(estimate.theta, 0)
+        self.assertAlmostEqual(estimate.probability, 0.841, delta=0.02)
+
+    def test_threshold_above_largest_total(self):
+        for steps in ([UniformStep("u", 0, 1)], [NormalStep("n", 10, 0), UniformStep("u", 1, 2)]):
+            estimate = estimate_tail(steps, 12, n_simulations=1000, seed=1)
+            self.assertEqual(estimate.probability, 0)
+            self.assertEqual(estimate.std_error, 0)
+
+        # The search itself gives up after a bounded number of doublings
+        theta = solve_tilt([UniformStep("u", 0, 1)], 2)
+        self.assertTrue(np.isfinite(theta))
+
+    def test_untilted_steps_need_theta(self):
+        # The heavy lognormal tail dominates, a tilt solved on its mean misses it
+        steps = [NormalStep("n", 10, 2), LognormalStep("l", 0, 1)]
+        with self.assertRaises(ValueError):
+            estimate_tail(steps, 30, n_simulations=10_000, seed=1)
+
+        plain = estimate_tail(steps, 30, n_simulations=1_000_000, theta=0, seed=1)
+        self.assertAlmostEqual(plain.probability, 1.5e-3, delta=2e-4)
+        self.assertLessEqual(plain.interval[0], plain.probability)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import numpy as np
+from incremental import IncrementalSimulator
+from process import Process
+from process_steps import ExponentialStep, NormalStep, UniformStep
+
+
+class TestIncrementalSimulator(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+        self.simulator = IncrementalSimulator()
+
+    def run_simulator(self):
+        return self.simulator.run(self.process.get_steps(), 1000, seed=3)
+
+    def assert_matches_full_run(self, results):
+        expected = self.process.simulate_process(n_simulations=1000, seed=3)
+        self.assertEqual(list(results), list(expected.columns))
+        for name in expected.columns:
+            np.testing.assert_allclose(results[name], expected[name])
+
+    def test_only_changed_step_redrawn(self):
+        self.run_simulator()
+        self.assertEqual(self.simulator.redrawn, ["expo", "normal", "uni"])
+
+        self.process.update_step("normal", mean=13)
+        results = self.run_simulator()
+
+        self.assertEqual(self.simulator.redrawn, ["normal"])
+        self.assert_matches_full_run(results)
+
+    def test_unchanged(self):
+        first = self.run_simulator()
+        second = self.run_simulator()
+
+        self.assertEqual(self.simulator.redrawn, [])
+        np.testing.assert_array_equal(first["Total"], second["Total"])
+
+    def test_added_and_deleted(self):
+        self.run_simulator()
+
+        self.process.insertAtEnd(NormalStep(name="extra", mean=1, stdev=1))
+        self.assert_matches_full_run(self.run_simulator())
+        self.assertEqual(self.simulator.redrawn, ["extra"])
+
+        self.process.deleteStep("expo")
+        self.assert_matches_full_run(self.run_simulator())
+        self.assertEqual(self.simulator.redrawn, [])
+
+    def test_settings_change_redraws_all(self):
+        self.run_simulator()
+        self.simulator.run(self.process.get_steps(), 500, seed=3)
+        self.assertEqual(self.simulator.redrawn, ["expo", "normal", "uni"])
+
+        self.simulator.run(self.process.get_steps(), 500, seed=None)
+        self.assertEqual(self.simulator.redrawn, ["expo", "normal", "uni"])
+
+    def test_process_method(self):
+        self.process.simulate_incremental(n_simulations=1000, seed=3)
+        self.process.update_step("uni", low=1, high=2)
+        results = self.process.simulate_incremental(n_simulations=1000, seed=3)
+
+        self.assertEqual(results.shape, (1000, 4))
+        self.assertLess(results["uni"].max(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import tracemalloc
+import unittest
+import numpy as np
+import instrumentation
+from jobs import Job
+from process import Process
+from process_steps import ExponentialStep, NormalStep
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+
+    def tearDown(self):
+        instrumentation.disable()
+
+    def test_off_by_default(self):
+        self.assertIsNone(instrumentation.get_recorder())
+        self.assertIs(instrumentation.stage("a"), instrumentation.stage("b"))
+        self.process.simulate_process(n_simulations=100, seed=1)
+
+    def test_simulate_process_stages(self):
+        with instrumentation.instrumented() as recorder:
+            self.process.simulate_process(n_simulations=1000, seed=1)
+            self.process.simulate_process(n_simulations=1000, seed=2)
+
+        metrics = recorder.to_dict()
+        self.assertEqual(
+            set(metrics), {"simulate_process", "draw:expo", "accumulate", "draw:normal", "dataframe"}
+        )
+        self.assertEqual(metrics["draw:expo"]["calls"], 2)
+        self.assertEqual(metrics["draw:expo"]["samples"], 2000)
+        self.assertEqual(metrics["accumulate"]["calls"], 4)
+        self.assertGreater(metrics["draw:expo"]["samples_per_sec"], 0)
+        self.assertIsNone(instrumentation.get_recorder())
+
+    def test_callbacks(self):
+        events = []
+        with instrumentation.instrumented(callbacks=[events.append]):
+            with instrumentation.stage("outer", samples=5, label="x"):
+                pass
+
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0]["stage"], "outer")
+        self.assertEqual(events[0]["samples"], 5)
+        self.assertEqual(events[0]["tags"], {"label": "x"})
+
+    def test_allocations(self):
+        with instrumentation.instrumented(trace_allocations=True) as recorder:
+            with instrumentation.stage("outer"):
+                with instrumentation.stage("inner"):
+                    kept = np.ones(100_000)
+                del kept
+
+        metrics = recorder.to_dict()
+        self.assertGreaterEqual(metrics["inner"]["allocated_bytes"], 800_000)
+        self.assertGreaterEqual(metrics["inner"]["peak_bytes"], 800_000)
+        self.assertGreaterEqual(metrics["outer"]["peak_bytes"], 800_000)
+        self.assertLess(metrics["outer"]["allocated_bytes"], 800_000)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_every_simulation_path_reports_draws(self):
+        runs = {
+            "result": lambda: self.process.simulate_result(1000, seed=1),
+            "incremental": lambda: self.process.simulate_result(1000, seed=1, incremental=True),
+            "sampled": lambda: self.process.simulate_process(1000, seed=1, sampling="lhs"),
+            "job": lambda: Job(
+                self.process.get_steps(),
+                1000,
+                seed=1,
+                chunk_size=300,
+                correlations=self.process.get_correlations(),
+            ).run(),
+        }
+        for label, run in runs.items():
+            with self.subTest(label), instrumentation.instrumented() as recorder:
+                run()
+                metrics = recorder.to_dict()
+                self.assertEqual(metrics["draw:expo"]["samples"], 1000)
+                self.assertIsNotNone(metrics["draw:normal"]["samples_per_sec"])
+
+        self.process.set_correlation("expo", "normal", 0.5)
+        for label, run in runs.items():
+            with self.subTest(f"correlated {label}"), instrumentation.instrumented() as recorder:
+                run()
+                self.assertEqual(recorder.to_dict()["draw:expo+normal"]["samples"], 1000)
+
+    def test_export(self):
+        recorder = instrumentation.enable()
+        with instrumentation.stage("stage", samples=10):
+            pass
+
+        self.assertEqual(json.loads(recorder.to_json())["stage"]["calls"], 1)
+        self.assertIn("stage", recorder.to_text())
+        recorder.reset()
+        self.assertEqual(recorder.to_dict(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
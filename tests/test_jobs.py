@@ -0,0 +1,117 @@
+import time
+import unittest
+import numpy as np
+from jobs import Job, JobRunner
+from process import Process
+from process_steps import ExponentialStep, NormalStep, ProcessStep, UniformStep
+
+
+class SlowStep(ProcessStep):
+    """Step that waits on every draw, to keep a job running."""
+
+    def __init__(self, name):
+        super().__init__(name)
+
+    def simulate(self, n_simulations, rng=None):
+        time.sleep(0.02)
+        return np.zeros(n_simulations)
+
+
+class FailingStep(ProcessStep):
+    def simulate(self, n_simulations, rng=None):
+        raise ValueError("broken step")
+
+
+class TestJob(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_matches_simulate_process(self):
+        job = Job(self.process.get_steps(), 10_000, seed=5, chunk_size=999)
+        job.run()
+
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.progress, 1.0)
+        expected = self.process.simulate_process(n_simulations=10_000, seed=5)
+        for name in ["expo", "normal", "uni", "Total"]:
+            np.testing.assert_allclose(job.result[name], expected[name])
+
+    def test_matches_correlated_simulation(self):
+        self.process.set_correlation("expo", "normal", 0.9)
+        job = Job(
+            self.process.get_steps(), 10_000, seed=5, chunk_size=999,
+            correlations=self.process.get_correlations(),
+        )
+        job.run()
+
+        expected = self.process.simulate_result(n_simulations=10_000, seed=5)
+        np.testing.assert_allclose(job.result.data, expected.data)
+        self.assertGreater(np.corrcoef(job.result["expo"], job.result["normal"])[0, 1], 0.7)
+
+    def test_steps_are_copied(self):
+        job = Job(self.process.get_steps(), 100, seed=5)
+        self.process.update_step("expo", rate=1)
+        self.assertEqual(job.steps[0].rate, 4)
+
+    def test_cancel_before_start(self):
+        job = Job(self.process.get_steps(), 100, seed=5)
+        job.cancel()
+        job.run()
+
+        self.assertEqual(job.status, "cancelled")
+        self.assertTrue(job.done)
+        self.assertIsNone(job.result)
+
+    def test_failure(self):
+        job = Job([FailingStep("broken")], 100)
+        job.run()
+
+        self.assertEqual(job.status, "failed")
+        self.assertIsInstance(job.error, ValueError)
+
+
+class TestJobRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = JobRunner(max_workers=1, max_jobs_per_owner=1, chunk_size=10)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_submit(self):
+        job = self.runner.submit([NormalStep("normal", 1, 1)], 1000, seed=1, dtype=np.float32)
+
+        self.assertTrue(job.wait(10))
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.result.dtype, np.float32)
+        self.assertIsNone(self.runner.get(job.id))
+
+    def test_cancel_keeps_partial_result(self):
+        job = self.runner.submit([SlowStep("slow")], 10_000, owner="a")
+        while job.completed == 0:
+            job.wait(0.01)
+
+        self.assertTrue(self.runner.cancel(job.id))
+        self.assertTrue(job.wait(10))
+        self.assertEqual(job.status, "cancelled")
+        self.assertGreater(job.result.n_simulations, 0)
+        self.assertLess(job.result.n_simulations, 10_000)
+        self.assertEqual(job.result.n_simulations, job.completed)
+
+    def test_owner_limit(self):
+        first = self.runner.submit([SlowStep("slow")], 10_000, owner="a")
+
+        with self.assertRaises(RuntimeError):
+            self.runner.submit([SlowStep("slow")], 10, owner="a")
+        other = self.runner.submit([SlowStep("slow")], 10, owner="b")
+
+        self.assertEqual(self.runner.active_jobs("a"), [first])
+        first.cancel()
+        self.assertTrue(other.wait(10))
+        self.assertEqual(other.status, "done")
+
+
+if __name__ == "__main__":
+    unittest.main()
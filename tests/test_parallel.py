@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from process import Process
+from process_steps import ExponentialStep, NormalStep, UniformStep
+
+
+class TestSimulateParallel(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_shape(self):
+        results = self.process.simulate_parallel(n_simulations=10_000, seed=1, block_size=3000)
+
+        self.assertEqual(list(results.columns), ["expo", "normal", "uni", "Total"])
+        self.assertEqual(results.shape, (10_000, 4))
+        np.testing.assert_allclose(
+            results["Total"], results[["expo", "normal", "uni"]].sum(axis=1)
+        )
+
+    def test_worker_count_independent(self):
+        one = self.process.simulate_parallel(
+            n_simulations=10_000, seed=1, n_workers=1, block_size=3000
+        )
+        four = self.process.simulate_parallel(
+            n_simulations=10_000, seed=1, n_workers=4, block_size=3000
+        )
+        processes = self.process.simulate_parallel(
+            n_simulations=10_000, seed=1, n_workers=2, block_size=3000, backend="process"
+        )
+
+        self.assertTrue(one.equals(four))
+        self.assertTrue(one.equals(processes))
+
+    def test_summary(self):
+        one = self.process.simulate_parallel(
+            n_simulations=20_000, seed=2, n_workers=1, block_size=4000, summary=True
+        )
+        three = self.process.simulate_parallel(
+            n_simulations=20_000, seed=2, n_workers=3, block_size=4000, summary=True
+        )
+
+        self.assertEqual(one.n_simulations, 20_000)
+        self.assertEqual(one["Total"].stats.mean, three["Total"].stats.mean)
+        self.assertEqual(one["Total"].quantile(0.9), three["Total"].quantile(0.9))
+        np.testing.assert_array_equal(
+            one["Total"].histogram.counts, three["Total"].histogram.counts
+        )
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            self.process.simulate_parallel(n_simulations=10, backend="gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
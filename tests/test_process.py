@@ -1,7 +1,12 @@
+import os
+import subprocess
+import sys
 import unittest
 from process import Process
 from process_steps import ExponentialStep, NormalStep, UniformStep
 
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 
 class TestProcess(unittest.TestCase):
     def setUp(self):
@@ -38,6 +43,26 @@ class TestProcess(unittest.TestCase):
         self.process.deleteStep("uni")
         self.assertEqual(self.process.get_names(), [])
 
+    def test_delete_tail_then_insert(self):
+        self.process.insertAtEnd(self.exponential_step)
+        self.process.insertAtEnd(self.normal_step)
+
+        self.process.deleteStep("normal")
+        self.process.insertAtEnd(self.uniform_step)
+        self.assertEqual(self.process.get_names(), ["expo", "uni"])
+
+    def test_duplicate_name(self):
+        self.process.insertAtEnd(self.exponential_step)
+        with self.assertRaises(ValueError):
+            self.process.insertAtEnd(ExponentialStep(name="expo", rate=1))
+
+    def test_get_step(self):
+        self.process.insertAtEnd(self.exponential_step)
+        self.assertIs(self.process.get_step("expo"), self.exponential_step)
+
+        with self.assertRaises(KeyError):
+            self.process.get_step("ei ole")
+
     def test_simulate(self):
         self.process.insertAtEnd(self.exponential_step)
         self.process.insertAtEnd(self.normal_step)
@@ -48,6 +73,29 @@ class TestProcess(unittest.TestCase):
         self.assertEqual(list(results.columns), ["expo", "normal", "uni", "Total"])
         self.assertEqual(results.shape, (1000, 4))
 
+    def test_simulate_seeded(self):
+        self.process.insertAtEnd(self.exponential_step)
+        self.process.insertAtEnd(self.normal_step)
+
+        first = self.process.simulate_process(n_simulations=100, seed=1)
+        second = self.process.simulate_process(n_simulations=100, seed=1)
+        self.assertTrue(first.equals(second))
+
+        # Adding a step does not change the draws of the existing steps
+        self.process.insertAtEnd(self.uniform_step)
+        third = self.process.simulate_process(n_simulations=100, seed=1)
+        self.assertTrue(first["normal"].equals(third["normal"]))
+
+    def test_streaming_matches_simulate(self):
+        self.process.insertAtEnd(self.exponential_step)
+        self.process.insertAtEnd(self.normal_step)
+
+        results = self.process.simulate_process(n_simulations=1000, seed=5)
+        summary = self.process.simulate_streaming(n_simulations=1000, chunk_size=300, seed=5)
+
+        self.assertAlmostEqual(summary["Total"].stats.mean, results["Total"].mean())
+        self.assertEqual(summary["normal"].stats.max, results["normal"].max())
+
     def test_update_step(self):
         self.process.insertAtEnd(self.exponential_step)
         self.process.insertAtEnd(self.normal_step)
@@ -67,5 +115,20 @@ class TestProcess(unittest.TestCase):
         self.assertEqual(self.uniform_step.high, 12)
 
 
+class TestImports(unittest.TestCase):
+    def test_core_without_pandas(self):
+        code = (
+            "import sys, scenarios, serialization; from process import Process;"
+            "from process_steps import UniformStep;"
+            "process = Process(); process.insertAtEnd(UniformStep('a', 0, 1));"
+            "process.simulate_result(10, seed=1).total;"
+            "print(any(name in sys.modules for name in ('pandas', 'altair')))"
+        )
+        completed = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(completed.stdout.strip(), "False")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import numpy as np
+from process import Process
+from process_graph import ProcessGraph
+from process_steps import ExponentialStep, NormalStep, UniformStep
+
+
+class TestProcessGraph(unittest.TestCase):
+    def setUp(self):
+        # start -> (left, right) -> end
+        self.graph = ProcessGraph()
+        self.graph.add_step(UniformStep("start", 1, 2))
+        self.graph.add_step(NormalStep("left", 10, 1), after=["start"])
+        self.graph.add_step(ExponentialStep("right", 0.1), after=["start"])
+        self.graph.add_step(UniformStep("end", 1, 2), after=["left", "right"])
+
+    def test_structure(self):
+        self.assertEqual(self.graph.get_names(), ["start", "left", "right", "end"])
+        self.assertEqual(self.graph.predecessors("end"), ["left", "right"])
+        self.assertEqual(self.graph.successors("start"), ["left", "right"])
+        self.assertEqual(self.graph.sinks(), ["end"])
+
+    def test_fork_join(self):
+        result = self.graph.simulate(n_simulations=10_000, seed=1, keep_durations=True)
+        durations = result.durations
+
+        expected = (
+            durations["start"]
+            + np.maximum(durations["left"], durations["right"])
+            + durations["end"]
+        )
+        np.testing.assert_allclose(result.total, expected)
+
+        critical = result.critical_frequency
+        self.assertEqual(critical["start"], 1.0)
+        self.assertEqual(critical["end"], 1.0)
+        self.assertAlmostEqual(critical["left"] + critical["right"], 1.0)
+        # P(Exp(0.1) > N(10, 1)) is about exp(-1) ~ 0.37
+        self.assertAlmostEqual(critical["right"], 0.37, delta=0.02)
+
+    def test_chunks_do_not_change_results(self):
+        import process_graph
+
+        whole = self.graph.simulate(n_simulations=1000, seed=2)
+        chunk_elements = process_graph._CHUNK_ELEMENTS
+        process_graph._CHUNK_ELEMENTS = 4 * 37
+        try:
+            chunked = self.graph.simulate(n_simulations=1000, seed=2)
+        finally:
+            process_graph._CHUNK_ELEMENTS = chunk_elements
+
+        np.testing.assert_array_equal(whole.total, chunked.total)
+        np.testing.assert_array_equal(whole.critical_frequency, chunked.critical_frequency)
+
+    def test_several_sinks(self):
+        graph = ProcessGraph()
+        graph.add_step(UniformStep("a", 1, 1))
+        graph.add_step(UniformStep("b", 2, 2))
+        result = graph.simulate(n_simulations=10, seed=1)
+
+        np.testing.assert_array_equal(result.total, 2)
+        self.assertEqual(list(result.critical_frequency), [0.0, 1.0])
+
+    def test_from_process_matches_simulate_process(self):
+        process = Process()
+        process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+        result = process.to_graph().simulate(n_simulations=1000, seed=3)
+        expected = process.simulate_process(n_simulations=1000, seed=3)["Total"]
+
+        np.testing.assert_allclose(result.total, expected)
+        self.assertTrue((result.critical_frequency == 1).all())
+
+    def test_validation(self):
+        with self.assertRaises(ValueError):
+            self.graph.add_step(UniformStep("start", 1, 2))
+        with self.assertRaises(KeyError):
+            self.graph.add_step(UniformStep("new", 1, 2), after=["missing"])
+        with self.assertRaises(TypeError):
+            self.graph.add_step("step")
+        with self.assertRaises(ValueError):
+            self.graph.remove_step("left")
+
+        self.graph.remove_step("end")
+        self.assertEqual(self.graph.sinks(), ["left", "right"])
+
+    def test_empty(self):
+        result = ProcessGraph().simulate(n_simulations=5)
+        np.testing.assert_array_equal(result.total, np.zeros(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
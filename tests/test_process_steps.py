@@ -1,5 +1,21 @@
 import unittest
-from process_steps import ExponentialStep, NormalStep, UniformStep
+import numpy as np
+from process_steps import (
+    STEP_TYPES,
+    DiscreteStep,
+    EmpiricalStep,
+    ExponentialStep,
+    GammaStep,
+    LognormalStep,
+    NormalStep,
+    Param,
+    PertStep,
+    ProcessStep,
+    TriangularStep,
+    UniformStep,
+    WeibullStep,
+    register_step,
+)
 
 
 class TestExponentialStep(unittest.TestCase):
@@ -20,6 +36,12 @@ class TestExponentialStep(unittest.TestCase):
         with self.assertRaises(AssertionError):
             ExponentialStep("exp", 0)
 
+    def test_simulate_seeded(self):
+        step = ExponentialStep("exp", 4)
+        first = step.simulate(100, rng=np.random.default_rng(1))
+        second = step.simulate(100, rng=1)
+        np.testing.assert_array_equal(first, second)
+
 
 class TestNormalStep(unittest.TestCase):
     def test_valid_inputs(self):
@@ -77,5 +99,106 @@ class TestUniformStep(unittest.TestCase):
             UniformStep(name=0.1, low=1, high=2)
 
 
+class TestNewFamilies(unittest.TestCase):
+    def setUp(self):
+        # Step, exact mean and variance
+        self.cases = [
+            (LognormalStep("ln", mu=1.0, sigma=0.5), np.exp(1.125), (np.exp(0.25) - 1) * np.exp(2.25)),
+            (GammaStep("g", shape=2.5, scale=1.5), 3.75, 5.625),
+            (WeibullStep("w", shape=2.0, scale=3.0), 3.0 * np.sqrt(np.pi) / 2, 9.0 * (1 - np.pi / 4)),
+            (TriangularStep("t", low=1, mode=2, high=6), 3.0, (1 + 4 + 36 - 2 - 6 - 12) / 18),
+            (PertStep("p", low=1, mode=2, high=7), 16 / 6, (16 / 6 - 1) * (7 - 16 / 6) / 7),
+            (EmpiricalStep("e", [1, 2, 3, 10]), 4.0, 12.5),
+            (DiscreteStep("d", values=[5, 1], probabilities=[0.3, 0.7]), 2.2, 3.36),
+        ]
+
+    def test_simulate_moments(self):
+        for step, mean, variance in self.cases:
+            with self.subTest(step=step.family):
+                samples = step.simulate(200_000, rng=1)
+                self.assertAlmostEqual(samples.mean(), mean, delta=4 * np.sqrt(variance / 200_000))
+                self.assertAlmostEqual(samples.var(), variance, delta=0.05 * variance)
+
+    def test_inverse_cdf_matches_simulate(self):
+        u = (np.arange(100_000) + 0.5) / 100_000
+        for step, mean, variance in self.cases:
+            with self.subTest(step=step.family):
+                quantiles = step.ppf(u)
+                self.assertTrue(np.all(np.diff(quantiles) >= 0))
+                self.assertAlmostEqual(quantiles.mean(), mean, delta=0.01 * mean)
+
+    def test_batch_matches_simulate(self):
+        for step, mean, variance in self.cases:
+            if step.sample_batch is None:
+                continue
+            with self.subTest(step=step.family):
+                params = {key: np.array([value, value]) for key, value in step.get_params().items()}
+                samples = step.sample_batch(np.random.default_rng(1), params, 100_000)
+                self.assertEqual(samples.shape, (2, 100_000))
+                np.testing.assert_allclose(samples.mean(axis=1), mean, rtol=0.02)
+
+    def test_empirical_quantiles(self):
+        step = EmpiricalStep("e", [3, 1, 2])
+        np.testing.assert_array_equal(step.ppf(np.array([0.1, 0.4, 0.9])), [1, 2, 3])
+        self.assertEqual(step.values, (3.0, 1.0, 2.0))
+
+    def test_discrete_quantiles(self):
+        step = DiscreteStep("d", values=[5, 1], probabilities=[0.3, 0.7])
+        np.testing.assert_array_equal(step.ppf(np.array([0.1, 0.69, 0.71])), [1, 1, 5])
+
+    def test_validation(self):
+        invalid = [
+            lambda: LognormalStep("ln", 1, -1),
+            lambda: GammaStep("g", 0, 1),
+            lambda: WeibullStep("w", 1, "kaksi"),
+            lambda: TriangularStep("t", 1, 5, 4),
+            lambda: PertStep("p", 2, 2, 2),
+            lambda: EmpiricalStep("e", []),
+            lambda: EmpiricalStep("e", ["yksi"]),
+            lambda: DiscreteStep("d", [1, 2], [0.5]),
+            lambda: DiscreteStep("d", [1, 2], [0.5, 0.6]),
+            lambda: DiscreteStep("d", [1, 2], [-0.5, 1.5]),
+        ]
+        for build in invalid:
+            with self.assertRaises(AssertionError):
+                build()
+
+
+class TestRegistry(unittest.TestCase):
+    def test_order(self):
+        self.assertEqual(list(STEP_TYPES)[:3], ["Exponential", "Normal", "Uniform"])
+        self.assertIs(STEP_TYPES["PERT"], PertStep)
+
+    def test_schema_matches_constructor(self):
+        for label, step_type in STEP_TYPES.items():
+            with self.subTest(label=label):
+                defaults = {param.name: param.default for param in step_type.schema}
+                step = step_type("step", **defaults)
+                self.assertEqual(set(step.get_params()), set(step_type.param_names))
+
+    def test_register(self):
+        class ConstantStep(ProcessStep):
+            __slots__ = ("value",)
+            param_names = __slots__
+            label = "Constant"
+            schema = (Param("value", "Value"),)
+
+            def __init__(self, name, value):
+                super().__init__(name)
+                self.value = value
+
+        try:
+            self.assertIs(register_step(ConstantStep), ConstantStep)
+            self.assertIs(STEP_TYPES["Constant"], ConstantStep)
+        finally:
+            STEP_TYPES.pop("Constant", None)
+
+    def test_register_invalid(self):
+        with self.assertRaises(TypeError):
+            register_step(int)
+        with self.assertRaises(ValueError):
+            register_step(ProcessStep)
+
+
 if __name__ == "__main__":
     unittest.main()
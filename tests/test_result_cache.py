@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from process import Process
+from process_steps import ExponentialStep, NormalStep
+from result_cache import ResultCache, cache_key, process_fingerprint
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_stable(self):
+        first = [NormalStep("normal", mean=12, stdev=2), ExponentialStep("expo", rate=4)]
+        second = [NormalStep("normal", mean=12.0, stdev=2.0), ExponentialStep("expo", rate=4.0)]
+        self.assertEqual(process_fingerprint(first), process_fingerprint(second))
+
+    def test_order_and_params_matter(self):
+        normal = NormalStep("normal", mean=12, stdev=2)
+        expo = ExponentialStep("expo", rate=4)
+        self.assertNotEqual(process_fingerprint([normal, expo]), process_fingerprint([expo, normal]))
+        self.assertNotEqual(
+            process_fingerprint([normal]),
+            process_fingerprint([NormalStep("normal", mean=12, stdev=3)]),
+        )
+
+    def test_key(self):
+        steps = [NormalStep("normal", mean=12, stdev=2)]
+        self.assertEqual(cache_key(steps, 1000, 1), cache_key(steps, 1000, 1))
+        self.assertNotEqual(cache_key(steps, 1000, 1), cache_key(steps, 1000, 2))
+        self.assertNotEqual(cache_key(steps, 1000, 1), cache_key(steps, 2000, 1))
+
+        with self.assertRaises(ValueError):
+            cache_key(steps, 1000, None)
+
+    def test_correlations_matter(self):
+        steps = [NormalStep("normal", mean=12, stdev=2), ExponentialStep("expo", rate=4)]
+        correlated = cache_key(steps, 1000, 1, {("expo", "normal"): 0.9})
+        self.assertNotEqual(cache_key(steps, 1000, 1), correlated)
+        self.assertNotEqual(cache_key(steps, 1000, 1, {("expo", "normal"): 0.5}), correlated)
+        self.assertEqual(cache_key(steps, 1000, 1, {}), cache_key(steps, 1000, 1))
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = ResultCache(max_bytes=2000)
+        cache.put("a", np.zeros(100))
+        cache.put("b", np.zeros(100))
+        cache.get("a")
+        cache.put("c", np.zeros(100))
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertLessEqual(cache.nbytes, 2000)
+
+    def test_too_large(self):
+        cache = ResultCache(max_bytes=100)
+        cache.put("big", np.zeros(100))
+        self.assertEqual(len(cache), 0)
+
+    def test_get_or_compute(self):
+        process = Process()
+        process.insertAtEnd(NormalStep("normal", mean=12, stdev=2))
+        key = cache_key(process.get_steps(), 100, 1)
+
+        cache = ResultCache()
+        first = cache.get_or_compute(key, lambda: process.simulate_process(100, seed=1))
+        second = cache.get_or_compute(key, lambda: process.simulate_process(100, seed=2))
+
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ResultCache(directory=directory).put("key", np.arange(10))
+
+            restored = ResultCache(directory=directory).get("key")
+            np.testing.assert_array_equal(restored, np.arange(10))
+
+    def test_disk_budget(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory=directory, max_disk_bytes=3000)
+            for key in "abcd":
+                cache.put(key, np.zeros(200))
+
+            cache.clear()
+            self.assertIsNone(cache.get("a"))
+            self.assertIsNotNone(cache.get("d"))
+
+    def test_disk_holds_only_data(self):
+        process = Process()
+        process.insertAtEnd(NormalStep("normal", mean=12, stdev=2))
+        result = process.simulate_result(100, seed=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ResultCache(directory=directory)
+            cache.put("result", result)
+            cache.put("bytes", b"exported")
+            cache.put("other", {"not": "data"})
+
+            restored = ResultCache(directory=directory)
+            self.assertEqual(restored.get("result").names, ["normal"])
+            np.testing.assert_array_equal(restored.get("result").data, result.data)
+            self.assertEqual(restored.get("bytes"), b"exported")
+            self.assertIsNone(restored.get("other"))
+
+            # Files that are not cache entries are never loaded
+            with open(os.path.join(directory, "planted.mcsim"), "wb") as file:
+                file.write(b"\x80\x04not a cache entry")
+            self.assertIsNone(restored.get("planted"))
+
+
+if __name__ == "__main__":
+    unittest.main()
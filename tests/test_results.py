@@ -0,0 +1,88 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from process import Process
+from process_steps import ExponentialStep, NormalStep, UniformStep
+from results import SimulationResult
+
+
+class TestSimulationResult(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_matches_simulate_process(self):
+        result = self.process.simulate_result(n_simulations=1000, seed=4)
+        expected = self.process.simulate_process(n_simulations=1000, seed=4)
+
+        self.assertEqual(result.columns, ["expo", "normal", "uni", "Total"])
+        self.assertEqual(result.shape, (1000, 4))
+        np.testing.assert_allclose(result.to_frame(), expected)
+
+    def test_float32(self):
+        result = self.process.simulate_result(n_simulations=1000, seed=4, dtype=np.float32)
+
+        self.assertEqual(result.dtype, np.float32)
+        self.assertEqual(result.nbytes, 3 * 1000 * 4)
+        self.assertEqual(result.total.dtype, np.float32)
+        self.assertEqual(result.nbytes, 4 * 1000 * 4)
+
+    def test_lazy_total(self):
+        result = self.process.simulate_result(n_simulations=100, seed=4)
+        self.assertIsNone(result._total)
+        np.testing.assert_allclose(result["Total"], result.data.sum(axis=0))
+
+    def test_mmap(self):
+        result = self.process.simulate_result(n_simulations=1000, seed=4, storage="mmap")
+        path = result.path
+
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(result.nbytes, 0)
+        np.testing.assert_allclose(
+            result["normal"], self.process.simulate_process(1000, seed=4)["normal"]
+        )
+
+        restored = pickle.loads(pickle.dumps(result))
+        np.testing.assert_array_equal(restored.data, result.data)
+
+        del result
+        self.assertFalse(os.path.exists(path))
+
+    def test_mmap_path(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "result.npy")
+            result = self.process.simulate_result(
+                n_simulations=100, seed=4, storage="mmap", path=path
+            )
+            result.data.flush()
+
+            opened = SimulationResult.open(path, result.names)
+            np.testing.assert_array_equal(opened["uni"], result["uni"])
+
+    def test_incremental(self):
+        self.process.simulate_result(n_simulations=100, seed=4, incremental=True)
+        self.process.update_step("expo", rate=1)
+        result = self.process.simulate_result(n_simulations=100, seed=4, incremental=True)
+
+        np.testing.assert_allclose(
+            result.to_frame(), self.process.simulate_process(100, seed=4)
+        )
+
+    def test_from_frame(self):
+        frame = self.process.simulate_process(n_simulations=100, seed=4)
+        result = SimulationResult.from_columns(frame)
+
+        self.assertEqual(result.columns, ["expo", "normal", "uni", "Total"])
+        np.testing.assert_allclose(result.to_frame(), frame)
+
+    def test_invalid_storage(self):
+        with self.assertRaises(ValueError):
+            SimulationResult.allocate(["a"], 10, storage="cloud")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+from rng import child_sequence, make_generator, seed_sequence, step_generators
+
+
+class TestStepGenerators(unittest.TestCase):
+    def test_reproducible(self):
+        first = step_generators(["a", "b"], seed=42)
+        second = step_generators(["a", "b"], seed=42)
+
+        np.testing.assert_array_equal(first["a"].random(10), second["a"].random(10))
+        np.testing.assert_array_equal(first["b"].random(10), second["b"].random(10))
+
+    def test_streams_keyed_on_name(self):
+        alone = step_generators(["b"], seed=7)
+        together = step_generators(["a", "b", "c"], seed=7)
+
+        np.testing.assert_array_equal(alone["b"].random(10), together["b"].random(10))
+        self.assertFalse(np.array_equal(together["a"].random(10), together["c"].random(10)))
+
+    def test_generator_seed_advances(self):
+        rng = np.random.default_rng(3)
+        first = seed_sequence(rng)
+        second = seed_sequence(rng)
+        self.assertNotEqual(first.entropy, second.entropy)
+
+    def test_child_sequence_is_order_independent(self):
+        root = seed_sequence(1)
+        np.testing.assert_array_equal(
+            child_sequence(root, 5).generate_state(4), child_sequence(root, 5).generate_state(4)
+        )
+
+    def test_bit_generators(self):
+        rng = make_generator(seed_sequence(1), "SFC64")
+        self.assertIsInstance(rng.bit_generator, np.random.SFC64)
+
+        with self.assertRaises(ValueError):
+            make_generator(seed_sequence(1), "nope")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from process import Process
+from process_steps import ExponentialStep, NormalStep, ProcessStep, UniformStep
+from sampling import uniforms
+
+
+class TestUniforms(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+
+    def test_shape_and_range(self):
+        for method in ("random", "antithetic", "lhs", "halton"):
+            points = uniforms(method, 3, 101, self.rng)
+            self.assertEqual(points.shape, (3, 101))
+            self.assertTrue(np.all((points > 0) & (points < 1)), method)
+
+    def test_antithetic_pairs(self):
+        points = uniforms("antithetic", 2, 10, self.rng)
+        np.testing.assert_allclose(points[:, :5] + points[:, 5:], 1)
+
+    def test_latin_hypercube_strata(self):
+        points = uniforms("lhs", 4, 50, self.rng)
+        for row in points:
+            np.testing.assert_array_equal(np.sort(np.floor(row * 50)), np.arange(50))
+
+    def test_halton_is_uniform(self):
+        points = uniforms("halton", 2, 1024, self.rng)
+        counts, _, _ = np.histogram2d(points[0], points[1], bins=4, range=[[0, 1], [0, 1]])
+        np.testing.assert_allclose(counts, 64, atol=3)
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            uniforms("magic", 1, 10, self.rng)
+
+
+class TestInverseCdf(unittest.TestCase):
+    def test_steps(self):
+        u = np.array([0.25, 0.5])
+        np.testing.assert_allclose(UniformStep("u", 2, 6).ppf(u), [3, 4])
+        np.testing.assert_allclose(NormalStep("n", 10, 2).ppf(u), [10 - 2 * 0.6744897502, 10])
+        np.testing.assert_allclose(ExponentialStep("e", 2).ppf(u), -np.log1p(-u) / 2)
+
+    def test_missing(self):
+        with self.assertRaises(TypeError):
+            ProcessStep("plain").ppf(np.array([0.5]))
+
+    def test_checked_before_sampling(self):
+        class SimulatedStep(ProcessStep):
+            def simulate(self, n_simulations, rng=None):
+                return np.ones(n_simulations)
+
+        process = Process()
+        process.insertAtEnd(NormalStep("normal", 10, 2))
+        process.insertAtEnd(SimulatedStep("simulated"))
+
+        np.testing.assert_array_equal(process.simulate_process(10, seed=1)["simulated"], 1)
+        with self.assertRaisesRegex(TypeError, "simulated"):
+            process.simulate_process(10, seed=1, sampling="lhs")
+        with self.assertRaisesRegex(TypeError, "simulated"):
+            process.sweep({"normal": {"mean": [9, 11]}}, n_simulations=10, seed=1)
+
+        process.set_correlation("normal", "simulated", 0.5)
+        with self.assertRaisesRegex(TypeError, "simulated"):
+            process.simulate_result(10, seed=1)
+
+
+class TestSimulateSampled(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_layout_and_reproducible(self):
+        for method in ("antithetic", "lhs", "halton"):
+            results = self.process.simulate_process(n_simulations=1000, seed=1, sampling=method)
+            again = self.process.simulate_process(n_simulations=1000, seed=1, sampling=method)
+
+            self.assertEqual(list(results.columns), ["expo", "normal", "uni", "Total"])
+            self.assertEqual(results.shape, (1000, 4))
+            self.assertTrue(results.equals(again))
+
+    def test_variance_reduction(self):
+        def estimator_variance(method):
+            means = [
+                self.process.simulate_process(500, seed=seed, sampling=method)["Total"].mean()
+                for seed in range(30)
+            ]
+            return np.var(means)
+
+        plain = estimator_variance("random")
+        self.assertLess(estimator_variance("lhs"), plain / 10)
+        self.assertLess(estimator_variance("halton"), plain / 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,198 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+import numpy as np
+import empirical
+import serialization
+from empirical import DurationLogStep, save_upload
+from process import Process
+from process_steps import (
+    DiscreteStep,
+    EmpiricalStep,
+    ExponentialStep,
+    NormalStep,
+    PertStep,
+    ProcessStep,
+    UniformStep,
+)
+
+
+def build_process():
+    process = Process()
+    process.insertAtEnd(NormalStep("build", 10, 2))
+    process.insertAtEnd(UniformStep("test", 1, 3))
+    process.insertAtEnd(ExponentialStep("wait", 0.5))
+    process.insertAtEnd(PertStep("review", 1, 2, 6))
+    process.insertAtEnd(EmpiricalStep("deploy", [1.0, 2.0, 4.0]))
+    process.insertAtEnd(DiscreteStep("rework", [0.0, 5.0], [0.8, 0.2]))
+    process.set_correlation("build", "review", 0.5)
+    process.seed = 7
+    return process
+
+
+def _saved(process):
+    buffer = io.BytesIO()
+    process.save(buffer)
+    return buffer.getvalue()
+
+
+class TestSerialization(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "process.mcsim")
+
+    def assertSameProcess(self, loaded, process):
+        self.assertEqual(loaded.get_names(), process.get_names())
+        for step, original in zip(loaded.get_steps(), process.get_steps()):
+            self.assertIs(type(step), type(original))
+            self.assertEqual(step.get_params(), original.get_params())
+        self.assertEqual(loaded._correlations, process._correlations)
+        self.assertEqual(loaded.seed, process.seed)
+
+    def test_round_trip(self):
+        process = build_process()
+        process.save(self.path)
+        loaded, result = Process.load(self.path)
+
+        self.assertSameProcess(loaded, process)
+        self.assertIsNone(result)
+        self.assertEqual(Process.from_dict(process.to_dict()).to_dict(), process.to_dict())
+
+    def test_results_are_mapped(self):
+        process = build_process()
+        result = process.simulate_result(5000, seed=process.seed, dtype=np.float32)
+        process.save(self.path, result)
+
+        loaded, loaded_result = Process.load(self.path)
+        self.assertIsInstance(loaded_result.data, np.memmap)
+        self.assertEqual(loaded_result.data.dtype, np.float32)
+        self.assertEqual(loaded_result.names, result.names)
+        np.testing.assert_array_equal(loaded_result.data, result.data)
+        np.testing.assert_array_equal(loaded_result.total, result.total)
+
+        _, read_result = Process.load(self.path, mmap=False)
+        self.assertNotIsInstance(read_result.data, np.memmap)
+        np.testing.assert_array_equal(read_result.data, result.data)
+
+    def test_bytes_are_not_copied(self):
+        process = build_process()
+        result = process.simulate_result(1000, seed=1)
+        buffer = io.BytesIO()
+        process.save(buffer, result)
+
+        loaded, loaded_result = Process.load(buffer.getvalue())
+        self.assertSameProcess(loaded, process)
+        self.assertFalse(loaded_result.data.flags.owndata)
+        self.assertFalse(loaded_result.data.flags.writeable)
+        np.testing.assert_array_equal(loaded_result.data, result.data)
+
+        buffer.seek(0)
+        _, uploaded_result = Process.load(buffer)
+        np.testing.assert_array_equal(uploaded_result.data, result.data)
+
+    def test_arrays_are_aligned(self):
+        arrays = {"a": np.arange(3, dtype=np.int16), "b": np.ones((2, 5))}
+        serialization.write(self.path, {"label": "x" * 13}, arrays)
+
+        header, loaded = serialization.read(self.path)
+        self.assertEqual(header["label"], "x" * 13)
+        for name, array in arrays.items():
+            self.assertEqual(loaded[name].offset % 64, 0)
+            np.testing.assert_array_equal(loaded[name], array)
+
+    def test_large_process_loads_quickly(self):
+        process = Process()
+        for i in range(500):
+            process.insertAtEnd(NormalStep(f"step {i}", 10, 1))
+        process.set_correlation("step 0", "step 1", 0.3)
+        process.save(self.path)
+
+        start = time.perf_counter()
+        loaded, _ = Process.load(self.path)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertSameProcess(loaded, process)
+
+    def test_invalid(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a saved process")
+        with self.assertRaises(ValueError):
+            Process.load(self.path)
+        with self.assertRaises(ValueError):
+            Process.load(b"short")
+
+        class ConstantStep(ProcessStep):
+            def simulate(self, n_simulations, rng=None):
+                return np.ones(n_simulations)
+
+        process = Process()
+        process.insertAtEnd(ConstantStep("constant"))
+        with self.assertRaises(ValueError):
+            process.save(self.path)
+
+        with self.assertRaises(ValueError):
+            Process.from_dict({"steps": [{"name": "build", "type": "normal", "mean": 1, "stdev": -1}]})
+
+    def test_untrusted_duration_logs(self):
+        cache = os.path.join(self.directory.name, "cache")
+        patcher = mock.patch.dict(os.environ, {"MC_SIMULATOR_DURATION_CACHE": cache})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(empirical._loaded.clear)
+
+        log = os.path.join(self.directory.name, "log.csv")
+        with open(log, "w") as file:
+            file.write("duration\n1\n2\n3\n")
+        outside = Process()
+        outside.insertAtEnd(DurationLogStep("history", log))
+        outside.save(self.path)
+
+        # Trusted files may use any log, uploads only logs stored in the upload cache
+        Process.load(self.path)
+        with self.assertRaises(ValueError):
+            Process.load(self.path, trusted=False)
+
+        with open(log, "rb") as file:
+            uploaded = save_upload(file.read(), ".csv")
+        inside = Process()
+        inside.insertAtEnd(DurationLogStep("history", uploaded))
+        loaded, _ = Process.load(_saved(inside), trusted=False)
+        self.assertEqual(loaded.get_step("history").path, uploaded)
+
+        definition = inside.to_dict()
+        del definition["steps"][0]["digest"]
+        with self.assertRaises(ValueError):
+            Process.from_dict(definition, trusted=False)
+
+        # Quantile tables are allocated in full, so uploads cannot ask for huge ones
+        definition = inside.to_dict()
+        definition["steps"][0]["max_points"] = 10**10
+        with self.assertRaises(ValueError):
+            Process.from_dict(definition, trusted=False)
+        definition["steps"][0]["max_points"] = 64
+        self.assertEqual(Process.from_dict(definition, trusted=False).get_step("history").max_points, 64)
+
+    def test_malformed_definitions(self):
+        headers = [
+            {},
+            {"process": 5},
+            {"process": {"steps": 5}},
+            {"process": {"steps": [5]}},
+            {"process": {"steps": [], "correlations": [["a", "b"]]}},
+            {"process": {"steps": [], "correlations": [[["a"], "b", 0.5]]}},
+            {"process": {"steps": [], "seed": "seven"}},
+            {"process": {"steps": []}, "result": {"names": 5}},
+            {"process": {"steps": []}, "result": {"names": ["missing"]}},
+        ]
+        for header in headers:
+            with self.subTest(header=header):
+                serialization.write(self.path, header)
+                with self.assertRaises(ValueError):
+                    Process.load(self.path, trusted=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import math
+import statistics
+import unittest
+import numpy as np
+from special import betainc, betaincinv, erfc, gammainc, gammaincinv, gammaln, norm_cdf, norm_ppf
+
+
+class TestSpecial(unittest.TestCase):
+    def test_erfc(self):
+        x = np.linspace(-6, 6, 101)
+        expected = np.array([math.erfc(v) for v in x])
+        np.testing.assert_allclose(erfc(x), expected, rtol=2e-7)
+
+    def test_norm_cdf(self):
+        x = np.linspace(-8, 8, 101)
+        expected = np.array([0.5 * math.erfc(-v / math.sqrt(2)) for v in x])
+        np.testing.assert_allclose(norm_cdf(x), expected, rtol=2e-7)
+
+    def test_norm_ppf(self):
+        p = np.array([1e-10, 1e-4, 0.01, 0.3, 0.5, 0.9, 0.999, 1 - 1e-8])
+        expected = np.array([statistics.NormalDist().inv_cdf(v) for v in p])
+        np.testing.assert_allclose(norm_ppf(p), expected, rtol=1e-8)
+
+    def test_norm_ppf_bounds(self):
+        np.testing.assert_array_equal(norm_ppf(np.array([0.0, 1.0])), [-np.inf, np.inf])
+
+    def test_round_trip(self):
+        p = np.linspace(0.001, 0.999, 99)
+        np.testing.assert_allclose(norm_cdf(norm_ppf(p)), p, rtol=1e-6)
+
+    def test_gammaln(self):
+        x = np.array([0.1, 0.5, 1.0, 2.5, 10.0, 171.0])
+        expected = np.array([math.lgamma(v) for v in x])
+        np.testing.assert_allclose(gammaln(x), expected, rtol=1e-13)
+
+    def test_gammainc(self):
+        x = np.linspace(0, 30, 121)
+        np.testing.assert_allclose(gammainc(1, x), -np.expm1(-x), atol=1e-15)
+        np.testing.assert_allclose(gammainc(2, x), 1 - np.exp(-x) * (1 + x), atol=1e-15)
+        np.testing.assert_allclose(gammainc(0.5, x), [math.erf(math.sqrt(v)) for v in x], atol=1e-14)
+
+    def test_gammaincinv(self):
+        p = np.linspace(1e-6, 1 - 1e-9, 501)
+        for a in (0.3, 1.0, 2.5, 40.0):
+            np.testing.assert_allclose(gammainc(a, gammaincinv(a, p)), p, atol=1e-13)
+        np.testing.assert_array_equal(gammaincinv(2.0, [0.0, 1.0]), [0.0, np.inf])
+
+    def test_betainc(self):
+        x = np.linspace(0, 1, 101)
+        np.testing.assert_allclose(betainc(2.5, 1, x), x**2.5, atol=1e-14)
+        np.testing.assert_allclose(betainc(1, 3.3, x), 1 - (1 - x) ** 3.3, atol=1e-14)
+        np.testing.assert_allclose(betainc(2, 2, x), x**2 * (3 - 2 * x), atol=1e-14)
+
+    def test_betaincinv(self):
+        p = np.linspace(1e-9, 1 - 1e-9, 501)
+        for a, b in ((1.0, 1.0), (1.5, 4.2), (5.0, 1.0), (3.0, 3.0)):
+            np.testing.assert_allclose(betainc(a, b, betaincinv(a, b, p)), p, atol=1e-13)
+
+    def test_broadcasting(self):
+        x = gammaincinv(np.array([[1.0], [2.0]]), np.array([0.5, 0.9]))
+        self.assertEqual(x.shape, (2, 2))
+        self.assertAlmostEqual(x[0, 0], np.log(2))
+        self.assertEqual(np.shape(betaincinv(2, 2, 0.5)), ())
+
+
+if __name__ == "__main__":
+    unittest.main()
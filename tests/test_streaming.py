@@ -0,0 +1,116 @@
+import unittest
+import numpy as np
+from process import Process
+from process_steps import ExponentialStep, NormalStep, UniformStep
+from streaming import QuantileSketch, RunningStats, StreamingHistogram
+
+
+class TestRunningStats(unittest.TestCase):
+    def test_chunked_matches_numpy(self):
+        values = np.random.normal(10, 3, size=10_000)
+        stats = RunningStats()
+        for chunk in np.array_split(values, 7):
+            stats.update(chunk)
+
+        self.assertEqual(stats.count, values.size)
+        self.assertAlmostEqual(stats.mean, values.mean())
+        self.assertAlmostEqual(stats.variance, values.var(ddof=1))
+        self.assertEqual(stats.min, values.min())
+        self.assertEqual(stats.max, values.max())
+
+    def test_merge(self):
+        values = np.random.exponential(2, size=5000)
+        left, right = RunningStats(), RunningStats()
+        left.update(values[:1234])
+        right.update(values[1234:])
+        left.merge(right)
+
+        self.assertEqual(left.count, values.size)
+        self.assertAlmostEqual(left.mean, values.mean())
+        self.assertAlmostEqual(left.variance, values.var(ddof=1))
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    def test_matches_numpy(self):
+        values = np.random.uniform(0, 10, size=10_000)
+        histogram = StreamingHistogram(0, 10, bins=20)
+        for chunk in np.array_split(values, 3):
+            histogram.update(chunk)
+
+        expected, _ = np.histogram(values, bins=20, range=(0, 10))
+        np.testing.assert_array_equal(histogram.counts, expected)
+        self.assertEqual(histogram.underflow + histogram.overflow, 0)
+
+    def test_out_of_range(self):
+        histogram = StreamingHistogram(0, 1, bins=4)
+        histogram.update(np.array([-1.0, 0.5, 1.0, 2.0, 3.0]))
+
+        self.assertEqual(histogram.counts.sum(), 2)
+        self.assertEqual(histogram.underflow, 1)
+        self.assertEqual(histogram.overflow, 2)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantiles(self):
+        values = np.random.normal(size=500_000)
+        sketch = QuantileSketch(k=2048)
+        for chunk in np.array_split(values, 13):
+            sketch.update(chunk)
+
+        qs = [0.05, 0.5, 0.95, 0.99]
+        np.testing.assert_allclose(sketch.quantile(qs), np.quantile(values, qs), atol=0.02)
+        self.assertEqual(sketch.count, values.size)
+
+    def test_memory_is_bounded(self):
+        sketch = QuantileSketch(k=256)
+        for _ in range(50):
+            sketch.update(np.random.uniform(size=10_000))
+
+        self.assertLess(sum(level.size for level in sketch.levels), 256 * 20)
+
+    def test_merge(self):
+        values = np.random.uniform(size=100_000)
+        left, right = QuantileSketch(k=1024), QuantileSketch(k=1024)
+        left.update(values[:40_000])
+        right.update(values[40_000:])
+        left.merge(right)
+
+        self.assertEqual(left.count, values.size)
+        self.assertAlmostEqual(left.quantile(0.5), np.quantile(values, 0.5), delta=0.01)
+
+
+class TestSimulateStreaming(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_summary(self):
+        summary = self.process.simulate_streaming(n_simulations=100_000, chunk_size=30_000)
+
+        self.assertEqual(list(summary.columns), ["expo", "normal", "uni", "Total"])
+        self.assertEqual(summary.n_simulations, 100_000)
+        self.assertEqual(summary["Total"].stats.count, 100_000)
+        self.assertAlmostEqual(summary["Total"].stats.mean, 0.25 + 12 + 9.5, delta=0.1)
+        self.assertAlmostEqual(summary["normal"].quantile(0.5), 12, delta=0.1)
+
+        histogram = summary["Total"].histogram
+        self.assertEqual(
+            histogram.counts.sum() + histogram.underflow + histogram.overflow, 100_000
+        )
+
+    def test_describe(self):
+        summary = self.process.simulate_streaming(n_simulations=5000, chunk_size=1000)
+        stats = summary.describe()
+
+        self.assertEqual(list(stats.columns), ["expo", "normal", "uni", "Total"])
+        self.assertEqual(list(stats.index), ["count", "mean", "std", "min", "25%", "50%", "75%", "max"])
+
+    def test_empty_process(self):
+        summary = Process().simulate_streaming(n_simulations=100)
+        self.assertEqual(list(summary.columns), ["Total"])
+
+
+if __name__ == "__main__":
+    unittest.main()
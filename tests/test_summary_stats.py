@@ -0,0 +1,63 @@
+import unittest
+import numpy as np
+import pandas as pd
+from process import Process
+from process_steps import ExponentialStep, NormalStep
+from summary_stats import column_stats, quantile_label, summarize
+
+
+class TestSummaryStats(unittest.TestCase):
+    def test_matches_numpy(self):
+        values = np.random.default_rng(1).exponential(size=10_001)
+        stats = column_stats(values, (0.0, 0.25, 0.5, 0.9, 0.999, 1.0))
+
+        self.assertEqual(stats[0], 10_001)
+        self.assertAlmostEqual(stats[1], values.mean())
+        self.assertAlmostEqual(stats[2], values.std(ddof=1))
+        self.assertEqual(stats[3], values.min())
+        np.testing.assert_allclose(
+            stats[4:10], np.quantile(values, [0.0, 0.25, 0.5, 0.9, 0.999, 1.0])
+        )
+        self.assertEqual(stats[10], values.max())
+
+    def test_does_not_modify_input(self):
+        values = np.array([3.0, 1.0, 2.0])
+        column_stats(values)
+        np.testing.assert_array_equal(values, [3.0, 1.0, 2.0])
+
+    def test_small_columns(self):
+        self.assertEqual(column_stats(np.array([5.0]), (0.5,))[:2], [1.0, 5.0])
+        self.assertTrue(np.isnan(column_stats(np.array([5.0]), (0.5,))[2]))
+        self.assertEqual(column_stats(np.array([]), (0.5,))[0], 0.0)
+
+    def test_summarize_like_describe(self):
+        frame = pd.DataFrame(np.random.default_rng(2).normal(size=(1000, 2)), columns=["a", "b"])
+        summary = summarize(frame, quantiles=(0.25, 0.5, 0.75))
+        described = frame.describe()
+
+        self.assertEqual(list(summary.index), ["count", "mean", "std", "min", "P25", "P50", "P75", "max"])
+        np.testing.assert_allclose(summary.to_numpy(), described.to_numpy())
+
+    def test_labels_and_validation(self):
+        self.assertEqual(quantile_label(0.95), "P95")
+        self.assertEqual(quantile_label(0.999), "P99.9")
+        with self.assertRaises(ValueError):
+            summarize({"a": np.ones(3)}, quantiles=(95,))
+
+    def test_result_summary_is_cached(self):
+        process = Process()
+        process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        result = process.simulate_result(n_simulations=1000, seed=1, dtype=np.float32)
+
+        summary = result.summary()
+        self.assertIs(result.summary(), summary)
+        self.assertEqual(list(summary.columns), ["expo", "normal", "Total"])
+        self.assertEqual(list(summary.index)[4:8], ["P50", "P90", "P95", "P99"])
+        self.assertAlmostEqual(
+            summary.loc["P90", "Total"], np.quantile(result.total.astype(np.float64), 0.9)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import numpy as np
+from process import Process
+from process_steps import EmpiricalStep, ExponentialStep, NormalStep, PertStep, UniformStep
+from sweep import expand_scenarios
+
+
+class TestExpandScenarios(unittest.TestCase):
+    def test_grid(self):
+        scenarios = expand_scenarios({"a": {"mean": [1, 2]}, "b": {"rate": [1, 2, 3]}})
+        self.assertEqual(len(scenarios), 6)
+        self.assertIn({"a": {"mean": 2}, "b": {"rate": 3}}, scenarios)
+
+    def test_one_at_a_time(self):
+        scenarios = expand_scenarios(
+            {"a": {"mean": [1, 2]}, "b": {"rate": [1, 2, 3]}}, design="one_at_a_time"
+        )
+        self.assertEqual(len(scenarios), 5)
+        self.assertEqual(scenarios[0], {"a": {"mean": 1}})
+
+    def test_unknown_design(self):
+        with self.assertRaises(ValueError):
+            expand_scenarios({}, design="random")
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.process = Process()
+        self.process.insertAtEnd(ExponentialStep(name="expo", rate=4))
+        self.process.insertAtEnd(NormalStep(name="normal", mean=12, stdev=2))
+        self.process.insertAtEnd(UniformStep(name="uni", low=8, high=11))
+
+    def test_summary(self):
+        result = self.process.sweep(
+            {"normal": {"mean": [10, 12, 14]}, "expo": {"rate": [1, 4]}}, n_simulations=20_000, seed=1
+        )
+        summary = result.summary
+
+        self.assertEqual(len(summary), 7)
+        self.assertEqual(result.factors, ["normal.mean", "expo.rate"])
+        self.assertEqual(result.baseline, {"normal.mean": 12, "expo.rate": 4})
+        self.assertEqual(summary.loc[0, "delta_mean"], 0)
+        self.assertIn("p95", summary.columns)
+
+        # Common random numbers: a shift of the mean shifts every sample by the same amount
+        row = summary[(summary["normal.mean"] == 14) & (summary["expo.rate"] == 4)].iloc[0]
+        self.assertAlmostEqual(row["delta_mean"], 2, places=10)
+        self.assertAlmostEqual(row["delta_se"], 0, places=10)
+        self.assertAlmostEqual(row["mean"], 23.75, delta=0.1)
+
+    def test_baseline_matches_sampled_run(self):
+        result = self.process.sweep({"normal": {"mean": [10]}}, n_simulations=1000, sampling="lhs", seed=3)
+        total = self.process.simulate_process(n_simulations=1000, sampling="lhs", seed=3)["Total"]
+        self.assertAlmostEqual(result.summary.loc[0, "mean"], total.mean(), places=10)
+
+    def test_tornado(self):
+        result = self.process.sweep(
+            {"normal": {"mean": [11, 13]}, "expo": {"rate": [2, 8]}, "uni": {"high": [10, 12]}},
+            n_simulations=20_000,
+            design="one_at_a_time",
+            seed=1,
+        )
+        tornado = result.tornado()
+
+        self.assertEqual(list(tornado["factor"]), ["normal.mean", "uni.high", "expo.rate"])
+        self.assertAlmostEqual(tornado.loc[0, "swing"], 2, places=10)
+        self.assertAlmostEqual(tornado.loc[2, "swing"], 0.5 - 0.125, delta=0.02)
+
+    def test_scenario_list_and_validation(self):
+        result = self.process.sweep([{"expo": {"rate": np.float64(2.0)}}], n_simulations=100, seed=1)
+        self.assertEqual(len(result.summary), 2)
+
+        with self.assertRaises(KeyError):
+            self.process.sweep({"missing": {"rate": [1]}})
+        with self.assertRaises(ValueError):
+            self.process.sweep({"expo": {"mean": [1]}})
+        with self.assertRaises(AssertionError):
+            self.process.sweep({"expo": {"rate": [-1]}})
+
+    def test_other_families(self):
+        self.process.insertAtEnd(PertStep("pert", low=1, mode=2, high=7))
+        self.process.insertAtEnd(EmpiricalStep("observed", [1, 2, 3]))
+        result = self.process.sweep({"pert": {"high": [7, 13]}}, n_simulations=20_000, seed=1)
+
+        # The PERT mean (low + 4 * mode + high) / 6 grows by 1 with the pessimistic estimate
+        self.assertAlmostEqual(result.summary.loc[2, "delta_mean"], 1, delta=0.02)
+        with self.assertRaises(ValueError):
+            self.process.sweep({"observed": {"values": [(1, 2)]}})
+
+    def test_process_is_unchanged(self):
+        self.process.sweep({"expo": {"rate": [1, 2]}}, n_simulations=100)
+        self.assertEqual(self.process.get_step("expo").rate, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()